@@ -62,3 +62,17 @@ Config.set(Settings.MAIL_SERVER_HOST, "mail.vims.com")
 Config.set(Settings.MAIL_SERVER_PORT, 25)
 Config.set(Settings.MAIL_SERVER_ADDRESS, "no-reply-vims@vims.com")
 Config.set(Settings.FRONTEND_BASE_URL, "http://127.0.0.1:8083")
+Config.set(Settings.DETECTOR_EXECUTOR, "process")
+Config.set(Settings.DETECTOR_POOL_SIZE, os.cpu_count())
+Config.set(Settings.DETECTOR_QUEUE_DEPTH, 64)
+Config.set(Settings.DETECTOR_CACHE_SIZE, 1024)
+Config.set(Settings.DETECTOR_CACHE_TTL, 300)
+Config.set(Settings.DETECTOR_TUNING_MAX_COMBINATIONS, 1000)
+# "numba" compiles the EWMA and CUSUM recurrences when numba is installed
+Config.set(Settings.DETECTOR_KERNELS, "numpy")
+# Detector sweeps stored in the alert table by `python -m vims.worker` and
+# after each ETL load of their dataset, e.g.
+# {"name": "cases_by_site", "dataset_id": "...", "date_field": "date",
+#  "group_by": ["site"], "algorithm": "cusum", "params": {}}
+Config.set(Settings.ALERT_SWEEPS, [])
+Config.set(Settings.ALERT_SWEEP_INTERVAL, timedelta(days=1))
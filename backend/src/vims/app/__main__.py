@@ -31,27 +31,15 @@ from uvicorn.server import Server
 
 from vims.app.base import base
 from vims.app.config import config
+from vims.app.datasource import DataBridgeManager
+from vims.app.detector.cache import detector_cache
+from vims.app.detector.executor import detector_executor
 from vims.app.settings import Settings
 from vims.core import Config, Dependency, Inject, Reference, getLogger, logging_init
 
 log = getLogger(__name__)
 
 
-class DataBridgeManager:
-    def __init__(self):
-        self.databridges = {}
-
-    def add_databridge(self, token, databridge):
-        self.databridges[token] = databridge
-
-    def get_databridge(self, token):
-        return self.databridges.get(token, None)
-
-    async def disconnect_all(self):
-        for token, databridge in self.databridges.items():
-            await databridge.disconnect()
-
-
 def server_config(base: FastAPI = Inject(base), config: Config = Inject(config)):
     port = config.get(Settings.PORT)
     host = config.get(Settings.HOST)
@@ -84,6 +72,8 @@ async def main(loop: AbstractEventLoop, *args):
     Dependency.register(Reference.LOOP, loop_factory)
     Dependency.register(Reference.ARGS, args_factory)
     Dependency.register(Reference.DATABRIDGE_MANAGER, get_databridge_manager)
+    Dependency.register(Reference.DETECTOR_EXECUTOR, detector_executor)
+    Dependency.register(Reference.DETECTOR_CACHE, detector_cache)
 
     main: Server = await Dependency.resolve(server)
     await main.serve()
@@ -19,28 +19,23 @@
 # FOR LOST PROFITS.
 
 import logging
-import sys
 
 import secure
 
-from cryptography.fernet import MultiFernet
 from fastapi import APIRouter, FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from vims.core import Config, Dependency, Inject, Reference
-from vims.databridge import DataBridgeType
-from vims.databridge.sql_alchemy import SqlAlchemyBridge
-from vims.databridge.vims import VimsBridge
 
 from ..auth import auth
 from ..dashboard import dashboard
 from ..database import database
-from ..database.models import datasources
 from ..dataset import dataset
-from ..datasource import datasource
+from ..datasource import connect_datasources, datasource
 from ..detector import detector
+from ..detector.alerts import create_alert_table
 from ..etl import etl
 from ..group import group
 from ..locale import locale
@@ -120,36 +115,18 @@ def base(
 
     @base.on_event("startup")
     async def startup():
-        fernet = MultiFernet(config.get(Settings.ENCRYPTION_KEYS))
-
         await database.connect()
+        await create_alert_table()
         databridge_manager = await Dependency.resolve(Reference.DATABRIDGE_MANAGER)
-        query = datasources.select()
-        all_datasources = await database.fetch_all(query)
-        for ds in all_datasources:
-            password = fernet.decrypt(
-                bytes(ds.password, sys.getdefaultencoding())
-            ).decode(sys.getdefaultencoding())
-            if ds.datasource_type == DataBridgeType.SQL_ALCHEMY.value:
-                databridge = SqlAlchemyBridge(
-                    url=ds.url,
-                    password=password,
-                    ssl=ds.kwargs["ssl"],
-                    min_size=ds.kwargs["min_connection_size"],
-                    max_size=ds.kwargs["max_connection_size"],
-                )
-            else:
-                databridge = VimsBridge(
-                    url=ds.url, password=password, username=ds.kwargs["username"]
-                )
-            await databridge.connect()
-            databridge_manager.add_databridge(ds.token, databridge)
+        await connect_datasources(config, databridge_manager)
 
     @base.on_event("shutdown")
     async def shutdown():
         await database.disconnect()
         databridge_manager = await Dependency.resolve(Reference.DATABRIDGE_MANAGER)
         await databridge_manager.disconnect_all()
+        detector_executor = await Dependency.resolve(Reference.DETECTOR_EXECUTOR)
+        detector_executor.shutdown()
 
     @base.exception_handler(RequestValidationError)
     async def validation_exception_handler(
@@ -26,7 +26,10 @@ from sqlalchemy import (
     JSON,
     Boolean,
     Column,
+    Date,
     DateTime,
+    Float,
+    Index,
     Integer,
     MetaData,
     PickleType,
@@ -188,3 +191,21 @@ visualizations = Table(
     Column("overlay", Boolean),
     Column("visualization_name", String),
 )
+
+alerts = Table(
+    "alert",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("sweep", String),
+    Column("dataset_id", String),
+    Column("date", Date),
+    Column("group_key", String),
+    Column("group_values", JSON),
+    Column("algorithm", String),
+    Column("value", Float),
+    Column("expected", Float),
+    Column("level", String),
+    Column("created", DateTime, default=func.now()),
+    Index("ix_alert_dataset_date", "dataset_id", "date"),
+    Index("ix_alert_sweep_date", "sweep", "date"),
+)
@@ -18,13 +18,17 @@
 # INABILITY TO USE, THE MATERIAL, INCLUDING, BUT NOT LIMITED TO, ANY DAMAGES
 # FOR LOST PROFITS.
 
-from typing import List
+from typing import Any, AsyncIterator, Dict, List
 
-from datetime import datetime
+import json
+
+from datetime import date, datetime
 from itertools import islice, tee
 from statistics import mean, stdev
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 
 from vims.core import Dependency, Reference
 from vims.databridge import DataBridgeType
@@ -32,17 +36,62 @@ from vims.util import AgeUnitEnum, append_date_part, append_epiweek
 
 from ..auth import Permission, get_current_user, require_permission
 from ..database import database
-from ..database.models import datasets, datasources
+from ..database.models import alerts, datasets, datasources
+from ..detector.executor import DetectorQueueFull
+from ..detector.runner import DetectorJobError, parse_sweep
+from ..detector.sweep import run_dataset_sweep, sweep_query
 from ..model import (
     DataList,
     Dataset,
     DatasetAdmin,
     DatasetAdminInternal,
     DatasetBaseQuery,
+    DatasetDetectorSweep,
     DatasetQuery,
     User,
 )
 
+# Query results are streamed as newline delimited JSON, one row per line, when
+# the request accepts it. The lines are sent STREAM_CHUNK_ROWS rows at a time.
+NDJSON = "application/x-ndjson"
+STREAM_CHUNK_ROWS = 1000
+
+AGE_FIELDS = ("Edad", "edad", "EDAD")
+
+
+def find_age_field(row: Dict[str, Any]):
+    return next((k for k in row if k in AGE_FIELDS), "")
+
+
+def categorize_age(row: Dict[str, Any], age_field: str):
+    """
+    Writes the age of the row in the units best suited to display it.
+    """
+    age_data = row[age_field]
+    if age_data:
+        if type(age_data) is int or age_data.is_integer():
+            row[age_field] = str(int(age_data)) + AgeUnitEnum.YEARS
+        elif round(age_data * 12, 4).is_integer():
+            row[age_field] = str(int(round(age_data * 12, 4))) + AgeUnitEnum.MONTHS
+        elif round(age_data * 365, 4).is_integer():
+            row[age_field] = str(int(round(age_data * 365, 4))) + AgeUnitEnum.DAYS
+
+
+async def ndjson_rows(rows: AsyncIterator[Dict[str, Any]]):
+    lines = []
+    age_field = None
+    async for row in rows:
+        if age_field is None:
+            age_field = find_age_field(row)
+        if age_field:
+            categorize_age(row, age_field)
+        lines.append(json.dumps(row, default=jsonable_encoder))
+        if len(lines) == STREAM_CHUNK_ROWS:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
 
 def align_dataset_on_base_query(dataset):
     """
@@ -79,6 +128,56 @@ def align_dataset_on_base_query(dataset):
     return final_fields
 
 
+def enrich_dataset_query(dataset, query: DatasetQuery):
+    """
+    Adds the dataset metadata required by the worker to process the request
+    and merges the query with the dataset's base query.
+    """
+    enriched_query = query.dict()
+    enriched_query.update(
+        {
+            "dataset": {
+                "name": dataset["dataset_name"],
+                "fields": {
+                    f["data_field_name"]: f["data_field_type"]
+                    for f in dataset["fields"]
+                },
+                "date_field": dataset["date_field"]
+                if "date_field" in dataset
+                else None,
+                "primary_key_field": dataset["primary_key_field"]
+                if "primary_key_field" in dataset
+                else None,
+            }
+        }
+    )
+
+    full_request = None
+
+    if dataset["base_query"]["request"] is not None or query.request is not None:
+        full_request = {"$and": []}
+
+    if dataset["base_query"]["request"] is not None:
+        full_request["$and"].append(dataset["base_query"]["request"])
+
+    if query.request is not None:
+        full_request["$and"].append(query.request)
+
+    full_projection = dataset["base_query"]["projection"]
+    if query.projection:
+        projection_keys = set(query.projection.keys())
+        for key in projection_keys:
+            if key in full_projection:
+                query.projection[key] = full_projection[key]
+            else:
+                del query.projection[key]
+
+        full_projection = query.projection
+
+    enriched_query.update({"request": full_request, "projection": full_projection})
+    return enriched_query
+
+
 async def dataset_accessible(dataset, user):
     user_permissions = list(map(lambda p: Permission(p), user.permissions.keys()))
     if (
@@ -450,22 +549,16 @@ def dataset():
         result = await databridge.query(query)
         return result
 
-    @router.post(
-        "/{dataset_id}/query",
-        status_code=status.HTTP_200_OK,
-        dependencies=[
-            Depends(
-                require_permission(
-                    [Permission.READ_DATASET_ALL, Permission.READ_DATASET_SHARED]
-                )
-            )
-        ],
-    )
-    async def data_query(
+    async def resolve_query(
         dataset_id: str,
         query: DatasetQuery,
-        user: User = Depends(get_current_user),
+        user: User,
     ):
+        """
+        Checks that the user can access the dataset and merges the query with
+        the dataset's base query. Returns the databridge of the dataset's
+        datasource and the enriched query to run on it.
+        """
         dataset_query = datasets.select().where(datasets.c.id == dataset_id)
         dataset = await database.fetch_one(dataset_query)
 
@@ -491,48 +584,9 @@ def dataset():
                 detail="Dataset contains invalid datasource_id.",
             )
 
-        # Adding dataset metadata required by the worker to process the request.
         dataset = dataset._mapping
         datasource = datasource._mapping
-        enriched_query = query.dict()
-        enriched_query.update(
-            {
-                "dataset": {
-                    "name": dataset["dataset_name"],
-                    "fields": {
-                        f["data_field_name"]: f["data_field_type"]
-                        for f in dataset["fields"]
-                    },
-                    "date_field": dataset["date_field"]
-                    if "date_field" in dataset
-                    else None,
-                }
-            }
-        )
-
-        full_request = None
-
-        if dataset["base_query"]["request"] is not None or query.request is not None:
-            full_request = {"$and": []}
-
-        if dataset["base_query"]["request"] is not None:
-            full_request["$and"].append(dataset["base_query"]["request"])
-
-        if query.request is not None:
-            full_request["$and"].append(query.request)
-
-        full_projection = dataset["base_query"]["projection"]
-        if query.projection:
-            projection_keys = set(query.projection.keys())
-            for key in projection_keys:
-                if key in full_projection:
-                    query.projection[key] = full_projection[key]
-                else:
-                    del query.projection[key]
-
-            full_projection = query.projection
-
-        enriched_query.update({"request": full_request, "projection": full_projection})
+        enriched_query = enrich_dataset_query(dataset, query)
 
         databridge_manager = await Dependency.resolve(Reference.DATABRIDGE_MANAGER)
         databridge = databridge_manager.get_databridge(datasource["token"])
@@ -542,6 +596,46 @@ def dataset():
                 status_code=status.HTTP_404_BAD_REQUEST,
                 detail="Datasource not found",
             )
+        return databridge, enriched_query
+
+    @router.post(
+        "/{dataset_id}/query",
+        status_code=status.HTTP_200_OK,
+        dependencies=[
+            Depends(
+                require_permission(
+                    [Permission.READ_DATASET_ALL, Permission.READ_DATASET_SHARED]
+                )
+            )
+        ],
+    )
+    async def data_query(
+        dataset_id: str,
+        query: DatasetQuery,
+        user: User = Depends(get_current_user),
+        accept: str | None = Header(None),
+    ):
+        """
+        With an Accept header of application/x-ndjson, the rows are streamed
+        from the datasource as newline delimited JSON instead of being
+        returned in one list, and no total is computed. Queries with
+        transformations can not be streamed.
+        """
+        databridge, enriched_query = await resolve_query(dataset_id, query, user)
+        if accept is not None and NDJSON in accept:
+            if enriched_query.get("transformations") is not None:
+                raise HTTPException(
+                    status_code=status.HTTP_406_NOT_ACCEPTABLE,
+                    detail="Queries with transformations can not be streamed",
+                )
+            try:
+                rows = await databridge.stream(enriched_query)
+            except RuntimeError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+                )
+            return StreamingResponse(ndjson_rows(rows), media_type=NDJSON)
+
         result = await databridge.query(enriched_query)
 
         if (
@@ -614,44 +708,110 @@ def dataset():
                 )
 
         # Determines which variant of age exist in dictionary's keys
-        age_variants = ["Edad", "edad", "EDAD"]
-        found_age = ""
-        for i in range(len(result["values"])):
-            temp_list = list(result["values"][i].keys())
-            for j in range(len(temp_list)):
-                if temp_list[j] == age_variants[0]:
-                    found_age = age_variants[0]
-                    break
-                elif temp_list[j] == age_variants[1]:
-                    found_age = age_variants[1]
-                    break
-                elif temp_list[j] == age_variants[2]:
-                    found_age = age_variants[2]
-                    break
-                else:
-                    continue
-            if found_age != "":
-                break
+        found_age = next(
+            (f for f in map(find_age_field, result["values"]) if f != ""), ""
+        )
 
         # Categorize ages based on best units for display
-        for i in range(len(result["values"])):
-            if found_age != "":
-                age_data = result["values"][i][found_age]
-                if age_data:
-                    if type(age_data) is int or age_data.is_integer():
-                        temp = str(int(result["values"][i][found_age]))
-                        result["values"][i][found_age] = temp + AgeUnitEnum.YEARS
-                    elif round(age_data * 12, 4).is_integer():
-                        temp = str(int(round(age_data * 12, 4)))
-                        result["values"][i][found_age] = temp + AgeUnitEnum.MONTHS
-                    elif round(age_data * 365, 4).is_integer():
-                        temp = str(int(round(age_data * 365, 4)))
-                        result["values"][i][found_age] = temp + AgeUnitEnum.DAYS
-                    else:
-                        continue
+        if found_age != "":
+            for row in result["values"]:
+                categorize_age(row, found_age)
 
         return [result]
 
+    @router.post(
+        "/{dataset_id}/detector",
+        summary="Run a detector over every group of a dataset query",
+        status_code=status.HTTP_200_OK,
+        dependencies=[
+            Depends(
+                require_permission(
+                    [Permission.READ_DATASET_ALL, Permission.READ_DATASET_SHARED]
+                )
+            )
+        ],
+    )
+    async def data_detector_sweep(
+        dataset_id: str,
+        sweep: DatasetDetectorSweep,
+        user: User = Depends(get_current_user),
+    ):
+        """
+        Counts the dataset's records per day, week, epiweek, month or year
+        for each combination of the group_by fields in a single query, or
+        sums count_field when given, then runs the detector over the series
+        of every group in parallel and returns the alerts found for each
+        group.
+        """
+        try:
+            algorithm, params = parse_sweep(sweep.algorithm, sweep.params)
+        except DetectorJobError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+        databridge, enriched_query = await resolve_query(
+            dataset_id, sweep_query(sweep), user
+        )
+        try:
+            return await run_dataset_sweep(
+                databridge, enriched_query, sweep, algorithm, params
+            )
+        except DetectorJobError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except DetectorQueueFull as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e)
+            )
+
+    @router.get(
+        "/{dataset_id}/alerts",
+        summary="Get the alerts stored by the alert sweeps over a dataset",
+        status_code=status.HTTP_200_OK,
+        dependencies=[
+            Depends(
+                require_permission(
+                    [Permission.READ_DATASET_ALL, Permission.READ_DATASET_SHARED]
+                )
+            )
+        ],
+    )
+    async def get_dataset_alerts(
+        dataset_id: str,
+        sweep: str | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        level: str | None = None,
+        user: User = Depends(get_current_user),
+    ):
+        dataset_query = datasets.select().where(datasets.c.id == dataset_id)
+        dataset = await database.fetch_one(dataset_query)
+        if not dataset or not await dataset_accessible(dataset, user):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail=NO_DATASET_FOUND
+            )
+
+        query = alerts.select().where(alerts.c.dataset_id == dataset_id)
+        if sweep is not None:
+            query = query.where(alerts.c.sweep == sweep)
+        if start_date is not None:
+            query = query.where(alerts.c.date >= start_date)
+        if end_date is not None:
+            query = query.where(alerts.c.date <= end_date)
+        if level is not None:
+            query = query.where(alerts.c.level == level)
+        rows = await database.fetch_all(query.order_by(alerts.c.date))
+        return [
+            {
+                "sweep": row.sweep,
+                "date": row.date,
+                "group": row.group_values,
+                "algorithm": row.algorithm,
+                "value": row.value,
+                "expected": row.expected,
+                "level": row.level,
+            }
+            for row in rows
+        ]
+
     @router.post(
         "/stdev/{num_sigma}/{window}/{start_idx}",
         summary="Get Std Dev",
@@ -50,6 +50,45 @@ from ..model import (
 from ..settings import Settings
 
 
+class DataBridgeManager:
+    def __init__(self):
+        self.databridges = {}
+
+    def add_databridge(self, token, databridge):
+        self.databridges[token] = databridge
+
+    def get_databridge(self, token):
+        return self.databridges.get(token, None)
+
+    async def disconnect_all(self):
+        for token, databridge in self.databridges.items():
+            await databridge.disconnect()
+
+
+async def connect_datasources(config: Config, databridge_manager: DataBridgeManager):
+    fernet = MultiFernet(config.get(Settings.ENCRYPTION_KEYS))
+    query = datasources.select()
+    all_datasources = await database.fetch_all(query)
+    for ds in all_datasources:
+        password = fernet.decrypt(bytes(ds.password, sys.getdefaultencoding())).decode(
+            sys.getdefaultencoding()
+        )
+        if ds.datasource_type == DataBridgeType.SQL_ALCHEMY.value:
+            databridge = SqlAlchemyBridge(
+                url=ds.url,
+                password=password,
+                ssl=ds.kwargs["ssl"],
+                min_size=ds.kwargs["min_connection_size"],
+                max_size=ds.kwargs["max_connection_size"],
+            )
+        else:
+            databridge = VimsBridge(
+                url=ds.url, password=password, username=ds.kwargs["username"]
+            )
+        await databridge.connect()
+        databridge_manager.add_databridge(ds.token, databridge)
+
+
 def datasource(config=Inject(Config)):
     router = APIRouter()
 
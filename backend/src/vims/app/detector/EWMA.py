@@ -22,12 +22,14 @@
 # INABILITY TO USE, THE MATERIAL, INCLUDING, BUT NOT LIMITED TO, ANY DAMAGES
 # FOR LOST PROFITS.
 
+import functools
 import math
 import statistics
 
 import numpy
 
-from .util import FilterBaselineZeros3, TDistribution
+from ..model.detector import EwmaState
+from .util import BaselineWindows, FilterBaselineZeros3, Kernels, TDistribution
 
 
 def calculateEWMA(
@@ -41,6 +43,8 @@ def calculateEWMA(
     REMOVE_ZEROES=True,
     MIN_PROB_LEVEL=1e-6,
     NUM_FIT_PARAMS=1,
+    USE_NUMPY=True,
+    state=None,
 ):
 
     # OMEGA the EWMA smoothing coefficient (between 0 and 1) default 0.4
@@ -69,32 +73,99 @@ def calculateEWMA(
     # MIN_PROB_LEVEL
     # NUM_FIT_PARAMS
 
-    minBaseline = NUM_FIT_PARAMS + MIN_DEG_FREEDOM
-    degFreedomRange = MAX_BASELINE_LEN - NUM_FIT_PARAMS
+    # passing a state ({} for a new series) treats data as the days that follow
+    # those already seen; only the new days are computed and the state to pass
+    # in with the next days is returned as a third value. It is only valid with
+    # the same parameters, and always uses the vectorized engine.
+
+    # state
+
+    if state is not None:
+        return calculateEWMANumpy(
+            data,
+            OMEGA,
+            MIN_DEG_FREEDOM,
+            MAX_BASELINE_LEN,
+            THRESHOLD_PROBABILITY_RED_ALERT,
+            THRESHOLD_PROBABILITY_YELLOW_ALERT,
+            NUM_GUARDBAND,
+            REMOVE_ZEROES,
+            MIN_PROB_LEVEL,
+            NUM_FIT_PARAMS,
+            state,
+        )
 
-    cleanedData = list(map(lambda x: 0 if x is None else x, data))
+    calculate = calculateEWMANumpy if USE_NUMPY else calculateEWMALoop
+    return calculate(
+        data,
+        OMEGA,
+        MIN_DEG_FREEDOM,
+        MAX_BASELINE_LEN,
+        THRESHOLD_PROBABILITY_RED_ALERT,
+        THRESHOLD_PROBABILITY_YELLOW_ALERT,
+        NUM_GUARDBAND,
+        REMOVE_ZEROES,
+        MIN_PROB_LEVEL,
+        NUM_FIT_PARAMS,
+    )
+
+
+# The t-distribution quantiles of the red and yellow alert probabilities for
+# every possible number of degrees of freedom, which the control limits are
+# built from. They are kept in TDistribution.QUANTILE_TABLE.
+#
+# @return [UCL_R, UCL_Y]
+
+
+def ewmaQuantiles(
+    MAX_BASELINE_LEN,
+    THRESHOLD_PROBABILITY_RED_ALERT,
+    THRESHOLD_PROBABILITY_YELLOW_ALERT,
+    NUM_FIT_PARAMS,
+):
+    degFreedom = range(1, MAX_BASELINE_LEN - NUM_FIT_PARAMS + 1)
+    return [
+        TDistribution.quantileTable(1 - probability, degFreedom).tolist()
+        for probability in (
+            THRESHOLD_PROBABILITY_RED_ALERT,
+            THRESHOLD_PROBABILITY_YELLOW_ALERT,
+        )
+    ]
+
+
+# The control limits and sigma coefficients for every possible number of
+# degrees of freedom. They only depend on the parameters, so they are computed
+# once per parameter set and reused across calls.
+#
+# @return [UCL_R, UCL_Y, sigmaCoeff, deltaSigma, minSigma]
+
+
+@functools.lru_cache(maxsize=64)
+def ewmaCoefficients(
+    OMEGA,
+    MAX_BASELINE_LEN,
+    THRESHOLD_PROBABILITY_RED_ALERT,
+    THRESHOLD_PROBABILITY_YELLOW_ALERT,
+    NUM_GUARDBAND,
+    NUM_FIT_PARAMS,
+):
+    degFreedomRange = MAX_BASELINE_LEN - NUM_FIT_PARAMS
 
-    UCL_R = []
-    UCL_Y = []
     sigmaCoeff = []
     deltaSigma = []
     minSigma = []
-    degFreedom = [None] * len(cleanedData)
     term1 = OMEGA / (2.0 - OMEGA)
     term2 = []
     term3 = []
 
+    [UCL_R, UCL_Y] = ewmaQuantiles(
+        MAX_BASELINE_LEN,
+        THRESHOLD_PROBABILITY_RED_ALERT,
+        THRESHOLD_PROBABILITY_YELLOW_ALERT,
+        NUM_FIT_PARAMS,
+    )
+
     for i in range(degFreedomRange):
-        UCL_R.append(
-            TDistribution.inverseCumulativeProbability(
-                1 - THRESHOLD_PROBABILITY_RED_ALERT, i + 1
-            )
-        )
-        UCL_Y.append(
-            TDistribution.inverseCumulativeProbability(
-                1 - THRESHOLD_PROBABILITY_YELLOW_ALERT, i + 1
-            )
-        )
         numBaseline = NUM_FIT_PARAMS + i + 1
         term2.append(1.0 / numBaseline)
         term3.append(
@@ -116,6 +187,180 @@ def calculateEWMA(
 
         minSigma.append((OMEGA / UCL_Y[i]) * (1.0 + 0.5 * ((1 - OMEGA) ** 2)))
 
+    return (
+        tuple(UCL_R),
+        tuple(UCL_Y),
+        tuple(sigmaCoeff),
+        tuple(deltaSigma),
+        tuple(minSigma),
+    )
+
+
+# Vectorized EWMA. The baseline mean and standard deviation of every day are
+# computed up front from strided views of the data; only the windows that hold
+# long runs of zeros go through FilterBaselineZeros3. The smoothing recurrence
+# depends on the previous day, so it remains a loop, run by
+# Kernels.ewmaSmoothing, but it only does a few float operations per day. The
+# p-values are computed in one array call.
+#
+# With a state, the data is appended to the days kept in the state (the
+# longest baseline plus the guardband) and only the new days are evaluated.
+
+
+def calculateEWMANumpy(
+    data,
+    OMEGA,
+    MIN_DEG_FREEDOM,
+    MAX_BASELINE_LEN,
+    THRESHOLD_PROBABILITY_RED_ALERT,
+    THRESHOLD_PROBABILITY_YELLOW_ALERT,
+    NUM_GUARDBAND,
+    REMOVE_ZEROES,
+    MIN_PROB_LEVEL,
+    NUM_FIT_PARAMS,
+    state=None,
+):
+    minBaseline = NUM_FIT_PARAMS + MIN_DEG_FREEDOM
+    maxBaseline = max(MAX_BASELINE_LEN, minBaseline - 1)
+    [UCL_R, _, sigmaCoeff, deltaSigma, minSigma] = [
+        numpy.array(x)
+        for x in ewmaCoefficients(
+            OMEGA,
+            MAX_BASELINE_LEN,
+            THRESHOLD_PROBABILITY_RED_ALERT,
+            THRESHOLD_PROBABILITY_YELLOW_ALERT,
+            NUM_GUARDBAND,
+            NUM_FIT_PARAMS,
+        )
+    ]
+
+    # the days seen before this call: how many there were, the last of them,
+    # and the smoothed value after them
+    state = None if state is None else EwmaState.model_validate(state)
+    previous = [] if state is None else list(state.tail)
+    numPrevious = 0 if state is None else state.count
+    smoothedData = None if state is None else state.smoothed
+
+    cleanedData = BaselineWindows.withPrevious(previous, data)
+    values = cleanedData.tolist()
+    numDays = len(values)
+    firstDay = numPrevious - len(previous)  # day number of values[0]
+    numNew = numDays - len(previous)
+
+    # the baseline of day j ends NUM_GUARDBAND days before it and grows from
+    # the first day until it reaches MAX_BASELINE_LEN days
+    days = numpy.arange(
+        max(minBaseline + NUM_GUARDBAND, numPrevious), firstDay + numDays
+    )
+    ends = days - NUM_GUARDBAND
+    lengths = numpy.minimum(ends, maxBaseline)
+    starts = ends - lengths - firstDay
+
+    expected, stdev = BaselineWindows.windowStatistics(cleanedData, starts, lengths)
+    flagged, nonZeroCount = BaselineWindows.zeroFilterCandidates(
+        cleanedData, starts, lengths
+    )
+    baselineLen = lengths.copy()
+
+    if REMOVE_ZEROES:
+        for k in numpy.flatnonzero(flagged & (nonZeroCount > 0)):
+            testBase = values[starts[k] : starts[k] + lengths[k]]
+            if not FilterBaselineZeros3.filterBaselineZerosTest(testBase):
+                continue
+            ndxOK = FilterBaselineZeros3.filterBaselineZeros(testBase)
+            baselineData = numpy.array([testBase[i] for i in ndxOK])
+            baselineLen[k] = len(baselineData)
+            nonZeroCount[k] = numpy.count_nonzero(baselineData)
+            expected[k] = baselineData.mean()
+            stdev[k] = baselineData.std(ddof=1) if len(baselineData) > 1 else numpy.nan
+
+    # the number of degrees of freedom; days whose baseline is all zeros or too
+    # short get no prediction
+    degFreedom = baselineLen - NUM_FIT_PARAMS
+    valid = (nonZeroCount > 0) & (degFreedom >= MIN_DEG_FREEDOM)
+
+    # the adjusted standard deviation of the baseline data, no smaller than
+    # MinSigma
+    ndx = degFreedom[valid] - 1
+    sigma = numpy.full(len(days), numpy.nan)
+    sigma[valid] = numpy.maximum(
+        sigmaCoeff[ndx] * stdev[valid] + deltaSigma[ndx], minSigma[ndx]
+    )
+    limit = numpy.full(len(days), numpy.nan)
+    limit[valid] = UCL_R[ndx]
+    expected[~valid] = numpy.nan
+
+    # initialize the smoothed data
+    for m in range(numPrevious, min(minBaseline + NUM_GUARDBAND, firstDay + numDays)):
+        if m == 0:
+            smoothedData = values[0]
+        else:
+            smoothedData = OMEGA * values[m - firstDay] + (1 - OMEGA) * smoothedData
+
+    test_stat = numpy.full(len(days), numpy.nan)
+    if len(days) > 0:
+        # smooth the data using an exponentially weighted moving average (EWMA)
+        test_stat, smoothedData = Kernels.ewmaSmoothing(
+            values, days - firstDay, valid, expected, sigma, limit, OMEGA, smoothedData
+        )
+
+    pvalues = numpy.full(len(days), numpy.nan)
+    ndxTest = numpy.abs(test_stat) > 0.0
+    pvalues[ndxTest] = numpy.maximum(
+        1
+        - TDistribution.cumulativeProbabilities(
+            test_stat[ndxTest], degFreedom[ndxTest]
+        ),
+        MIN_PROB_LEVEL,
+    )
+
+    pvaluesArray = numpy.full(numNew, numpy.nan)
+    pvaluesArray[days - numPrevious] = pvalues
+    expectedDataArray = numpy.full(numNew, numpy.nan)
+    expectedDataArray[days - numPrevious] = expected
+
+    result = [
+        BaselineWindows.toList(pvaluesArray),
+        BaselineWindows.toList(expectedDataArray),
+    ]
+    if state is None:
+        return result
+
+    keep = max(0, numDays - maxBaseline - NUM_GUARDBAND)
+    state = {
+        "tail": values[keep:],
+        "count": numPrevious + numNew,
+        "smoothed": smoothedData,
+    }
+    return result + [state]
+
+
+def calculateEWMALoop(
+    data,
+    OMEGA,
+    MIN_DEG_FREEDOM,
+    MAX_BASELINE_LEN,
+    THRESHOLD_PROBABILITY_RED_ALERT,
+    THRESHOLD_PROBABILITY_YELLOW_ALERT,
+    NUM_GUARDBAND,
+    REMOVE_ZEROES,
+    MIN_PROB_LEVEL,
+    NUM_FIT_PARAMS,
+):
+    minBaseline = NUM_FIT_PARAMS + MIN_DEG_FREEDOM
+    [UCL_R, UCL_Y, sigmaCoeff, deltaSigma, minSigma] = ewmaCoefficients(
+        OMEGA,
+        MAX_BASELINE_LEN,
+        THRESHOLD_PROBABILITY_RED_ALERT,
+        THRESHOLD_PROBABILITY_YELLOW_ALERT,
+        NUM_GUARDBAND,
+        NUM_FIT_PARAMS,
+    )
+
+    cleanedData = list(map(lambda x: 0 if x is None else x, data))
+
+    degFreedom = [None] * len(cleanedData)
+
     pvalues = [None] * len(cleanedData)
     test_stat = [None] * len(cleanedData)
     sigma = []
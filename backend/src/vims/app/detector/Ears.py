@@ -26,6 +26,9 @@ import statistics
 
 import numpy
 
+from ..model.detector import EarsState
+from .util import BaselineWindows
+
 # Runs the CDC Ears algorithms C1, C2, and C3.
 
 ##########################
@@ -67,9 +70,143 @@ def calculateC3(data):
 # @param cusumK    CUSUM K value
 # @param minSigma  minimum sigma allowed
 # @param thresh    what the threshold should be set at.
+# @param state     ({} for a new series) treats data as the days that follow
+#                  those already seen; only the new days are computed and the
+#                  state to pass in with the next days is returned as a third
+#                  value. It is only valid with the same parameters, and always
+#                  uses the vectorized engine.
+
+
+def calculateEARS(
+    data,
+    baseline,
+    baseLag,
+    cusumFlag,
+    cusumK,
+    minSigma,
+    thresh,
+    USE_NUMPY=True,
+    state=None,
+):
+    if state is not None:
+        return calculateEARSNumpy(
+            data, baseline, baseLag, cusumFlag, cusumK, minSigma, thresh, state
+        )
+
+    calculate = calculateEARSNumpy if USE_NUMPY else calculateEARSLoop
+    return calculate(data, baseline, baseLag, cusumFlag, cusumK, minSigma, thresh)
+
+
+# Vectorized EARS. The baseline mean and standard deviation of every day come
+# from one pass of running sums. The CUSUM part only carries the scores of the
+# two previous days forward, dropping those at or above the threshold, so it is
+# a shifted sum of the scores rather than a loop.
+#
+# With a state, the data is appended to the days kept in the state (the
+# baseline plus the lag) and the carried scores are picked up from it. Only
+# the last baseline plus lag days of a longer tail are used, since the carried
+# scores are those of the days just before the new ones.
+
+
+def calculateEARSNumpy(
+    data, baseline, baseLag, cusumFlag, cusumK, minSigma, thresh, state=None
+):
+
+    state = None if state is None else EarsState.model_validate(state)
+    previous = [] if state is None else list(state.tail)
+    previous = previous[max(0, len(previous) - baseline - baseLag) :]
+    carry = (0, 0) if state is None else state.cusum
+
+    cleanedData = BaselineWindows.withPrevious(previous, data)
+    numNew = len(cleanedData) - len(previous)
+    if len(cleanedData) > baseline + baseLag and baseline < 2:
+        raise statistics.StatisticsError("stdev requires at least two data points")
+
+    [estMean, stdev] = BaselineWindows.rollingStatistics(cleanedData, baseline)
+    currSum = earsScores(
+        cleanedData, estMean, stdev, baseline, baseLag, cusumK, minSigma
+    )
+
+    result = [
+        earsStatistic(currSum, numNew, cusumFlag, thresh, carry),
+        [0] * numNew,
+    ]
+    if state is None:
+        return result
+
+    carried = numpy.where(currSum >= thresh, 0, currSum)
+    keep = max(0, len(cleanedData) - baseline - baseLag)
+    state = {
+        "tail": cleanedData[keep:].tolist(),
+        "cusum": numpy.concatenate((carry, carried))[-2:].tolist(),
+    }
+    return result + [state]
+
+
+# Runs the CDC Ears algorithms C1, C2 and C3 together. All three use 7 day
+# baselines, so the rolling baseline statistics are computed once: C2 and C3
+# use the same windows as C1 two days further back, and C3 only adds the
+# CUSUM of the C2 scores.
+#
+# @param data data array from first day to last, no interuptions.
+#
+# @return [c1, c2, c3, expectedData]
+
+
+def calculateC1C2C3(data):
+    cleanedData = BaselineWindows.cleanData(data)
+    numDays = len(cleanedData)
+
+    [estMean, stdev] = BaselineWindows.rollingStatistics(cleanedData, 7)
+    c1Sum = earsScores(cleanedData, estMean, stdev, 7, 0, 1, 0.1)
+    c2Sum = earsScores(cleanedData, estMean, stdev, 7, 2, 1, 0.1)
+
+    return [
+        earsStatistic(c1Sum, numDays, 0, 2),
+        earsStatistic(c2Sum, numDays, 0, 2),
+        earsStatistic(c2Sum, numDays, 1, 2),
+        [0] * numDays,
+    ]
+
+
+# The EARS score of every day that has a full baseline, from the rolling
+# statistics of the cleaned data (window s covers days s to s + baseline - 1).
+
+
+def earsScores(cleanedData, estMean, stdev, baseline, baseLag, cusumK, minSigma):
+    firstDay = baseline + baseLag
+    numScores = max(0, len(cleanedData) - firstDay)
+    estSigma = numpy.maximum(minSigma, stdev[:numScores])
+
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        currSum = (
+            numpy.maximum(
+                0, cleanedData[firstDay:] - estMean[:numScores] - cusumK * estSigma
+            )
+            / estSigma
+        )
+    currSum[~numpy.isfinite(currSum)] = 0
+    return currSum
+
+
+# Adds the CUSUM of the two previous days to the scores and pads the days
+# without a baseline with 0. carry holds the scores carried from the two days
+# before the first one.
+
+
+def earsStatistic(currSum, numDays, cusumFlag, thresh, carry=(0, 0)):
+    carried = numpy.where(currSum >= thresh, 0, currSum)
+    cusum1 = numpy.concatenate((carry[1:], carried))[: len(carried)]
+    cusum0 = numpy.concatenate((carry, carried))[: len(carried)]
+    earStat = currSum + cusumFlag * (cusum0 + cusum1)
+
+    return [0] * (numDays - len(earStat)) + earStat.tolist()
+
+
+# The original day by day EARS loop.
 
 
-def calculateEARS(data, baseline, baseLag, cusumFlag, cusumK, minSigma, thresh):
+def calculateEARSLoop(data, baseline, baseLag, cusumFlag, cusumK, minSigma, thresh):
 
     cleanedData = list(map(lambda x: 0 if x is None else x, data))
 
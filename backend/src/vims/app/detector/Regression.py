@@ -0,0 +1,286 @@
+#  Copyright (c) 2013-2025. The Johns Hopkins University Applied Physics Laboratory LLC
+#
+#
+# This material may be used, modified, or reproduced by or for the U.S.
+# Government pursuant to the rights granted under the clauses at
+# DFARS 252.227-7013/7014 or FAR 52.227-14.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# NO WARRANTY.   THIS MATERIAL IS PROVIDED "AS IS."  JHU/APL DISCLAIMS ALL
+# WARRANTIES IN THE MATERIAL, WHETHER EXPRESS OR IMPLIED, INCLUDING (BUT NOT
+# LIMITED TO) ANY AND ALL IMPLIED WARRANTIES OF PERFORMANCE,
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF
+# INTELLECTUAL PROPERTY RIGHTS. ANY USER OF THE MATERIAL ASSUMES THE ENTIRE
+# RISK AND LIABILITY FOR USING THE MATERIAL.  IN NO EVENT SHALL JHU/APL BE
+# LIABLE TO ANY USER OF THE MATERIAL FOR ANY ACTUAL, INDIRECT,
+# CONSEQUENTIAL, SPECIAL OR OTHER DAMAGES ARISING FROM THE USE OF, OR
+# INABILITY TO USE, THE MATERIAL, INCLUDING, BUT NOT LIMITED TO, ANY DAMAGES
+# FOR LOST PROFITS.
+
+import numpy
+
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .util import BaselineWindows, FilterBaselineZeros3, TDistribution
+
+# The prediction comes out of a least squares solve, so a count that the fit
+# matches exactly is only matched up to rounding; test statistics this close to
+# zero are treated as zero and get no p-value.
+MIN_TEST_STAT = 1e-9
+
+
+def calculateRegression(
+    data,
+    BASELINE_LEN=28,
+    NUM_GUARDBAND=2,
+    DAY_OF_WEEK=True,
+    FIRST_WEEKDAY=0,
+    HOLIDAYS=(),
+    REMOVE_ZEROES=True,
+    MIN_DEG_FREEDOM=2,
+    MIN_SIGMA=0.5,
+    MIN_PROB_LEVEL=1e-6,
+):
+
+    # Adaptive regression: the counts of the baseline period are fitted with
+    # an intercept, a linear trend, day of week and holiday terms, and the
+    # count of the test day is compared to the prediction of the fit.
+
+    # BASELINE_LEN the number of days in the baseline period
+    # NUM_GUARDBAND the number of days between the baseline and the test day
+
+    # if true six day of week indicators are fitted (the first weekday is the
+    # reference level)
+
+    # DAY_OF_WEEK
+
+    # the weekday of the first day of the data, 0 for Monday to 6 for Sunday
+
+    # FIRST_WEEKDAY
+
+    # the indices into data of the holidays; each gets its own indicator when
+    # it falls in the baseline period or on the test day
+
+    # HOLIDAYS
+
+    # if true unusually long strings of zeros in the baseline period
+    # are removed prior to fitting
+
+    # REMOVE_ZEROES = remove
+
+    # MIN_DEG_FREEDOM the minimum number of residual degrees of freedom
+    # MIN_SIGMA the minimum standard error of the prediction
+    # MIN_PROB_LEVEL
+
+    [pvalues, expectedData] = calculateRegressionBatch(
+        [data],
+        BASELINE_LEN,
+        NUM_GUARDBAND,
+        DAY_OF_WEEK,
+        FIRST_WEEKDAY,
+        HOLIDAYS,
+        REMOVE_ZEROES,
+        MIN_DEG_FREEDOM,
+        MIN_SIGMA,
+        MIN_PROB_LEVEL,
+    )
+    return [pvalues[0], expectedData[0]]
+
+
+# The regressors of the given days of a window starting on day start: an
+# intercept, the trend, the day of week indicators and one indicator per
+# holiday.
+#
+# @param days   day indices into the data, as an array.
+# @param start  first day of the window.
+# @param holidayDays sorted array of the holiday day indices in the window.
+#
+# @return design matrix with a row per day
+
+
+def regressors(days, start, DAY_OF_WEEK, FIRST_WEEKDAY, holidayDays):
+    columns = [numpy.ones(len(days)), (days - start) / 7.0]
+    if DAY_OF_WEEK:
+        weekday = (days + FIRST_WEEKDAY) % 7
+        columns += [weekday == d for d in range(1, 7)]
+    columns += [days == h for h in holidayDays]
+    return numpy.column_stack(columns).astype(numpy.float64)
+
+
+# The least squares fit of a design, summarized by what the test statistic
+# needs: the prediction weights (the prediction of the test day is
+# weights . y), the projection onto the fitted values, the leverage of the
+# test day and the rank of the design.
+#
+# @param baseline design matrices of the baseline periods, (..., n, p).
+# @param test     regressors of the test days, (..., p).
+#
+# @return [weights, projection, leverage, rank]
+
+
+def leastSquaresFit(baseline, test):
+    pinv = numpy.linalg.pinv(baseline)
+    weights = numpy.einsum("...p,...pn->...n", test, pinv)
+    projection = baseline @ pinv
+    leverage = numpy.einsum("...n,...n->...", weights, weights)
+    rank = numpy.linalg.matrix_rank(baseline)
+    return [weights, projection, leverage, rank]
+
+
+# The regressors of a stack of windows, one row per baseline day followed by
+# the test day. Every window gets as many holiday indicators as the window
+# with the most holidays; the unused ones are columns of zeros, which leave
+# the fit unchanged, so windows of different designs can be solved together.
+#
+# @param windowDays day indices of the windows, (w, n + 1).
+# @param isHoliday  mask of the holidays among windowDays, (w, n + 1).
+#
+# @return design matrices, (w, n + 1, p)
+
+
+def windowRegressors(windowDays, isHoliday, DAY_OF_WEEK, FIRST_WEEKDAY, numHolidays):
+    numWindows, numRows = windowDays.shape
+    columns = [
+        numpy.ones((numWindows, numRows)),
+        (windowDays - windowDays[:, :1]) / 7.0,
+    ]
+    if DAY_OF_WEEK:
+        weekday = (windowDays + FIRST_WEEKDAY) % 7
+        columns += [weekday == d for d in range(1, 7)]
+    holidayRank = numpy.cumsum(isHoliday, axis=1) - 1
+    columns += [isHoliday & (holidayRank == h) for h in range(numHolidays)]
+    return numpy.stack(columns, axis=-1).astype(numpy.float64)
+
+
+# Batched adaptive regression over many series of the same days. The design
+# matrix of a baseline period does not depend on the counts, only on the day
+# of week of its first day and on the holidays inside it, so the windows fall
+# into a few distinct designs. Each design is solved once, and its prediction
+# weights and projection are applied to the windows of every series with a
+# matrix product. The windows that FilterBaselineZeros3 trims are refitted
+# with the removed days zeroed out of their design, which drops them from the
+# fit, in chunks of REFIT_CHUNK windows.
+#
+# @param series list of data arrays, all from the same first day to last.
+#
+# @return [pvalues, expectedData], each a list with one array per series
+
+REFIT_CHUNK = 4096
+
+
+def calculateRegressionBatch(
+    series,
+    BASELINE_LEN=28,
+    NUM_GUARDBAND=2,
+    DAY_OF_WEEK=True,
+    FIRST_WEEKDAY=0,
+    HOLIDAYS=(),
+    REMOVE_ZEROES=True,
+    MIN_DEG_FREEDOM=2,
+    MIN_SIGMA=0.5,
+    MIN_PROB_LEVEL=1e-6,
+):
+    values = numpy.array([BaselineWindows.cleanData(data) for data in series])
+    values = values.reshape(len(series), -1)
+    numSeries, numDays = values.shape
+    pvalues = numpy.full((numSeries, numDays), numpy.nan)
+    expected = numpy.full((numSeries, numDays), numpy.nan)
+
+    days = numpy.arange(BASELINE_LEN + NUM_GUARDBAND, numDays)
+    if len(days) == 0 or numSeries == 0:
+        return [[BaselineWindows.toList(row) for row in a] for a in (pvalues, expected)]
+
+    starts = days - NUM_GUARDBAND - BASELINE_LEN
+    offsets = numpy.arange(BASELINE_LEN)
+    holidays = numpy.unique(numpy.asarray(HOLIDAYS, dtype=numpy.int64))
+
+    # windows with the same first weekday and the same holidays at the same
+    # offsets share their design
+    phase = (starts + FIRST_WEEKDAY) % 7 if DAY_OF_WEEK else numpy.zeros_like(starts)
+    windowDays = numpy.concatenate((starts[:, None] + offsets, days[:, None]), axis=1)
+    isHoliday = numpy.isin(windowDays, holidays)
+    numHolidays = int(isHoliday.sum(axis=1).max())
+    keys = numpy.concatenate((phase[:, None], isHoliday), axis=1)
+    designKeys, firstWindow, design = numpy.unique(
+        keys, axis=0, return_index=True, return_inverse=True
+    )
+    design = design.reshape(-1)
+
+    X = windowRegressors(
+        windowDays[firstWindow],
+        isHoliday[firstWindow],
+        DAY_OF_WEEK,
+        FIRST_WEEKDAY,
+        numHolidays,
+    )
+    [weights, projection, h, rank] = leastSquaresFit(X[:, :-1], X[:, -1])
+
+    # the windows of every series, (s, w, n), against the fit of their design
+    baselineData = sliding_window_view(values, BASELINE_LEN, axis=1)[:, starts]
+    testData = values[:, days]
+    prediction = numpy.einsum("swn,wn->sw", baselineData, weights[design])
+    residuals = baselineData - numpy.einsum(
+        "wmn,swn->swm", projection[design], baselineData
+    )
+    sse = numpy.einsum("swn,swn->sw", residuals, residuals)
+    leverage = numpy.broadcast_to(h[design], (numSeries, len(days))).copy()
+    degFreedom = numpy.broadcast_to(
+        (BASELINE_LEN - rank[design]).astype(numpy.float64), (numSeries, len(days))
+    ).copy()
+
+    valid = numpy.ones((numSeries, len(days)), dtype=bool)
+    refits = []
+    for s in range(numSeries):
+        flagged, nonZeroCount = BaselineWindows.zeroFilterCandidates(
+            values[s], starts, numpy.full(len(starts), BASELINE_LEN)
+        )
+        # a baseline period filled with zeros gives no prediction
+        valid[s] = nonZeroCount > 0
+        if not REMOVE_ZEROES:
+            continue
+
+        row = values[s].tolist()
+        for k in numpy.flatnonzero(flagged & valid[s]):
+            testBase = row[starts[k] : starts[k] + BASELINE_LEN]
+            if FilterBaselineZeros3.filterBaselineZerosTest(testBase):
+                keep = numpy.zeros(BASELINE_LEN, dtype=bool)
+                keep[FilterBaselineZeros3.filterBaselineZeros(testBase)] = True
+                refits.append((s, k, keep))
+
+    for chunk in range(0, len(refits), REFIT_CHUNK):
+        s, k, keep = map(numpy.array, zip(*refits[chunk : chunk + REFIT_CHUNK]))
+        X = windowRegressors(
+            windowDays[k], isHoliday[k], DAY_OF_WEEK, FIRST_WEEKDAY, numHolidays
+        )
+        [weights, projection, h, rank] = leastSquaresFit(
+            X[:, :-1] * keep[:, :, None], X[:, -1]
+        )
+        y = baselineData[s, k] * keep
+        r = y - numpy.einsum("wmn,wn->wm", projection, y)
+        prediction[s, k] = numpy.einsum("wn,wn->w", weights, y)
+        sse[s, k] = numpy.einsum("wn,wn->w", r, r)
+        leverage[s, k] = h
+        degFreedom[s, k] = keep.sum(axis=1) - rank
+
+    valid &= degFreedom >= MIN_DEG_FREEDOM
+    with numpy.errstate(invalid="ignore", divide="ignore"):
+        sigma = numpy.sqrt(sse / degFreedom * (1 + leverage))
+    sigma = numpy.maximum(numpy.nan_to_num(sigma), MIN_SIGMA)
+    testStat = numpy.where(valid, (testData - prediction) / sigma, numpy.nan)
+
+    ndxTest = valid & (numpy.abs(testStat) > MIN_TEST_STAT)
+    testPValues = numpy.full(testStat.shape, numpy.nan)
+    testPValues[ndxTest] = numpy.maximum(
+        1
+        - TDistribution.cumulativeProbabilities(testStat[ndxTest], degFreedom[ndxTest]),
+        MIN_PROB_LEVEL,
+    )
+    pvalues[:, days] = testPValues
+    expected[:, days] = numpy.where(valid, prediction, numpy.nan)
+
+    return [[BaselineWindows.toList(row) for row in a] for a in (pvalues, expected)]
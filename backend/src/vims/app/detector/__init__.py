@@ -18,254 +18,292 @@
 # INABILITY TO USE, THE MATERIAL, INCLUDING, BUT NOT LIMITED TO, ANY DAMAGES
 # FOR LOST PROFITS.
 
-from typing import Dict
+from typing import Dict, List
 
-from fastapi import APIRouter, Depends
+import hashlib
+import json
 
-from ..auth import Permission, require_permission
-from .CusumSagesDetector import calculateCUSUM
-from .Ears import calculateC1, calculateC2, calculateC3, calculateEARS
-from .EWMA import calculateEWMA
+import numpy
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 
+from vims.core import Config, Dependency, Inject, Reference
 
-def detector():
+from ..auth import Permission, require_permission
+from ..config import config
+from ..model import (
+    CdcParams,
+    CusumParams,
+    DetectorParams,
+    EarsParams,
+    EwmaParams,
+    RegressionParams,
+)
+from ..settings import Settings
+from .cache import DetectorCache
+from .executor import DetectorQueueFull
+from .payload import (
+    PayloadError,
+    UnsupportedMediaType,
+    decode_data,
+    encode_result,
+    media_type,
+    run_detector_raw,
+)
+from .runner import (
+    Algorithm,
+    DetectorJobError,
+    params_dict,
+    parse_batch,
+    run_batch_chunk,
+    run_detector,
+    validate_params,
+)
+from .tuning import run_tuning
+from .util import BaselineWindows
+
+
+def detector(config: Config = Inject(config)):
     router = APIRouter()
 
+    max_tuning_combinations = config.get(
+        Settings.DETECTOR_TUNING_MAX_COMBINATIONS, 1000
+    )
+
+    async def run_in_executor(fn, *args):
+        executor = await Dependency.resolve(Reference.DETECTOR_EXECUTOR)
+        try:
+            return await executor.run(fn, *args)
+        except DetectorQueueFull as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e)
+            )
+
+    async def map_in_executor(fn, items, *args):
+        executor = await Dependency.resolve(Reference.DETECTOR_EXECUTOR)
+        try:
+            return await executor.map_chunks(fn, items, *args)
+        except DetectorQueueFull as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e)
+            )
+
+    async def run_cached(key, run, *args):
+        cache = await Dependency.resolve(Reference.DETECTOR_CACHE)
+        result = cache.get(key)
+        if result is None:
+            result = await run(*args)
+            cache.set(key, result)
+        return result
+
+    def series_key(algorithm, params, **extra):
+        # the data is hashed as float64 bytes rather than as JSON
+        digest = hashlib.sha1(params["data"].tobytes()).hexdigest()
+        return DetectorCache.key(algorithm, {**params, "data": digest, **extra})
+
+    async def run_detector_params(algorithm, params: DetectorParams, echo_data):
+        params = params_dict(params)
+        key = series_key(algorithm, params)
+        result = await run_cached(key, run_in_executor, run_detector, algorithm, params)
+        return echo(result, echo_data)
+
+    def echo(result, echo_data):
+        # Results are cached with the data in their params; it is only dropped
+        # from what is sent back.
+        if "data" not in result.get("params", {}):
+            return result
+        params = {k: v for k, v in result["params"].items() if k != "data"}
+        if echo_data:
+            data = result["params"]["data"]
+            if isinstance(data, numpy.ndarray):
+                data = BaselineWindows.toList(data)
+            params["data"] = data
+        return {**result, "params": params}
+
     @router.post(
         "/cusum",
         dependencies=[Depends(require_permission(Permission.READ_DATASET_SHARED))],
     )
-    async def post_cusum(params: Dict):
-        # Initialize Parameters
-        #  cusum_k = 0.5
-        #  baseline = 28
-        #  guardband = 2
-        #  min_sigma = 0.5
-        #  reset_level = 4
-
-        data = None
-        cusum_k = 0.5
-        baseline = 28
-        guardband = 2
-        min_sigma = 0.5
-        reset_level = 4
-
-        if "data" in params:
-            data = params["data"]
-
-        if "cusum_k" in params:
-            cusum_k = params["cusum_k"]
-
-        if "baseline" in params:
-            baseline = params["baseline"]
-
-        if "guardband" in params:
-            guardband = params["guardband"]
-
-        if "min_sigma" in params:
-            min_sigma = params["min_sigma"]
-
-        if "reset_level" in params:
-            reset_level = params["reset_level"]
-
-        [pvalues, expectedData] = calculateCUSUM(
-            data, cusum_k, baseline, guardband, min_sigma, reset_level
-        )
-
-        params = {
-            "data": data,
-            "cusum_k": cusum_k,
-            "baseline": baseline,
-            "guardband": guardband,
-            "min_sigma": min_sigma,
-            "reset_level": reset_level,
-        }
-
-        return {"params": params, "pValues": pvalues, "expectedData": expectedData}
+    async def post_cusum(params: CusumParams, echo_data: bool = True):
+        return await run_detector_params(Algorithm.cusum, params, echo_data)
 
     @router.post(
         "/ears",
         dependencies=[Depends(require_permission(Permission.READ_DATASET_SHARED))],
     )
-    async def post_ears(params: Dict):
-        data = None
-        baseline = None
-        base_lag = None
-        cusum_flag = None
-        cusum_k = None
-        min_sigma = None
-        thresh = None
-
-        if "data" in params:
-            data = params["data"]
-
-        if "baseline" in params:
-            baseline = params["baseline"]
-
-        if "base_lag" in params:
-            base_lag = params["base_lag"]
-
-        if "cusum_flag" in params:
-            cusum_flag = params["cusum_flag"]
-
-        if "cusum_k" in params:
-            cusum_k = params["cusum_k"]
-
-        if "min_sigma" in params:
-            min_sigma = params["min_sigma"]
-
-        if "thresh" in params:
-            thresh = params["thresh"]
-
-        [earStat, expectedData] = calculateEARS(
-            data, baseline, base_lag, cusum_flag, cusum_k, min_sigma, thresh
-        )
-
-        params = {
-            "data": data,
-            "baseline": baseline,
-            "base_lag": base_lag,
-            "cusum_flag": cusum_flag,
-            "cusum_k": cusum_k,
-            "min_sigma": min_sigma,
-            "thresh": thresh,
-        }
-
-        return {"params": params, "earStat": earStat, "expectedData": expectedData}
+    async def post_ears(params: EarsParams, echo_data: bool = True):
+        return await run_detector_params(Algorithm.ears, params, echo_data)
 
     @router.post(
         "/cdc1",
         dependencies=[Depends(require_permission(Permission.READ_DATASET_SHARED))],
     )
-    async def post_cdc1(params: Dict):
-        data = None
-
-        if "data" in params:
-            data = params["data"]
-
-        [earStat, expectedData] = calculateC1(data)
-
-        params = {"data": data}
-
-        return {"params": params, "earStat": earStat, "expectedData": expectedData}
+    async def post_cdc1(params: CdcParams, echo_data: bool = True):
+        return await run_detector_params(Algorithm.cdc1, params, echo_data)
 
     @router.post(
         "/cdc2",
         dependencies=[Depends(require_permission(Permission.READ_DATASET_SHARED))],
     )
-    async def post_cdc2(params: Dict):
-        data = None
-
-        if "data" in params:
-            data = params["data"]
-
-        [earStat, expectedData] = calculateC2(data)
-
-        params = {"data": data}
-
-        return {"params": params, "earStat": earStat, "expectedData": expectedData}
+    async def post_cdc2(params: CdcParams, echo_data: bool = True):
+        return await run_detector_params(Algorithm.cdc2, params, echo_data)
 
     @router.post(
         "/cdc3",
         dependencies=[Depends(require_permission(Permission.READ_DATASET_SHARED))],
     )
-    async def post_cdc3(params: Dict):
-        data = None
+    async def post_cdc3(params: CdcParams, echo_data: bool = True):
+        return await run_detector_params(Algorithm.cdc3, params, echo_data)
 
-        if "data" in params:
-            data = params["data"]
+    @router.post(
+        "/cdc",
+        summary="Run the CDC C1, C2 and C3 detectors in one pass",
+        dependencies=[Depends(require_permission(Permission.READ_DATASET_SHARED))],
+    )
+    async def post_cdc(params: CdcParams, echo_data: bool = True):
+        """
+        Returns the C1, C2 and C3 statistics of the data as "c1", "c2" and
+        "c3", each the same as the earStat of the matching /cdcN endpoint.
+        """
+        return await run_detector_params(Algorithm.cdc, params, echo_data)
 
-        [earStat, expectedData] = calculateC3(data)
+    @router.post(
+        "/ewma",
+        dependencies=[Depends(require_permission(Permission.READ_DATASET_SHARED))],
+    )
+    async def post_ewma(params: EwmaParams, echo_data: bool = True):
+        return await run_detector_params(Algorithm.ewma, params, echo_data)
 
-        params = {"data": data}
+    @router.post(
+        "/regression",
+        summary="Run the day of week adjusted regression detector",
+        dependencies=[Depends(require_permission(Permission.READ_DATASET_SHARED))],
+    )
+    async def post_regression(params: RegressionParams, echo_data: bool = True):
+        """
+        The data must be daily counts. first_weekday is the weekday of the
+        first day (0 for Monday) and holidays the indices of the holidays in
+        the data; each holiday gets its own term in the fit.
+        """
+        return await run_detector_params(Algorithm.regression, params, echo_data)
 
-        return {"params": params, "earStat": earStat, "expectedData": expectedData}
+    @router.post(
+        "/batch",
+        summary="Run several detector jobs in one request",
+        dependencies=[Depends(require_permission(Permission.READ_DATASET_SHARED))],
+    )
+    async def post_batch(jobs: List[Dict], echo_data: bool = True):
+        """
+        Each job is a dict of the form
+        {"algorithm": "cusum|ears|cdc1|cdc2|cdc3|cdc|ewma|regression",
+        "params": {...}, "data": [...]}, where params takes the same values as the single
+        detector endpoints. Results are returned in the order of the jobs.
+        With echo_data=false the data is left out of the params returned.
+        """
+
+        async def run_jobs():
+            # Every job is validated before any of them runs, so a bad job
+            # fails the batch without wasting work on the others; the jobs
+            # are then spread over the workers.
+            return await map_in_executor(run_batch_chunk, parse_batch(jobs))
+
+        try:
+            key = DetectorCache.key("batch", {"jobs": jobs})
+            results = await run_cached(key, run_jobs)
+            return [echo(result, echo_data) for result in results]
+        except DetectorJobError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     @router.post(
-        "/ewma",
+        "/tune",
+        summary="Run a detector over a grid of params",
+        dependencies=[Depends(require_permission(Permission.READ_DATASET_SHARED))],
+    )
+    async def post_tune(job: Dict):
+        """
+        The job is a dict of the form {"algorithm": "cusum|ewma|...",
+        "data": [...], "grid": {"omega": [0.2, 0.4], ...}, "params": {...}},
+        where grid lists the values to try for each tuned param and params
+        holds the ones that stay fixed. Every combination of the grid is run
+        over the data on the detector workers, and the number of red and
+        yellow alerts and the run time of each are returned in grid order.
+        """
+        executor = await Dependency.resolve(Reference.DETECTOR_EXECUTOR)
+        try:
+            return await run_tuning(
+                executor,
+                job.get("algorithm"),
+                job.get("data"),
+                job.get("grid") or {},
+                job.get("params") or {},
+                max_tuning_combinations,
+            )
+        except DetectorJobError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except DetectorQueueFull as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e)
+            )
+
+    @router.post(
+        "/{algorithm}/raw",
+        summary="Run a detector on a binary data series",
         dependencies=[Depends(require_permission(Permission.READ_DATASET_SHARED))],
     )
-    async def post_ewma(params: Dict):
-        # Initialize Parameters
-        #  omega = 0.4
-        #  min_deg_freedom = 2
-        #  max_base_line_len = 28
-        #  threshold_probability_red_alert = 0.01
-        #  threshold_probability_yellow_alert = 0.05
-        #  num_guardband = 2
-        #  remove_zeros = True
-        #  min_prob_level = 1E-6
-        #  num_fit_params = 1
-
-        data = None
-        omega = 0.4
-        min_deg_freedom = 2
-        max_base_line_len = 28
-        threshold_probability_red_alert = 0.01
-        threshold_probability_yellow_alert = 0.05
-        num_guardband = 2
-        remove_zeros = True
-        min_prob_level = 1e-6
-        num_fit_params = 1
-
-        if "data" in params:
-            data = params["data"]
-
-        if "omega" in params:
-            omega = params["omega"]
-
-        if "min_deg_freedom" in params:
-            min_deg_freedom = params["min_deg_freedom"]
-
-        if "max_base_line_len" in params:
-            max_base_line_len = params["max_base_line_len"]
-
-        if "threshold_probability_red_alert" in params:
-            threshold_probability_red_alert = params["threshold_probability_red_alert"]
-
-        if "threshold_probability_yellow_alert" in params:
-            threshold_probability_yellow_alert = params[
-                "threshold_probability_yellow_alert"
-            ]
-
-        if "num_guardband" in params:
-            num_guardband = params["num_guardband"]
-
-        if "remove_zeros" in params:
-            remove_zeros = params["remove_zeros"]
-
-        if "min_prob_level" in params:
-            min_prob_level = params["min_prob_level"]
-
-        if "num_fit_params" in params:
-            num_fit_params = params["num_fit_params"]
-
-        [pvalues, expectedData] = calculateEWMA(
-            data,
-            omega,
-            min_deg_freedom,
-            max_base_line_len,
-            threshold_probability_red_alert,
-            threshold_probability_yellow_alert,
-            num_guardband,
-            remove_zeros,
-            min_prob_level,
-            num_fit_params,
+    async def post_raw(algorithm: Algorithm, request: Request, params: str = "{}"):
+        """
+        The body is the data series, either raw little-endian float64 values
+        (application/octet-stream) or an Arrow IPC stream with a "data"
+        column (application/vnd.apache.arrow.stream). params is the JSON
+        encoded params of the matching JSON endpoint, without the data.
+
+        The result series are returned as columns in the format of the
+        request, one after the other for raw float64, with missing values as
+        NaN. Their names are listed in the X-Detector-Columns header and the
+        state to resume from, if any, is in the X-Detector-State header.
+        """
+        try:
+            request_type = media_type(request.headers.get("content-type"))
+        except UnsupportedMediaType as e:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(e)
+            )
+        try:
+            params = json.loads(params)
+        except ValueError:
+            params = None
+        if not isinstance(params, dict):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="params must be a JSON encoded dict.",
+            )
+
+        body = await request.body()
+        try:
+            data = decode_data(body, request_type)
+        except PayloadError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+        try:
+            params = validate_params(algorithm, {**params, "data": []})
+        except DetectorJobError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        del params["data"]
+
+        key = series_key(algorithm, {**params, "data": data}, payload="raw")
+        result = await run_cached(
+            key, run_in_executor, run_detector_raw, algorithm, params, data
         )
+        content, headers = encode_result(result, request_type)
+        return Response(content=content, media_type=request_type, headers=headers)
 
-        params = {
-            "data": data,
-            "omega": omega,
-            "min_deg_freedom": min_deg_freedom,
-            "max_base_line_len": max_base_line_len,
-            "threshold_probability_red_alert": threshold_probability_red_alert,
-            "threshold_probability_yellow_alert": threshold_probability_yellow_alert,
-            "num_guardband": num_guardband,
-            "remove_zeros": remove_zeros,
-            "min_prob_level": min_prob_level,
-            "num_fit_params": num_fit_params,
-        }
-
-        return {"params": params, "pValues": pvalues, "expectedData": expectedData}
+    @router.get(
+        "/cache",
+        summary="Detector result cache statistics",
+        dependencies=[Depends(require_permission([Permission.ADMIN]))],
+    )
+    async def get_cache():
+        cache = await Dependency.resolve(Reference.DETECTOR_CACHE)
+        return cache.stats()
 
     return router
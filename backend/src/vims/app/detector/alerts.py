@@ -0,0 +1,135 @@
+#  Copyright (c) 2013-2025. The Johns Hopkins University Applied Physics Laboratory LLC
+#
+#
+# This material may be used, modified, or reproduced by or for the U.S.
+# Government pursuant to the rights granted under the clauses at
+# DFARS 252.227-7013/7014 or FAR 52.227-14.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# NO WARRANTY.   THIS MATERIAL IS PROVIDED "AS IS."  JHU/APL DISCLAIMS ALL
+# WARRANTIES IN THE MATERIAL, WHETHER EXPRESS OR IMPLIED, INCLUDING (BUT NOT
+# LIMITED TO) ANY AND ALL IMPLIED WARRANTIES OF PERFORMANCE,
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF
+# INTELLECTUAL PROPERTY RIGHTS. ANY USER OF THE MATERIAL ASSUMES THE ENTIRE
+# RISK AND LIABILITY FOR USING THE MATERIAL.  IN NO EVENT SHALL JHU/APL BE
+# LIABLE TO ANY USER OF THE MATERIAL FOR ANY ACTUAL, INDIRECT,
+# CONSEQUENTIAL, SPECIAL OR OTHER DAMAGES ARISING FROM THE USE OF, OR
+# INABILITY TO USE, THE MATERIAL, INCLUDING, BUT NOT LIMITED TO, ANY DAMAGES
+# FOR LOST PROFITS.
+
+from typing import Any, Dict, List, Optional
+
+import asyncio
+import json
+
+from datetime import date
+
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from vims.core import Config, Dependency, Reference, getLogger
+
+from ..database import database
+from ..database.models import alerts, datasets, datasources
+from ..dataset import enrich_dataset_query
+from ..model import AlertSweep
+from ..settings import Settings
+from .runner import parse_sweep
+from .sweep import run_dataset_sweep, sweep_query
+
+log = getLogger(__name__)
+
+# Sweeps started in the background after an ETL load, kept so they are not
+# garbage collected before they finish.
+background_sweeps = set()
+
+
+async def create_alert_table():
+    # Databases created before the alert table existed get it on startup.
+    await database.execute(CreateTable(alerts, if_not_exists=True))
+    for index in alerts.indexes:
+        await database.execute(CreateIndex(index, if_not_exists=True))
+
+
+def alert_rows(sweep: AlertSweep, result: Dict[str, Any]):
+    rows = []
+    for group in result["groups"]:
+        group_key = json.dumps(group["group"], sort_keys=True, default=str)
+        for alert in group["alerts"]:
+            rows.append(
+                {
+                    "sweep": sweep.name,
+                    "dataset_id": sweep.dataset_id,
+                    "date": date.fromisoformat(alert["date"]),
+                    "group_key": group_key,
+                    "group_values": group["group"],
+                    "algorithm": result["algorithm"],
+                    "value": alert["value"],
+                    "expected": alert["expected"],
+                    "level": alert["level"],
+                }
+            )
+    return rows
+
+
+async def run_alert_sweep(sweep: AlertSweep, dataset_name: Optional[str] = None):
+    """
+    Runs a configured sweep over its whole dataset and replaces the alerts it
+    stored before. When dataset_name is given, sweeps over other datasets are
+    skipped. Returns the number of alerts stored, or None if skipped.
+    """
+    algorithm, params = parse_sweep(sweep.algorithm, sweep.params)
+
+    dataset = await database.fetch_one(
+        datasets.select().where(datasets.c.id == sweep.dataset_id)
+    )
+    if dataset is None:
+        raise ValueError(f"Dataset {sweep.dataset_id} does not exist.")
+    if dataset_name is not None and dataset.dataset_name != dataset_name:
+        return None
+    datasource = await database.fetch_one(
+        datasources.select().where(datasources.c.id == dataset.datasource_id)
+    )
+    if datasource is None:
+        raise ValueError(f"Dataset {sweep.dataset_id} has an invalid datasource.")
+    databridge_manager = await Dependency.resolve(Reference.DATABRIDGE_MANAGER)
+    databridge = databridge_manager.get_databridge(datasource.token)
+    if databridge is None:
+        raise ValueError(f"Datasource {datasource.id} is not connected.")
+
+    enriched_query = enrich_dataset_query(dataset._mapping, sweep_query(sweep))
+    result = await run_dataset_sweep(
+        databridge, enriched_query, sweep, algorithm, params
+    )
+    rows = alert_rows(sweep, result)
+    async with database.transaction():
+        await database.execute(alerts.delete().where(alerts.c.sweep == sweep.name))
+        if rows:
+            await database.execute_many(alerts.insert(), rows)
+    return len(rows)
+
+
+async def run_alert_sweeps(
+    sweeps: List[Dict[str, Any]], dataset_name: Optional[str] = None
+):
+    for conf in sweeps:
+        try:
+            sweep = AlertSweep(**{**conf, "include_series": False})
+            stored = await run_alert_sweep(sweep, dataset_name)
+        except Exception:
+            log.exception(f"Alert sweep {conf.get('name')} failed")
+            continue
+        if stored is not None:
+            log.info(f"Alert sweep {sweep.name}: {stored} alerts")
+
+
+def schedule_alert_sweeps(dataset_name: str):
+    task = asyncio.ensure_future(
+        run_alert_sweeps(Config.get(Settings.ALERT_SWEEPS, []), dataset_name)
+    )
+    background_sweeps.add(task)
+    task.add_done_callback(background_sweeps.discard)
@@ -0,0 +1,101 @@
+#  Copyright (c) 2013-2025. The Johns Hopkins University Applied Physics Laboratory LLC
+#
+#
+# This material may be used, modified, or reproduced by or for the U.S.
+# Government pursuant to the rights granted under the clauses at
+# DFARS 252.227-7013/7014 or FAR 52.227-14.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# NO WARRANTY.   THIS MATERIAL IS PROVIDED "AS IS."  JHU/APL DISCLAIMS ALL
+# WARRANTIES IN THE MATERIAL, WHETHER EXPRESS OR IMPLIED, INCLUDING (BUT NOT
+# LIMITED TO) ANY AND ALL IMPLIED WARRANTIES OF PERFORMANCE,
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF
+# INTELLECTUAL PROPERTY RIGHTS. ANY USER OF THE MATERIAL ASSUMES THE ENTIRE
+# RISK AND LIABILITY FOR USING THE MATERIAL.  IN NO EVENT SHALL JHU/APL BE
+# LIABLE TO ANY USER OF THE MATERIAL FOR ANY ACTUAL, INDIRECT,
+# CONSEQUENTIAL, SPECIAL OR OTHER DAMAGES ARISING FROM THE USE OF, OR
+# INABILITY TO USE, THE MATERIAL, INCLUDING, BUT NOT LIMITED TO, ANY DAMAGES
+# FOR LOST PROFITS.
+
+from typing import Any, Dict, Optional
+
+import time
+
+from collections import OrderedDict
+from enum import Enum
+
+from vims.core import Config, Inject, getLogger
+from vims.util import sort_and_hash_dict
+
+from ..config import config
+from ..settings import Settings
+
+log = getLogger(__name__)
+
+
+class DetectorCache:
+    """
+    Least recently used cache of detector results, keyed by a hash of the
+    algorithm and its params (which include the data). Entries expire ttl
+    seconds after they are stored; a max_size of 0 turns the cache off.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries: "OrderedDict[str, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(algorithm: str, params: Dict[str, Any]):
+        if isinstance(algorithm, Enum):
+            algorithm = algorithm.value
+        return sort_and_hash_dict({**params, "algorithm": algorithm})
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self.entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self.entries[key]
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: str, value: Any):
+        if self.max_size <= 0:
+            return
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {
+            "size": len(self.entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def detector_cache(config: Config = Inject(config)):
+    cache = DetectorCache(
+        max_size=config.get(Settings.DETECTOR_CACHE_SIZE, 1024),
+        ttl=config.get(Settings.DETECTOR_CACHE_TTL, 300),
+    )
+    log.info(f"Detector cache: {cache.max_size} results for {cache.ttl}s")
+    return cache
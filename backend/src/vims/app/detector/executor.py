@@ -0,0 +1,127 @@
+#  Copyright (c) 2013-2025. The Johns Hopkins University Applied Physics Laboratory LLC
+#
+#
+# This material may be used, modified, or reproduced by or for the U.S.
+# Government pursuant to the rights granted under the clauses at
+# DFARS 252.227-7013/7014 or FAR 52.227-14.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# NO WARRANTY.   THIS MATERIAL IS PROVIDED "AS IS."  JHU/APL DISCLAIMS ALL
+# WARRANTIES IN THE MATERIAL, WHETHER EXPRESS OR IMPLIED, INCLUDING (BUT NOT
+# LIMITED TO) ANY AND ALL IMPLIED WARRANTIES OF PERFORMANCE,
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF
+# INTELLECTUAL PROPERTY RIGHTS. ANY USER OF THE MATERIAL ASSUMES THE ENTIRE
+# RISK AND LIABILITY FOR USING THE MATERIAL.  IN NO EVENT SHALL JHU/APL BE
+# LIABLE TO ANY USER OF THE MATERIAL FOR ANY ACTUAL, INDIRECT,
+# CONSEQUENTIAL, SPECIAL OR OTHER DAMAGES ARISING FROM THE USE OF, OR
+# INABILITY TO USE, THE MATERIAL, INCLUDING, BUT NOT LIMITED TO, ANY DAMAGES
+# FOR LOST PROFITS.
+
+from typing import Any, Callable, List, Optional
+
+import asyncio
+import functools
+import os
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from vims.core import Config, Inject, getLogger
+
+from ..config import config
+from ..settings import Settings
+from .util import Kernels
+
+log = getLogger(__name__)
+
+EXECUTORS = {"process": ProcessPoolExecutor, "thread": ThreadPoolExecutor}
+
+
+class DetectorQueueFull(Exception):
+    pass
+
+
+class DetectorExecutor:
+    """
+    Runs the CPU bound detector calculations on a worker pool so that they do
+    not block the event loop. At most pool_size jobs run at once and up to
+    queue_depth more may wait for a worker; past that, submissions are
+    rejected with DetectorQueueFull instead of piling up. kernels selects the
+    detector recurrence kernels, in this process and in every worker.
+    """
+
+    def __init__(
+        self,
+        kind: str = "process",
+        pool_size: Optional[int] = None,
+        queue_depth: int = 64,
+        kernels: str = "numpy",
+    ):
+        if kind not in EXECUTORS:
+            raise ValueError(
+                f"Detector executor must be one of {list(EXECUTORS.keys())}."
+            )
+        self.kind = kind
+        self.pool_size = pool_size or os.cpu_count() or 1
+        Kernels.useKernels(kernels)
+        self.kernels = Kernels.BACKEND
+        self.executor: Executor = EXECUTORS[kind](
+            max_workers=self.pool_size,
+            initializer=Kernels.useKernels,
+            initargs=(self.kernels,),
+        )
+        self.queue_depth = queue_depth
+        self.pending = 0
+
+    async def run(self, fn: Callable[..., Any], *args: Any):
+        if self.pending >= self.pool_size + self.queue_depth:
+            raise DetectorQueueFull("Too many detector requests are queued.")
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self.executor, functools.partial(fn, *args)
+            )
+        finally:
+            self.pending -= 1
+
+    def chunks(self, items: List[Any]) -> List[List[Any]]:
+        """
+        Splits items into at most pool_size chunks of about the same size.
+        """
+        if len(items) == 0:
+            return []
+        size = -(-len(items) // self.pool_size)
+        return [items[i : i + size] for i in range(0, len(items), size)]
+
+    async def map_chunks(self, fn: Callable[..., Any], items: List[Any], *args: Any):
+        """
+        Splits items into at most pool_size chunks, runs fn(*args, chunk) for
+        each chunk on its own worker and returns the concatenated results in
+        the order of items.
+        """
+        results = await asyncio.gather(
+            *(self.run(fn, *args, chunk) for chunk in self.chunks(items))
+        )
+        return [item for result in results for item in result]
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def detector_executor(config: Config = Inject(config)):
+    executor = DetectorExecutor(
+        kind=config.get(Settings.DETECTOR_EXECUTOR, "process"),
+        pool_size=config.get(Settings.DETECTOR_POOL_SIZE, None),
+        queue_depth=config.get(Settings.DETECTOR_QUEUE_DEPTH, 64),
+        kernels=config.get(Settings.DETECTOR_KERNELS, "numpy"),
+    )
+    log.info(
+        f"Detector executor: {executor.kind} pool of {executor.pool_size} "
+        f"workers, queue depth {executor.queue_depth}, {executor.kernels} kernels"
+    )
+    return executor
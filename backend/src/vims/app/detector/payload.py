@@ -0,0 +1,121 @@
+#  Copyright (c) 2013-2025. The Johns Hopkins University Applied Physics Laboratory LLC
+#
+#
+# This material may be used, modified, or reproduced by or for the U.S.
+# Government pursuant to the rights granted under the clauses at
+# DFARS 252.227-7013/7014 or FAR 52.227-14.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# NO WARRANTY.   THIS MATERIAL IS PROVIDED "AS IS."  JHU/APL DISCLAIMS ALL
+# WARRANTIES IN THE MATERIAL, WHETHER EXPRESS OR IMPLIED, INCLUDING (BUT NOT
+# LIMITED TO) ANY AND ALL IMPLIED WARRANTIES OF PERFORMANCE,
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF
+# INTELLECTUAL PROPERTY RIGHTS. ANY USER OF THE MATERIAL ASSUMES THE ENTIRE
+# RISK AND LIABILITY FOR USING THE MATERIAL.  IN NO EVENT SHALL JHU/APL BE
+# LIABLE TO ANY USER OF THE MATERIAL FOR ANY ACTUAL, INDIRECT,
+# CONSEQUENTIAL, SPECIAL OR OTHER DAMAGES ARISING FROM THE USE OF, OR
+# INABILITY TO USE, THE MATERIAL, INCLUDING, BUT NOT LIMITED TO, ANY DAMAGES
+# FOR LOST PROFITS.
+
+from typing import Any, Dict, Optional
+
+import json
+
+import numpy
+import pyarrow
+import pyarrow.ipc
+
+from .runner import Algorithm, run_detector
+
+# Binary detector payloads. A request body holds only the data series, either
+# as raw little-endian float64 values or as an Arrow IPC stream with a "data"
+# column (or a single column), and the response holds the result series as
+# columns in the same format. The names of the response columns and the state
+# to resume from are sent in headers since they are not series.
+
+OCTET_STREAM = "application/octet-stream"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+MEDIA_TYPES = (OCTET_STREAM, ARROW_STREAM)
+
+COLUMNS_HEADER = "X-Detector-Columns"
+STATE_HEADER = "X-Detector-State"
+
+
+class PayloadError(Exception):
+    pass
+
+
+class UnsupportedMediaType(PayloadError):
+    pass
+
+
+def media_type(content_type: Optional[str]):
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type not in MEDIA_TYPES:
+        raise UnsupportedMediaType(
+            f"Detector payloads must be one of {list(MEDIA_TYPES)}."
+        )
+    return media_type
+
+
+def decode_data(body: bytes, media_type: str):
+    if media_type == OCTET_STREAM:
+        if len(body) % 8 != 0:
+            raise PayloadError("Raw data must be a whole number of float64 values.")
+        return numpy.frombuffer(body, dtype="<f8")
+
+    try:
+        table = pyarrow.ipc.open_stream(body).read_all()
+    except pyarrow.ArrowInvalid as e:
+        raise PayloadError(f"Invalid Arrow stream: {e}")
+    if "data" in table.column_names:
+        column = table.column("data")
+    elif table.num_columns == 1:
+        column = table.column(0)
+    else:
+        raise PayloadError('Arrow data must have a "data" column.')
+    try:
+        column = column.cast(pyarrow.float64())
+    except pyarrow.ArrowInvalid as e:
+        raise PayloadError(f"Arrow data must be numeric: {e}")
+    return column.to_numpy()
+
+
+def result_columns(result: Dict[str, Any]):
+    # Every list in the result is a series over the days of the data; missing
+    # values become NaN.
+    return {
+        name: numpy.array(values, dtype=numpy.float64)
+        for name, values in result.items()
+        if isinstance(values, (list, numpy.ndarray))
+    }
+
+
+def encode_result(result: Dict[str, Any], media_type: str):
+    columns = result_columns(result)
+    headers = {COLUMNS_HEADER: ",".join(columns)}
+    if "state" in result:
+        headers[STATE_HEADER] = json.dumps(result["state"])
+
+    if media_type == OCTET_STREAM:
+        body = b"".join(column.astype("<f8").tobytes() for column in columns.values())
+    else:
+        table = pyarrow.table(columns)
+        sink = pyarrow.BufferOutputStream()
+        with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        body = sink.getvalue().to_pybytes()
+    return body, headers
+
+
+def run_detector_raw(algorithm: Algorithm, params: Dict[str, Any], data):
+    # The params, and the data echoed in them, are not part of a binary
+    # response, so they are not sent back from the worker either.
+    result = run_detector(algorithm, {**params, "data": data})
+    del result["params"]
+    return result
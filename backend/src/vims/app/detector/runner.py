@@ -0,0 +1,403 @@
+#  Copyright (c) 2013-2025. The Johns Hopkins University Applied Physics Laboratory LLC
+#
+#
+# This material may be used, modified, or reproduced by or for the U.S.
+# Government pursuant to the rights granted under the clauses at
+# DFARS 252.227-7013/7014 or FAR 52.227-14.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# NO WARRANTY.   THIS MATERIAL IS PROVIDED "AS IS."  JHU/APL DISCLAIMS ALL
+# WARRANTIES IN THE MATERIAL, WHETHER EXPRESS OR IMPLIED, INCLUDING (BUT NOT
+# LIMITED TO) ANY AND ALL IMPLIED WARRANTIES OF PERFORMANCE,
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF
+# INTELLECTUAL PROPERTY RIGHTS. ANY USER OF THE MATERIAL ASSUMES THE ENTIRE
+# RISK AND LIABILITY FOR USING THE MATERIAL.  IN NO EVENT SHALL JHU/APL BE
+# LIABLE TO ANY USER OF THE MATERIAL FOR ANY ACTUAL, INDIRECT,
+# CONSEQUENTIAL, SPECIAL OR OTHER DAMAGES ARISING FROM THE USE OF, OR
+# INABILITY TO USE, THE MATERIAL, INCLUDING, BUT NOT LIMITED TO, ANY DAMAGES
+# FOR LOST PROFITS.
+
+from typing import Any, Dict, List, Tuple
+
+from datetime import date
+
+from pydantic import ValidationError
+
+from vims.util import EnumStrLower
+
+from ..model.detector import (
+    CdcParams,
+    CusumParams,
+    DetectorParams,
+    EarsParams,
+    EwmaParams,
+    RegressionParams,
+)
+from .CusumSagesDetector import calculateCUSUM
+from .Ears import calculateC1, calculateC1C2C3, calculateC2, calculateC3, calculateEARS
+from .EWMA import calculateEWMA, ewmaCoefficients
+from .Regression import calculateRegression, calculateRegressionBatch
+
+
+class Algorithm(EnumStrLower):
+    cusum = EnumStrLower.auto()
+    ears = EnumStrLower.auto()
+    cdc1 = EnumStrLower.auto()
+    cdc2 = EnumStrLower.auto()
+    cdc3 = EnumStrLower.auto()
+    cdc = EnumStrLower.auto()
+    ewma = EnumStrLower.auto()
+    regression = EnumStrLower.auto()
+
+
+class DetectorJobError(Exception):
+    pass
+
+
+# The request model of the params of each detector, which checks the data and
+# the params before any work is done and fills in the defaults.
+PARAMS_MODELS = {
+    Algorithm.cusum: CusumParams,
+    Algorithm.ears: EarsParams,
+    Algorithm.cdc1: CdcParams,
+    Algorithm.cdc2: CdcParams,
+    Algorithm.cdc3: CdcParams,
+    Algorithm.cdc: CdcParams,
+    Algorithm.ewma: EwmaParams,
+    Algorithm.regression: RegressionParams,
+}
+
+
+def validation_message(error: ValidationError):
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in e['loc'])}: {e['msg']}" for e in error.errors()
+    )
+
+
+def params_dict(params: DetectorParams):
+    # The data stays a float64 array, while the state is turned back into the
+    # dict the detectors return so that the params can be hashed and sent to
+    # the workers as they are.
+    params = dict(params)
+    if params.get("state") is not None:
+        params["state"] = params["state"].model_dump()
+    return params
+
+
+def validate_params(algorithm: Algorithm, params: Dict[str, Any]):
+    """
+    Validates the params of a detector, data and state included, and returns
+    them with the defaults filled in and the data as a float64 array.
+    """
+    try:
+        return params_dict(PARAMS_MODELS[algorithm].model_validate(params))
+    except ValidationError as e:
+        raise DetectorJobError(validation_message(e))
+
+
+def model_params(algorithm: Algorithm, params: Dict[str, Any]):
+    """
+    Returns the params a detector runs with: every field of its params model,
+    given or else filled in with the default of the model. The params are
+    expected to have been validated.
+    """
+    filled = {}
+    for name, field in PARAMS_MODELS[algorithm].model_fields.items():
+        if name in params:
+            filled[name] = params[name]
+        elif field.is_required():
+            raise DetectorJobError(f"{name}: Field required")
+        else:
+            filled[name] = field.get_default(call_default_factory=True)
+    return filled
+
+
+def regression_args(params: Dict[str, Any]):
+    return (
+        params["baseline_len"],
+        params["num_guardband"],
+        params["day_of_week"],
+        params["first_weekday"],
+        params["holidays"],
+        params["remove_zeros"],
+        params["min_deg_freedom"],
+        params["min_sigma"],
+        params["min_prob_level"],
+    )
+
+
+# Detectors given a "state" param return the state to send with the next days
+# of the series; it is added to the result when there is one.
+
+
+def with_state(result: Dict[str, Any], state: List[Dict[str, Any]]):
+    if state:
+        result["state"] = state[0]
+    return result
+
+
+def run_cusum(params: Dict[str, Any]):
+    params = model_params(Algorithm.cusum, params)
+    [pvalues, expectedData, *state] = calculateCUSUM(
+        params["data"],
+        params["cusum_k"],
+        params["baseline"],
+        params["guardband"],
+        params["min_sigma"],
+        params["reset_level"],
+        state=params["state"],
+    )
+    return with_state(
+        {"params": params, "pValues": pvalues, "expectedData": expectedData}, state
+    )
+
+
+def run_ears(params: Dict[str, Any]):
+    params = model_params(Algorithm.ears, params)
+    [earStat, expectedData, *state] = calculateEARS(
+        params["data"],
+        params["baseline"],
+        params["base_lag"],
+        params["cusum_flag"],
+        params["cusum_k"],
+        params["min_sigma"],
+        params["thresh"],
+        state=params["state"],
+    )
+    return with_state(
+        {"params": params, "earStat": earStat, "expectedData": expectedData}, state
+    )
+
+
+def run_cdc(algorithm: Algorithm, calculate):
+    def run_cdc_inner(params: Dict[str, Any]):
+        params = model_params(algorithm, params)
+        [earStat, expectedData] = calculate(params["data"])
+        return {"params": params, "earStat": earStat, "expectedData": expectedData}
+
+    return run_cdc_inner
+
+
+def run_cdc_all(params: Dict[str, Any]):
+    params = model_params(Algorithm.cdc, params)
+    [c1, c2, c3, expectedData] = calculateC1C2C3(params["data"])
+    return {
+        "params": params,
+        "c1": c1,
+        "c2": c2,
+        "c3": c3,
+        "expectedData": expectedData,
+    }
+
+
+def ewma_coefficient_key(params: Dict[str, Any]):
+    return (
+        params["omega"],
+        params["max_base_line_len"],
+        params["threshold_probability_red_alert"],
+        params["threshold_probability_yellow_alert"],
+        params["num_guardband"],
+        params["num_fit_params"],
+    )
+
+
+def run_ewma(params: Dict[str, Any]):
+    params = model_params(Algorithm.ewma, params)
+    [pvalues, expectedData, *state] = calculateEWMA(
+        params["data"],
+        params["omega"],
+        params["min_deg_freedom"],
+        params["max_base_line_len"],
+        params["threshold_probability_red_alert"],
+        params["threshold_probability_yellow_alert"],
+        params["num_guardband"],
+        params["remove_zeros"],
+        params["min_prob_level"],
+        params["num_fit_params"],
+        state=params["state"],
+    )
+    return with_state(
+        {"params": params, "pValues": pvalues, "expectedData": expectedData}, state
+    )
+
+
+def run_regression(params: Dict[str, Any]):
+    params = model_params(Algorithm.regression, params)
+    [pvalues, expectedData] = calculateRegression(
+        params["data"], *regression_args(params)
+    )
+    return {"params": params, "pValues": pvalues, "expectedData": expectedData}
+
+
+RUNNERS = {
+    Algorithm.cusum: run_cusum,
+    Algorithm.ears: run_ears,
+    Algorithm.cdc1: run_cdc(Algorithm.cdc1, calculateC1),
+    Algorithm.cdc2: run_cdc(Algorithm.cdc2, calculateC2),
+    Algorithm.cdc3: run_cdc(Algorithm.cdc3, calculateC3),
+    Algorithm.cdc: run_cdc_all,
+    Algorithm.ewma: run_ewma,
+    Algorithm.regression: run_regression,
+}
+
+
+def run_detector(algorithm: Algorithm, params: Dict[str, Any]):
+    return RUNNERS[Algorithm(algorithm)](params)
+
+
+def parse_batch(jobs: List[Dict[str, Any]]):
+    parsed = []
+    for i, job in enumerate(jobs):
+        if not isinstance(job, dict):
+            raise DetectorJobError(f"Job {i} must be a dict.")
+        try:
+            algorithm = Algorithm(job.get("algorithm"))
+        except ValueError:
+            raise DetectorJobError(
+                f"Job {i}: {job.get('algorithm')} is not a supported algorithm."
+            )
+        params = job.get("params") or {}
+        if not isinstance(params, dict):
+            raise DetectorJobError(f"Job {i}: params must be a dict.")
+        if not isinstance(job.get("data"), list):
+            raise DetectorJobError(f"Job {i}: data must be a list.")
+        try:
+            params = validate_params(algorithm, {**params, "data": job["data"]})
+        except DetectorJobError as e:
+            raise DetectorJobError(f"Job {i}: {e}")
+        # the results echo the data as it was sent
+        parsed.append((algorithm, {**params, "data": job["data"]}))
+    return parsed
+
+
+def run_batch_chunk(parsed: List[Tuple[Algorithm, Dict[str, Any]]]):
+    # The EWMA control limits come from the t-distribution and only depend on
+    # the parameters; build each distinct table once for the whole chunk.
+    for key in {
+        ewma_coefficient_key(model_params(Algorithm.ewma, params))
+        for algorithm, params in parsed
+        if algorithm is Algorithm.ewma
+    }:
+        ewmaCoefficients(*key)
+
+    return [RUNNERS[algorithm](params) for algorithm, params in parsed]
+
+
+def run_batch(jobs: List[Dict[str, Any]]):
+    # Every job is validated before any of them runs, so a bad job fails the
+    # batch without wasting work on the others.
+    return run_batch_chunk(parse_batch(jobs))
+
+
+# A sweep runs one detector over many series that share the same days, e.g.
+# the per-group daily counts of a dataset query, and keeps only the alerts.
+# The p-value detectors alert red/yellow below the EWMA alert probabilities;
+# the EARS family alert red once the statistic reaches its threshold.
+
+SWEEP_STATISTICS = {
+    Algorithm.cusum: "pValues",
+    Algorithm.ewma: "pValues",
+    Algorithm.regression: "pValues",
+    Algorithm.ears: "earStat",
+    Algorithm.cdc1: "earStat",
+    Algorithm.cdc2: "earStat",
+    Algorithm.cdc3: "earStat",
+}
+
+
+def parse_sweep(algorithm: str, params: Dict[str, Any]):
+    try:
+        algorithm = Algorithm(algorithm)
+    except ValueError:
+        raise DetectorJobError(f"{algorithm} is not a supported algorithm.")
+    if algorithm not in SWEEP_STATISTICS:
+        raise DetectorJobError(f"{algorithm.value} can not be used in a sweep.")
+    if not isinstance(params, dict):
+        raise DetectorJobError("params must be a dict.")
+    # the params are only checked; the defaults are filled in per series
+    validate_params(algorithm, {**params, "data": []})
+    return algorithm, params
+
+
+def find_alerts(algorithm: Algorithm, params: Dict[str, Any], result: Dict[str, Any]):
+    statistic = SWEEP_STATISTICS[algorithm]
+    alerts = []
+    if statistic == "pValues":
+        red = params.get("threshold_probability_red_alert", 0.01)
+        yellow = params.get("threshold_probability_yellow_alert", 0.05)
+        for i, value in enumerate(result[statistic]):
+            if value is None or value > yellow:
+                continue
+            alerts.append((i, value, "red" if value <= red else "yellow"))
+    else:
+        thresh = params.get("thresh") or 2
+        for i, value in enumerate(result[statistic]):
+            if value is not None and value >= thresh:
+                alerts.append((i, value, "red"))
+    return alerts
+
+
+def run_sweep(
+    algorithm: Algorithm,
+    params: Dict[str, Any],
+    dates: List[str],
+    include_series: bool,
+    series: List[List[float]],
+):
+    algorithm, params = parse_sweep(algorithm, params)
+    if algorithm is Algorithm.ewma:
+        ewmaCoefficients(
+            *ewma_coefficient_key(
+                model_params(Algorithm.ewma, {**params, "data": None})
+            )
+        )
+
+    if algorithm is Algorithm.regression:
+        runs = run_regression_sweep(params, dates, series)
+    else:
+        runs = (
+            RUNNERS[algorithm]({**params, "data": data, "state": None})
+            for data in series
+        )
+
+    results = []
+    for data, result in zip(series, runs):
+        alerts = [
+            {
+                "date": dates[i],
+                "value": value,
+                "expected": result["expectedData"][i],
+                "level": level,
+            }
+            for i, value, level in find_alerts(algorithm, params, result)
+        ]
+        if include_series:
+            del result["params"]
+            results.append({"alerts": alerts, "data": list(data), **result})
+        else:
+            results.append({"alerts": alerts})
+    return results
+
+
+# The regression designs only depend on the days, which every series of a sweep
+# shares, so the whole sweep is fitted in one batch. Unless it is given, the
+# day of week of the first day is taken from the sweep dates.
+
+
+def run_regression_sweep(
+    params: Dict[str, Any], dates: List[str], series: List[List[float]]
+):
+    given = params
+    params = model_params(Algorithm.regression, {**params, "data": None})
+    if given.get("first_weekday") is None and dates:
+        params["first_weekday"] = date.fromisoformat(dates[0][:10]).weekday()
+    [pvalues, expectedData] = calculateRegressionBatch(series, *regression_args(params))
+    return [
+        {"params": params, "pValues": p, "expectedData": e}
+        for p, e in zip(pvalues, expectedData)
+    ]
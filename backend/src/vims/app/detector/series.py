@@ -0,0 +1,188 @@
+#  Copyright (c) 2013-2025. The Johns Hopkins University Applied Physics Laboratory LLC
+#
+#
+# This material may be used, modified, or reproduced by or for the U.S.
+# Government pursuant to the rights granted under the clauses at
+# DFARS 252.227-7013/7014 or FAR 52.227-14.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# NO WARRANTY.   THIS MATERIAL IS PROVIDED "AS IS."  JHU/APL DISCLAIMS ALL
+# WARRANTIES IN THE MATERIAL, WHETHER EXPRESS OR IMPLIED, INCLUDING (BUT NOT
+# LIMITED TO) ANY AND ALL IMPLIED WARRANTIES OF PERFORMANCE,
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF
+# INTELLECTUAL PROPERTY RIGHTS. ANY USER OF THE MATERIAL ASSUMES THE ENTIRE
+# RISK AND LIABILITY FOR USING THE MATERIAL.  IN NO EVENT SHALL JHU/APL BE
+# LIABLE TO ANY USER OF THE MATERIAL FOR ANY ACTUAL, INDIRECT,
+# CONSEQUENTIAL, SPECIAL OR OTHER DAMAGES ARISING FROM THE USE OF, OR
+# INABILITY TO USE, THE MATERIAL, INCLUDING, BUT NOT LIMITED TO, ANY DAMAGES
+# FOR LOST PROFITS.
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from datetime import date, datetime
+
+import numpy
+
+from ..model.dataset import DateGranularityEnum
+
+# Turns the sparse (date, count) rows returned by a databridge query into the
+# dense series the detectors expect: one float64 value per period from the
+# first period to the last, with 0 for the periods without rows. Dates are
+# handled as numpy datetime64[D] so bucketing them is plain array arithmetic.
+
+DAY = numpy.timedelta64(1, "D")
+
+# 1970-01-01, day 0 of datetime64, is a Thursday: ISO weeks start 3 days
+# earlier on the Monday and CDC epiweeks 4 days earlier on the Sunday.
+WEEK_OFFSETS = {DateGranularityEnum.WEEKLY: 3, DateGranularityEnum.EPIWEEK: 4}
+MONTH_UNITS = {DateGranularityEnum.MONTHLY: "M", DateGranularityEnum.YEARLY: "Y"}
+
+
+def to_date(value: Any):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def to_days(values: Sequence[Any]):
+    """
+    Converts dates, datetimes or ISO strings to a datetime64[D] array, with
+    NaT for missing values. Timestamps are truncated to their day.
+    """
+    try:
+        return numpy.array(values, dtype="datetime64[D]")
+    except ValueError:
+        return numpy.array([to_date(value) for value in values], dtype="datetime64[D]")
+
+
+def period_starts(days, granularity: DateGranularityEnum = DateGranularityEnum.DAILY):
+    """
+    Maps every day to the first day of its period.
+    """
+    granularity = DateGranularityEnum(granularity)
+    if granularity in WEEK_OFFSETS:
+        ordinals = days.astype(numpy.int64)
+        return days - (ordinals + WEEK_OFFSETS[granularity]) % 7 * DAY
+    if granularity in MONTH_UNITS:
+        unit = MONTH_UNITS[granularity]
+        return days.astype(f"datetime64[{unit}]").astype("datetime64[D]")
+    return days
+
+
+def period_range(first, last, granularity: DateGranularityEnum):
+    """
+    Every period start from the period of first to the period of last.
+    """
+    granularity = DateGranularityEnum(granularity)
+    if granularity in WEEK_OFFSETS:
+        return numpy.arange(first, last + DAY, 7 * DAY)
+    if granularity in MONTH_UNITS:
+        unit = MONTH_UNITS[granularity]
+        starts = numpy.arange(
+            first.astype(f"datetime64[{unit}]"),
+            last.astype(f"datetime64[{unit}]") + 1,
+        )
+        return starts.astype("datetime64[D]")
+    return numpy.arange(first, last + DAY, DAY)
+
+
+def densify(
+    days,
+    counts,
+    group_ids,
+    num_groups: int,
+    granularity: DateGranularityEnum,
+    start: Optional[Any] = None,
+    end: Optional[Any] = None,
+):
+    counts = numpy.nan_to_num(counts)
+    keep = ~numpy.isnat(days)
+    periods = period_starts(days[keep], granularity)
+    counts = counts[keep]
+    group_ids = group_ids[keep]
+
+    first = periods.min() if len(periods) else None
+    last = periods.max() if len(periods) else None
+    if start is not None:
+        first = period_starts(to_days([start]), granularity)[0]
+    if end is not None:
+        last = period_starts(to_days([end]), granularity)[0]
+    if first is None or last is None or last < first:
+        return numpy.array([], dtype="datetime64[D]"), numpy.zeros((num_groups, 0))
+
+    inside = (periods >= first) & (periods <= last)
+    axis = period_range(first, last, granularity)
+    series = numpy.zeros((num_groups, len(axis)))
+    numpy.add.at(
+        series,
+        (group_ids[inside], numpy.searchsorted(axis, periods[inside])),
+        counts[inside],
+    )
+    return axis, series
+
+
+def dense_series(
+    dates: Sequence[Any],
+    counts: Sequence[Optional[float]],
+    granularity: DateGranularityEnum = DateGranularityEnum.DAILY,
+    start: Optional[Any] = None,
+    end: Optional[Any] = None,
+):
+    """
+    Sums the counts of each period and returns the period starts and a dense
+    float64 series over them, from start (or the first date) to end (or the
+    last date). Rows without a date are dropped, missing counts count as 0.
+    """
+    axis, series = densify(
+        to_days(dates),
+        numpy.array(counts, dtype=numpy.float64),
+        numpy.zeros(len(dates), dtype=numpy.intp),
+        1,
+        granularity,
+        start,
+        end,
+    )
+    return axis, series[0]
+
+
+def pivot_series(
+    rows: Iterable[Dict[str, Any]],
+    date_field: str,
+    group_fields: List[str],
+    count_field: str,
+    granularity: DateGranularityEnum = DateGranularityEnum.DAILY,
+    start: Optional[Any] = None,
+    end: Optional[Any] = None,
+) -> Tuple[Any, List[Dict[str, Any]], Any]:
+    """
+    Pivots the rows of a grouped query into one dense series per group, all
+    over the same periods. Returns the period starts, the group values in
+    order of first appearance and a float64 array with a row per group.
+    """
+    groups: Dict[Tuple[Any, ...], int] = {}
+    group_ids, dates, counts = [], [], []
+    for row in rows:
+        key = tuple(row.get(field) for field in group_fields)
+        group_ids.append(groups.setdefault(key, len(groups)))
+        dates.append(row.get(date_field))
+        counts.append(row.get(count_field))
+
+    axis, series = densify(
+        to_days(dates),
+        numpy.array(counts, dtype=numpy.float64),
+        numpy.array(group_ids, dtype=numpy.intp),
+        len(groups),
+        granularity,
+        start,
+        end,
+    )
+    return axis, [dict(zip(group_fields, key)) for key in groups], series
@@ -0,0 +1,109 @@
+#  Copyright (c) 2013-2025. The Johns Hopkins University Applied Physics Laboratory LLC
+#
+#
+# This material may be used, modified, or reproduced by or for the U.S.
+# Government pursuant to the rights granted under the clauses at
+# DFARS 252.227-7013/7014 or FAR 52.227-14.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# NO WARRANTY.   THIS MATERIAL IS PROVIDED "AS IS."  JHU/APL DISCLAIMS ALL
+# WARRANTIES IN THE MATERIAL, WHETHER EXPRESS OR IMPLIED, INCLUDING (BUT NOT
+# LIMITED TO) ANY AND ALL IMPLIED WARRANTIES OF PERFORMANCE,
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF
+# INTELLECTUAL PROPERTY RIGHTS. ANY USER OF THE MATERIAL ASSUMES THE ENTIRE
+# RISK AND LIABILITY FOR USING THE MATERIAL.  IN NO EVENT SHALL JHU/APL BE
+# LIABLE TO ANY USER OF THE MATERIAL FOR ANY ACTUAL, INDIRECT,
+# CONSEQUENTIAL, SPECIAL OR OTHER DAMAGES ARISING FROM THE USE OF, OR
+# INABILITY TO USE, THE MATERIAL, INCLUDING, BUT NOT LIMITED TO, ANY DAMAGES
+# FOR LOST PROFITS.
+
+from typing import Any, Dict
+
+from vims.core import Dependency, Reference
+from vims.util.sqla_where_compiler import DateBucketUnit
+
+from ..model import DatasetDetectorSweep, DatasetQuery, TotalEnum
+from ..model.dataset import DateGranularityEnum
+from .runner import Algorithm, DetectorJobError, run_sweep
+from .series import pivot_series
+
+# Label of the count in the grouped query behind a sweep.
+SWEEP_COUNT = "_detector_count"
+
+# Date bucket the records are grouped by in the database for each granularity.
+GRANULARITY_BUCKETS = {
+    DateGranularityEnum.DAILY: DateBucketUnit.DAY,
+    DateGranularityEnum.WEEKLY: DateBucketUnit.WEEK,
+    DateGranularityEnum.MONTHLY: DateBucketUnit.MONTH,
+    DateGranularityEnum.YEARLY: DateBucketUnit.YEAR,
+    DateGranularityEnum.EPIWEEK: DateBucketUnit.EPIWEEK,
+}
+
+
+def sweep_date_bucket(sweep: DatasetDetectorSweep):
+    unit = GRANULARITY_BUCKETS[DateGranularityEnum(sweep.granularity)]
+    return f"{unit.value}({sweep.date_field})"
+
+
+def sweep_query(sweep: DatasetDetectorSweep):
+    """
+    Builds the query counting the records by period for each combination of
+    the group_by fields, or summing count_field when given. The dates are
+    bucketed into the periods of the sweep's granularity by the database.
+    """
+    if sweep.count_field is None:
+        aggregator = {"function": "count"}
+    else:
+        aggregator = {"field": sweep.count_field, "function": "sum"}
+    return DatasetQuery(
+        request=sweep.request,
+        group_by={
+            "fields": [sweep_date_bucket(sweep), *sweep.group_by],
+            "aggregators": {SWEEP_COUNT: aggregator},
+        },
+        with_total=TotalEnum.OFF,
+    )
+
+
+async def run_dataset_sweep(
+    databridge,
+    enriched_query: Dict[str, Any],
+    sweep: DatasetDetectorSweep,
+    algorithm: Algorithm,
+    params: Dict[str, Any],
+):
+    """
+    Runs the grouped query built by sweep_query once, pivots it into a series
+    per group at the sweep's granularity and runs the detector over the series of every group in parallel
+    on the detector executor.
+    """
+    result = await databridge.query(enriched_query)
+    if result.get("error") is not None:
+        raise DetectorJobError(result["error"])
+
+    periods, groups, series = pivot_series(
+        result["values"],
+        sweep_date_bucket(sweep),
+        sweep.group_by,
+        SWEEP_COUNT,
+        sweep.granularity,
+    )
+    dates = periods.astype(str).tolist()
+
+    executor = await Dependency.resolve(Reference.DETECTOR_EXECUTOR)
+    results = await executor.map_chunks(
+        run_sweep, series, algorithm, params, dates, sweep.include_series
+    )
+    return {
+        "algorithm": algorithm.value,
+        "dates": dates,
+        "groups": [
+            {"group": group, **group_result}
+            for group, group_result in zip(groups, results)
+        ],
+    }
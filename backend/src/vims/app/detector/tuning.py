@@ -0,0 +1,219 @@
+#  Copyright (c) 2013-2025. The Johns Hopkins University Applied Physics Laboratory LLC
+#
+#
+# This material may be used, modified, or reproduced by or for the U.S.
+# Government pursuant to the rights granted under the clauses at
+# DFARS 252.227-7013/7014 or FAR 52.227-14.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# NO WARRANTY.   THIS MATERIAL IS PROVIDED "AS IS."  JHU/APL DISCLAIMS ALL
+# WARRANTIES IN THE MATERIAL, WHETHER EXPRESS OR IMPLIED, INCLUDING (BUT NOT
+# LIMITED TO) ANY AND ALL IMPLIED WARRANTIES OF PERFORMANCE,
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF
+# INTELLECTUAL PROPERTY RIGHTS. ANY USER OF THE MATERIAL ASSUMES THE ENTIRE
+# RISK AND LIABILITY FOR USING THE MATERIAL.  IN NO EVENT SHALL JHU/APL BE
+# LIABLE TO ANY USER OF THE MATERIAL FOR ANY ACTUAL, INDIRECT,
+# CONSEQUENTIAL, SPECIAL OR OTHER DAMAGES ARISING FROM THE USE OF, OR
+# INABILITY TO USE, THE MATERIAL, INCLUDING, BUT NOT LIMITED TO, ANY DAMAGES
+# FOR LOST PROFITS.
+
+from typing import Any, Dict, List, Optional
+
+import asyncio
+import itertools
+import time
+
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy
+
+from .EWMA import ewmaQuantiles
+from .executor import DetectorExecutor
+from .runner import (
+    PARAMS_MODELS,
+    Algorithm,
+    DetectorJobError,
+    find_alerts,
+    model_params,
+    parse_sweep,
+    run_detector,
+    validate_params,
+)
+from .util import TDistribution
+
+# The params that can be tuned for a detector are the fields of its params
+# model, except the data and state which are given once for the whole grid.
+
+
+def tunable_params(algorithm: Algorithm):
+    return set(PARAMS_MODELS[algorithm].model_fields) - {"data", "state"}
+
+
+def parse_grid(
+    algorithm: str,
+    grid: Dict[str, List[Any]],
+    params: Dict[str, Any],
+    max_combinations: int,
+):
+    """
+    Validates a parameter grid and expands it into the params of every
+    combination, each on top of the fixed params.
+    """
+    algorithm, params = parse_sweep(algorithm, params)
+    if not isinstance(grid, dict):
+        raise DetectorJobError("grid must be a dict.")
+    allowed = tunable_params(algorithm)
+    for name, values in grid.items():
+        if name not in allowed:
+            raise DetectorJobError(
+                f"{name} is not a tunable param of {algorithm.value}."
+            )
+        if not isinstance(values, list) or len(values) == 0:
+            raise DetectorJobError(f"grid values of {name} must be a non-empty list.")
+
+    count = 1
+    for values in grid.values():
+        count *= len(values)
+    if count > max_combinations:
+        raise DetectorJobError(
+            f"The grid has {count} combinations, more than the limit of "
+            f"{max_combinations}."
+        )
+
+    names = list(grid.keys())
+    combinations = [
+        {**params, **dict(zip(names, values))}
+        for values in itertools.product(*(grid[name] for name in names))
+    ]
+    for combination in combinations:
+        validate_params(algorithm, {**combination, "data": []})
+    return algorithm, combinations
+
+
+class SharedSeries:
+    """
+    A float64 data series in shared memory, with missing values as NaN. The
+    workers attach to it by name, so the data is copied once however many
+    combinations are run, instead of being pickled with every task.
+    """
+
+    def __init__(self, values: numpy.ndarray):
+        self.length = len(values)
+        self.memory = SharedMemory(create=True, size=max(values.nbytes, 1))
+        self.name = self.memory.name
+        numpy.ndarray(self.length, numpy.float64, self.memory.buf)[:] = values
+
+    def __getstate__(self):
+        return {"name": self.name, "length": self.length}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.memory = None
+
+    def attach(self):
+        return SharedMemory(name=self.name)
+
+    def release(self):
+        self.memory.close()
+        self.memory.unlink()
+
+
+def warm_tables(algorithm: Algorithm, chunks: List[List[Dict[str, Any]]]):
+    """
+    Searches for the t-distribution quantiles that the EWMA control limits of
+    the combinations are built from, and returns for each chunk of
+    combinations the quantiles its worker needs, so that the workers do not
+    search for them again. The control limits themselves are quick to build
+    from the quantiles and are left to the workers.
+    """
+    tables = []
+    for chunk in chunks:
+        table = {}
+        if algorithm is Algorithm.ewma:
+            for params in chunk:
+                params = model_params(algorithm, {**params, "data": None})
+                probabilities = (
+                    params["threshold_probability_red_alert"],
+                    params["threshold_probability_yellow_alert"],
+                )
+                quantiles = ewmaQuantiles(
+                    params["max_base_line_len"],
+                    *probabilities,
+                    params["num_fit_params"],
+                )
+                for probability, values in zip(probabilities, quantiles):
+                    for df, value in enumerate(values, start=1):
+                        table[TDistribution.quantileKey(1 - probability, df)] = value
+        tables.append(table)
+    return tables
+
+
+def run_tuning_chunk(
+    algorithm: Algorithm,
+    series: SharedSeries,
+    quantiles: Dict[Any, float],
+    combinations: List[Dict[str, Any]],
+):
+    TDistribution.addQuantiles(quantiles)
+    memory = series.attach()
+    try:
+        data = numpy.ndarray(series.length, numpy.float64, memory.buf)
+        data.flags.writeable = False
+        results = []
+        for params in combinations:
+            started = time.perf_counter()
+            result = run_detector(algorithm, {**params, "data": data})
+            seconds = time.perf_counter() - started
+            alerts = find_alerts(algorithm, params, result)
+            results.append(
+                {
+                    "params": params,
+                    "alerts": len(alerts),
+                    "red": sum(1 for _, _, level in alerts if level == "red"),
+                    "yellow": sum(1 for _, _, level in alerts if level == "yellow"),
+                    "seconds": seconds,
+                }
+            )
+        del data
+    finally:
+        memory.close()
+    return results
+
+
+async def run_tuning(
+    executor: DetectorExecutor,
+    algorithm: str,
+    data: List[Optional[float]],
+    grid: Dict[str, List[Any]],
+    params: Optional[Dict[str, Any]] = None,
+    max_combinations: int = 1000,
+):
+    """
+    Runs a detector over one data series for every combination of a
+    parameter grid, spread over the workers of the executor, and returns the
+    alert counts and run time of each combination in the order of the grid.
+    The detectors that can be tuned are those that can be used in a sweep.
+    """
+    algorithm, combinations = parse_grid(
+        algorithm, grid, params or {}, max_combinations
+    )
+    # the data is checked as a DetectorSeries along with the fixed params
+    values = validate_params(algorithm, {**(params or {}), "data": data})["data"]
+    chunks = executor.chunks(combinations)
+    tables = await executor.run(warm_tables, algorithm, chunks)
+    series = SharedSeries(values)
+    try:
+        results = await asyncio.gather(
+            *(
+                executor.run(run_tuning_chunk, algorithm, series, table, chunk)
+                for table, chunk in zip(tables, chunks)
+            )
+        )
+    finally:
+        series.release()
+    return [result for chunk in results for result in chunk]
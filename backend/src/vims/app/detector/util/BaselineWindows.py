@@ -0,0 +1,179 @@
+#  Copyright (c) 2013-2025. The Johns Hopkins University Applied Physics Laboratory LLC
+#
+#
+# This material may be used, modified, or reproduced by or for the U.S.
+# Government pursuant to the rights granted under the clauses at
+# DFARS 252.227-7013/7014 or FAR 52.227-14.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# NO WARRANTY.   THIS MATERIAL IS PROVIDED "AS IS."  JHU/APL DISCLAIMS ALL
+# WARRANTIES IN THE MATERIAL, WHETHER EXPRESS OR IMPLIED, INCLUDING (BUT NOT
+# LIMITED TO) ANY AND ALL IMPLIED WARRANTIES OF PERFORMANCE,
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF
+# INTELLECTUAL PROPERTY RIGHTS. ANY USER OF THE MATERIAL ASSUMES THE ENTIRE
+# RISK AND LIABILITY FOR USING THE MATERIAL.  IN NO EVENT SHALL JHU/APL BE
+# LIABLE TO ANY USER OF THE MATERIAL FOR ANY ACTUAL, INDIRECT,
+# CONSEQUENTIAL, SPECIAL OR OTHER DAMAGES ARISING FROM THE USE OF, OR
+# INABILITY TO USE, THE MATERIAL, INCLUDING, BUT NOT LIMITED TO, ANY DAMAGES
+# FOR LOST PROFITS.
+
+import numpy
+
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .FilterBaselineZeros3 import MIN_NUM_ZEROS
+
+# Array helpers shared by the detectors for working on many baseline windows at
+# once. A window is described by its start index and its length into the
+# cleaned data array.
+
+
+# Converts a detector data array to float64, mapping missing values to 0. A
+# float64 array without missing values, such as a series built by
+# detector.series, is used as is rather than copied.
+#
+# @param data data array from first day to last, no interuptions.
+
+
+def cleanData(data):
+    cleaned = numpy.asarray(data, dtype=numpy.float64).reshape(-1)
+    missing = numpy.isnan(cleaned)
+    if missing.any():
+        cleaned = numpy.where(missing, 0, cleaned)
+    return cleaned
+
+
+# Cleans the data and appends it to the values kept in a detector state.
+#
+# @param previous values from the state, already cleaned.
+# @param data data array from first day to last, no interuptions.
+
+
+def withPrevious(previous, data):
+    if len(previous) == 0:
+        return cleanData(data)
+    return numpy.concatenate(
+        (numpy.array(previous, dtype=numpy.float64), cleanData(data))
+    )
+
+
+# Sums an indicator array over every window using a running total.
+
+
+def windowSums(indicator, starts, lengths):
+    totals = numpy.concatenate(([0], numpy.cumsum(indicator, dtype=numpy.int64)))
+    return totals[starts + lengths] - totals[starts]
+
+
+# Mean and sample standard deviation of every window. The windows of the most
+# common length are evaluated together through a strided view of the data so
+# that none of them is copied; the remaining ones (typically a baseline that is
+# still growing) are padded into a single block.
+#
+# @param values  cleaned data array.
+# @param starts  start index of each window.
+# @param lengths length of each window.
+
+
+def windowStatistics(values, starts, lengths):
+    mean = numpy.full(len(starts), numpy.nan)
+    stdev = numpy.full(len(starts), numpy.nan)
+    if len(starts) == 0:
+        return mean, stdev
+
+    length = numpy.bincount(lengths).argmax()
+    full = lengths == length
+    if length > 0:
+        windows = sliding_window_view(values, length)[starts[full]]
+        mean[full] = windows.mean(axis=1)
+        if length > 1:
+            stdev[full] = windows.std(axis=1, ddof=1)
+
+    rest = ~full & (lengths > 0)
+    if rest.any():
+        offsets = numpy.arange(lengths[rest].max())
+        inside = offsets < lengths[rest, None]
+        ndx = numpy.minimum(starts[rest, None] + offsets, len(values) - 1)
+        windows = numpy.where(inside, values[ndx], numpy.nan)
+        mean[rest] = numpy.nanmean(windows, axis=1)
+        multiple = lengths[rest] > 1
+        stdev[numpy.flatnonzero(rest)[multiple]] = numpy.nanstd(
+            windows[multiple], axis=1, ddof=1
+        )
+    return mean, stdev
+
+
+# Mean and sample standard deviation of every window of a fixed length, i.e.
+# of values[s : s + length] for each start s. Count data is summed exactly in
+# integers, so the cost does not depend on the window length and every window
+# is rounded once, like statistics.mean and statistics.stdev. Other data falls
+# back to a strided view of the windows.
+#
+# @param values cleaned data array.
+# @param length length of the windows, at least 2.
+#
+# @return [mean, stdev]
+
+
+def rollingStatistics(values, length):
+    if len(values) < length:
+        return [numpy.empty(0), numpy.empty(0)]
+
+    peak = numpy.abs(values).max()
+    if (peak * length) ** 2 < 2**53 and numpy.array_equal(
+        values, numpy.round(values)
+    ):
+        counts = values.astype(numpy.int64)
+        sums = numpy.concatenate(([0], numpy.cumsum(counts)))
+        squares = numpy.concatenate(([0], numpy.cumsum(counts * counts)))
+        windowSum = sums[length:] - sums[:-length]
+        windowSquares = squares[length:] - squares[:-length]
+
+        mean = windowSum / length
+        variance = (length * windowSquares - windowSum * windowSum) / (
+            length * (length - 1)
+        )
+        return [mean, numpy.sqrt(variance)]
+
+    windows = sliding_window_view(values, length)
+    return [windows.mean(axis=1), windows.std(axis=1, ddof=1)]
+
+
+# Flags the windows that FilterBaselineZeros3.filterBaselineZeros could change:
+# those holding a run of at least MIN_NUM_ZEROS zeros, or fewer than two
+# positive values. Every other window is returned unfiltered, so only the
+# flagged ones need to go through the filter.
+#
+# @return [flagged, nonZeroCount]
+
+
+def zeroFilterCandidates(values, starts, lengths):
+    isZero = values == 0
+    runStart = numpy.zeros(len(values), dtype=bool)
+    if len(values) >= MIN_NUM_ZEROS:
+        runStart[: len(values) - MIN_NUM_ZEROS + 1] = numpy.logical_and.reduce(
+            [
+                isZero[k : len(values) - MIN_NUM_ZEROS + 1 + k]
+                for k in range(MIN_NUM_ZEROS)
+            ]
+        )
+    runLengths = numpy.maximum(lengths - MIN_NUM_ZEROS + 1, 0)
+    hasLongRun = windowSums(runStart, starts, runLengths) > 0
+    positiveCount = windowSums(values > 0, starts, lengths)
+    nonZeroCount = lengths - windowSums(isZero, starts, lengths)
+    return [numpy.logical_or(hasLongRun, positiveCount < 2), nonZeroCount]
+
+
+# Converts an array back to the list form returned by the detectors, with
+# missing entries (NaN) as None.
+
+
+def toList(values):
+    result = values.astype(object)
+    result[numpy.isnan(values)] = None
+    return result.tolist()
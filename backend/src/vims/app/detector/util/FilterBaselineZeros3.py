@@ -20,6 +20,9 @@
 
 import statistics
 
+# Only runs of at least this many zeros are considered for removal.
+MIN_NUM_ZEROS = 3
+
 
 def filterBaselineZerosTest(d):
     medianVal = statistics.median(d)
@@ -32,93 +35,70 @@ def filterBaselineZerosTest(d):
     return medianVal > 0 or nonzeromedian > 4
 
 
-def filterBaselineZeros(data):
-
-    dt = data[:]
-
-    testData = []
-    ndxOK = []
-    ndxStart = []
-    ndxEnd = []
-    numZerosTest = []
-    minNumZeros = 3
-    dtOut = []
-    thresholdProb = 0.01
-
-    testData = dt[:]
-    testData.insert(0, 1)
-
-    for i in range(len(testData) - 1):
-        if testData[i] != 0 and testData[i + 1] == 0:
-            ndxStart.append(i)
-
-    testData = dt[:]
-    testData.append(1)
-
-    for i in range(len(testData) - 1):
-        if testData[i] == 0 and testData[i + 1] != 0:
-            ndxEnd.append(i)
-
-    w = 0
-
-    for i in range(len(ndxStart)):
-        numZerosTest.append([(ndxEnd[i] - ndxStart[i] + 1), i])
-
-    numZerosTest.sort(reverse=True)
-
-    for i in range(len(dt)):
-        ndxOK.append(i)
-
-    ndxtemp = ndxOK[:]
+# Removes the longest runs of zeros from a baseline while they are improbable
+# given the zeros that remain, and returns the indices that are kept. Runs are
+# visited longest first (later runs first on ties) and the search stops at the
+# first run that is short, probable, or would empty the baseline. Returns [0]
+# if fewer than 2 positive values are in the baseline.
+#
+# The runs are found in one run-length encoding pass and the zero count of the
+# remaining data is tracked as runs are removed, so apart from sorting the runs
+# the cost is linear in the baseline length.
+#
+# @param data baseline data array.
 
-    for i in range(len(numZerosTest)):
-        ndxtemp = ndxOK[:]
-        key = numZerosTest[i][1]
-        val = numZerosTest[i][0]
-        k = 0
 
-        if val < minNumZeros:
-            continue
+def filterBaselineZeros(data):
 
-        if i == 0:
-            k = ndxStart[key]
+    thresholdProb = 0.01
 
-        elif ndxStart[key] > k:
-            for w in range(len(ndxtemp) + 1):
-                if ndxtemp[w] == ndxStart[key]:
-                    break
-            k = w
+    # zero runs as (length, run number, start); only zeros are ever removed so
+    # the positive count of the whole baseline is also that of the output
+    runs = []
+    numPositive = 0
+    start = -1
+    for i, v in enumerate(data):
+        if v == 0:
+            if start < 0:
+                start = i
         else:
-            for w in range(len(ndxtemp) + 1):
-                if ndxtemp[w] == ndxStart[key]:
-                    break
-            k = w
-
-        for j in range(ndxStart[key], ndxEnd[key] + 1, 1):
-            del ndxtemp[k]
-
-        NumValuesOut = len(ndxOK) - ndxEnd[key] + ndxStart[key] - 1
+            if v > 0:
+                numPositive += 1
+            if start >= 0:
+                runs.append((i - start, len(runs), start))
+                start = -1
+    if start >= 0:
+        runs.append((len(data) - start, len(runs), start))
+
+    if numPositive < 2:
+        return [0]
+
+    numValues = len(data)
+    numZeros = sum(run[0] for run in runs)
+    runs.sort(reverse=True)
+
+    removed = []
+    for val, _, start in runs:
+        if val < MIN_NUM_ZEROS:
+            break
 
+        NumValuesOut = numValues - val
         if NumValuesOut == 0:
             break
-        dtOut = [dt[i] for i in ndxtemp]
-        nsum = 0
-        for p in range(len(dtOut)):
-            if dtOut[p] == 0:
-                nsum += 1
-        numZerosOut = max(1, nsum)
 
+        numZerosOut = max(1, numZeros - val)
         if (numZerosOut / NumValuesOut) ** val > thresholdProb:
             break
 
-        ndxOK = ndxtemp[:]
+        removed.append((start, val))
+        numValues = NumValuesOut
+        numZeros -= val
 
-    dtOut = [dt[i] for i in ndxOK]
-    nsum = 0
-    for h in range(len(dtOut)):
-        if dtOut[h] > 0:
-            nsum += 1
-    if nsum < 2:
-        ndxOK = [0]
+    ndxOK = []
+    pos = 0
+    for start, val in sorted(removed):
+        ndxOK.extend(range(pos, start))
+        pos = start + val
+    ndxOK.extend(range(pos, len(data)))
 
     return ndxOK
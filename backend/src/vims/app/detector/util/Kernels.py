@@ -0,0 +1,195 @@
+#  Copyright (c) 2013-2025. The Johns Hopkins University Applied Physics Laboratory LLC
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# NO WARRANTY.   THIS MATERIAL IS PROVIDED "AS IS."  JHU/APL DISCLAIMS ALL
+# WARRANTIES IN THE MATERIAL, WHETHER EXPRESS OR IMPLIED, INCLUDING (BUT NOT
+# LIMITED TO) ANY AND ALL IMPLIED WARRANTIES OF PERFORMANCE,
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF
+# INTELLECTUAL PROPERTY RIGHTS. ANY USER OF THE MATERIAL ASSUMES THE ENTIRE
+# RISK AND LIABILITY FOR USING THE MATERIAL.  IN NO EVENT SHALL JHU/APL BE
+# LIABLE TO ANY USER OF THE MATERIAL FOR ANY ACTUAL, INDIRECT,
+# CONSEQUENTIAL, SPECIAL OR OTHER DAMAGES ARISING FROM THE USE OF, OR
+# INABILITY TO USE, THE MATERIAL, INCLUDING, BUT NOT LIMITED TO, ANY DAMAGES
+# FOR LOST PROFITS.
+
+import importlib.util
+import math
+
+import numpy
+
+from vims.core import getLogger
+
+log = getLogger(__name__)
+
+# numba is only imported once its kernels are selected, so that the processes
+# using the numpy kernels do not pay for importing it.
+NUMBA_AVAILABLE = importlib.util.find_spec("numba") is not None
+numba = None
+
+# The recurrences of the detectors, where each day depends on the one before
+# and so can not be vectorized. The same source runs either as plain Python
+# over lists or, with the "numba" kernels, compiled over float64 arrays; a
+# missing value is NaN in both.
+
+KERNELS = ("numpy", "numba")
+BACKEND = "numpy"
+COMPILED = {}
+
+
+# Selects the kernels the detectors use in this process. Asking for the numba
+# kernels without numba installed falls back to the numpy ones.
+#
+# @param name one of KERNELS.
+
+
+def useKernels(name):
+    global BACKEND, NUMBA_AVAILABLE, numba
+    if name not in KERNELS:
+        raise ValueError(f"Detector kernels must be one of {list(KERNELS)}.")
+    if name == "numba" and numba is None:
+        try:
+            import numba
+        except ImportError:
+            NUMBA_AVAILABLE = False
+    if name == "numba" and not NUMBA_AVAILABLE:
+        log.warning("numba is not installed, using the numpy detector kernels")
+        name = "numpy"
+    BACKEND = name
+
+
+def compiled(kernel):
+    if kernel not in COMPILED:
+        COMPILED[kernel] = numba.njit(cache=True, nogil=True)(kernel)
+    return COMPILED[kernel]
+
+
+# EWMA smoothing of the test days. The smoothed value is pulled back to the
+# control limit whenever it crosses it.
+#
+# @param values cleaned data.
+# @param offsets index into values of every test day.
+# @param valid whether the test day has a baseline.
+# @param expected, sigma, limit baseline mean, adjusted standard deviation
+#                              and control limit of every test day.
+# @param smoothed smoothed value before the first test day.
+# @param testStat output, the test statistic of every test day (NaN for
+#                 days without a baseline).
+#
+# @return the smoothed value after the last test day
+
+
+def ewmaSmoothingKernel(
+    values, offsets, valid, expected, sigma, limit, omega, smoothed, testStat
+):
+    for k in range(len(offsets)):
+        smoothed = omega * values[offsets[k]] + (1 - omega) * smoothed
+        if not valid[k]:
+            continue
+
+        stat = (smoothed - expected[k]) / sigma[k]
+        testStat[k] = stat
+        if abs(stat) > limit[k]:
+            smoothed = expected[k] + math.copysign(1.0, stat) * limit[k] * sigma[k]
+    return smoothed
+
+
+def ewmaSmoothing(values, offsets, valid, expected, sigma, limit, omega, smoothed):
+    if BACKEND == "numba":
+        testStat = numpy.full(len(offsets), numpy.nan)
+        smoothed = compiled(ewmaSmoothingKernel)(
+            numpy.asarray(values, dtype=numpy.float64),
+            offsets.astype(numpy.int64),
+            valid,
+            expected,
+            sigma,
+            limit,
+            float(omega),
+            float(smoothed),
+            testStat,
+        )
+        return testStat, smoothed
+
+    testStat = [math.nan] * len(offsets)
+    smoothed = ewmaSmoothingKernel(
+        values,
+        offsets.tolist(),
+        valid.tolist(),
+        expected.tolist(),
+        sigma.tolist(),
+        limit.tolist(),
+        omega,
+        smoothed,
+        testStat,
+    )
+    return numpy.array(testStat), smoothed
+
+
+# CUSUM carry over of the test statistic. Past reset_level only half of it is
+# carried over; a day without a baseline restarts it from its count, or has
+# none when the count is zero.
+#
+# @param valid whether the test day has a baseline.
+# @param zStat standardized count of every test day.
+# @param counts count of every test day.
+# @param testStat statistic of the day before the first, NaN if none.
+# @param testStats output, the statistic of every test day (NaN if none).
+#
+# @return the statistic of the last test day
+
+
+def cusumCarryOverKernel(
+    valid, zStat, counts, cusum_k, reset_level, testStat, testStats
+):
+    for k in range(len(valid)):
+        if valid[k]:
+            if math.isnan(testStat):
+                carryOver = 0.0
+            elif testStat > reset_level:
+                carryOver = 0.5 * reset_level
+            else:
+                carryOver = testStat if testStat > 0 else 0.0
+
+            stat = carryOver + zStat[k] - cusum_k
+            testStat = stat if stat > 0 else 0.0
+
+        elif counts[k] > 0:
+            testStat = counts[k]
+
+        else:
+            testStat = math.nan
+        testStats[k] = testStat
+    return testStat
+
+
+def cusumCarryOver(valid, zStat, counts, cusum_k, reset_level, testStat):
+    testStat = math.nan if testStat is None else float(testStat)
+    if BACKEND == "numba":
+        testStats = numpy.full(len(valid), numpy.nan)
+        testStat = compiled(cusumCarryOverKernel)(
+            valid,
+            zStat,
+            numpy.asarray(counts, dtype=numpy.float64),
+            float(cusum_k),
+            float(reset_level),
+            testStat,
+            testStats,
+        )
+    else:
+        testStats = [math.nan] * len(valid)
+        testStat = cusumCarryOverKernel(
+            valid.tolist(),
+            zStat.tolist(),
+            counts.tolist(),
+            cusum_k,
+            reset_level,
+            testStat,
+            testStats,
+        )
+        testStats = numpy.array(testStats)
+    return testStats, None if math.isnan(testStat) else testStat
@@ -20,6 +20,8 @@
 
 import math
 
+from collections import OrderedDict
+
 import numpy
 
 
@@ -103,11 +105,84 @@ def cumulativeProbability(X, df):
     return tcdf
 
 
+# Array versions of LogGamma, Betinc and cumulativeProbability. They evaluate
+# the same expressions element-wise so a whole series of test statistics can be
+# converted to probabilities in one call.
+def LogGammaArray(Z):
+    S = (
+        1
+        + 76.18009173 / Z
+        - 86.50532033 / (Z + 1)
+        + 24.01409822 / (Z + 2)
+        - 1.231739516 / (Z + 3)
+        + 0.00120858003 / (Z + 4)
+        - 0.00000536382 / (Z + 5)
+    )
+    return (Z - 0.5) * numpy.log(Z + 4.5) - (Z + 4.5) + numpy.log(S * 2.50662827465)
+
+
+# Each element stops updating once it has converged, exactly as the scalar
+# Betinc loop would stop for that element on its own.
+def BetincArray(X, A, B):
+    A0 = numpy.zeros_like(X)
+    B0 = numpy.ones_like(X)
+    A1 = numpy.ones_like(X)
+    B1 = numpy.ones_like(X)
+    M9 = numpy.zeros_like(X)
+    A2 = numpy.zeros_like(X)
+
+    active = numpy.abs((A1 - A2) / A1) > 0.00001
+    while active.any():
+        A2 = numpy.where(active, A1, A2)
+        C9 = -(A + M9) * (A + B + M9) * X / (A + 2 * M9) / (A + 2 * M9 + 1)
+        nA0 = A1 + C9 * A0
+        nB0 = B1 + C9 * B0
+        nM9 = M9 + 1
+        C9 = nM9 * (B - nM9) * X / (A + 2 * nM9 - 1) / (A + 2 * nM9)
+        nA1 = nA0 + C9 * A1
+        nB1 = nB0 + C9 * B1
+        A0 = numpy.where(active, nA0 / nB1, A0)
+        B0 = numpy.where(active, nB0 / nB1, B0)
+        A1 = numpy.where(active, nA1 / nB1, A1)
+        B1 = numpy.where(active, 1.0, B1)
+        M9 = numpy.where(active, nM9, M9)
+        active = numpy.abs((A1 - A2) / A1) > 0.00001
+    return A1 / A
+
+
+def cumulativeProbabilities(X, df):
+    X = numpy.asarray(X, dtype=numpy.float64)
+    df = numpy.broadcast_to(numpy.asarray(df, dtype=numpy.float64), X.shape)
+    if X.size == 0:
+        return numpy.empty(X.shape)
+
+    A = df / 2
+    S = A + 0.5
+    Z = df / (df + X * X)
+    with numpy.errstate(divide="ignore"):
+        BT = numpy.exp(
+            LogGammaArray(S)
+            - LogGamma(0.5)
+            - LogGammaArray(A)
+            + A * numpy.log(Z)
+            + 0.5 * numpy.log(1 - Z)
+        )
+
+    betacdf = numpy.empty(X.shape)
+    lower = Z < (A + 1) / (S + 2)
+    upper = ~lower
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        betacdf[lower] = BT[lower] * BetincArray(Z[lower], A[lower], 0.5)
+        betacdf[upper] = 1 - BT[upper] * BetincArray(1 - Z[upper], 0.5, A[upper])
+
+    return numpy.where(X < 0, betacdf / 2, 1 - betacdf / 2)
+
+
 # And inverse Cumulative Probability - the most difficult to get
 # Uses a simple interpolation algorithm involving the straight t-distribution
 # With normal values as starting guesses
 # At 1e-10 precision, the value is correct up to about the 5th decimal
-def inverseCumulativeProbability(T, df):
+def findInverseCumulativeProbability(T, df):
     epsilon = float(1e-10)
     diff = 1
     out = 0
@@ -139,3 +214,37 @@ def inverseCumulativeProbability(T, df):
         out = out2
 
     return out2
+
+
+# Quantiles already found, keyed by (probability, degrees of freedom), least
+# recently used first. The detectors ask for the same few thresholds on every
+# request, so each one is only searched for once per process. The probabilities
+# come from the requests, so only the QUANTILE_TABLE_SIZE most recently used
+# quantiles are kept.
+QUANTILE_TABLE_SIZE = 32768
+QUANTILE_TABLE = OrderedDict()
+
+
+def addQuantiles(quantiles):
+    QUANTILE_TABLE.update(quantiles)
+    while len(QUANTILE_TABLE) > QUANTILE_TABLE_SIZE:
+        QUANTILE_TABLE.popitem(last=False)
+
+
+def quantileKey(T, df):
+    return (float(T), float(df))
+
+
+def inverseCumulativeProbability(T, df):
+    key = quantileKey(T, df)
+    if key in QUANTILE_TABLE:
+        QUANTILE_TABLE.move_to_end(key)
+        return QUANTILE_TABLE[key]
+    quantile = findInverseCumulativeProbability(T, df)
+    addQuantiles({key: quantile})
+    return quantile
+
+
+# The quantile of probability T for every degree of freedom in df, as an array.
+def quantileTable(T, df):
+    return numpy.array([inverseCumulativeProbability(T, d) for d in df])
@@ -36,6 +36,7 @@ from vims.app.config import Config
 from vims.app.settings import Settings
 
 from ..auth import require_permission
+from ..detector.alerts import schedule_alert_sweeps
 from ..permissions import Permission
 from .ETLJob import ETLJob
 
@@ -101,6 +102,8 @@ async def etl():
         etl_run = ETLJob(config, conf["conf"]["filename"])
 
         result = etl_run.execute_etl()
+        if result == "success":
+            schedule_alert_sweeps(config["table"]["name"])
         return {"message": result, "state": result}
 
     # @router.post(
@@ -20,17 +20,20 @@
 
 from .dashboard import Dashboard
 from .dataset import (
+    AlertSweep,
     DataList,
     Dataset,
     DatasetAdmin,
     DatasetAdminInternal,
     DatasetBase,
     DatasetBaseQuery,
+    DatasetDetectorSweep,
     DatasetField,
     DatasetInternal,
     DatasetQuery,
     DatasetRecord,
     DatasetRecordDelete,
+    TotalEnum,
 )
 from .datasource import (
     Datasource,
@@ -42,6 +45,19 @@ from .datasource import (
     DatasourceRecordUpsert,
     DatasourceUpdate,
 )
+from .detector import (
+    CdcParams,
+    CusumParams,
+    CusumState,
+    DetectorParams,
+    DetectorSeries,
+    DetectorState,
+    EarsParams,
+    EarsState,
+    EwmaParams,
+    EwmaState,
+    RegressionParams,
+)
 from .group import Group, GroupBase, GroupInternal
 from .regionmap import (
     LimitedRegionMap,
@@ -74,11 +90,14 @@ __all__ = [
     "DatasetField",
     "DatasetQuery",
     "DatasetBaseQuery",
+    "DatasetDetectorSweep",
+    "AlertSweep",
     "DatasetInternal",
     "DatasetAdmin",
     "DatasetAdminInternal",
     "DatasetRecord",
     "DatasetRecordDelete",
+    "TotalEnum",
     "Datasource",
     "DatasourceBase",
     "DatasourceCreate",
@@ -87,6 +106,17 @@ __all__ = [
     "DatasourceUpdate",
     "DatasourceRecordUpsert",
     "DatasourceRecordDelete",
+    "DetectorParams",
+    "DetectorSeries",
+    "DetectorState",
+    "CusumParams",
+    "CusumState",
+    "EarsParams",
+    "EarsState",
+    "CdcParams",
+    "EwmaParams",
+    "EwmaState",
+    "RegressionParams",
     "Group",
     "GroupBase",
     "GroupInternal",
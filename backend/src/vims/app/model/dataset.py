@@ -62,6 +62,12 @@ class OrderEnum(Enum):
     descending = "desc"
 
 
+class TotalEnum(EnumStrLower):
+    EXACT = EnumStrLower.auto()
+    ESTIMATE = EnumStrLower.auto()
+    OFF = EnumStrLower.auto()
+
+
 class DatasetQuery(BaseModel):
     computed: Dict[str, Dict[str, Union[str, List[str]]]] | None = None
     request: Dict[str, Any] | None = None
@@ -73,11 +79,31 @@ class DatasetQuery(BaseModel):
     transformations: Dict[str, Any] | None = None
     count_fields: List[str] | None = None
     distinct_field: str | None = None
+    with_total: TotalEnum = TotalEnum.EXACT
+    # "" for the first page of a query paged with cursors, then the
+    # next_cursor of the previous page
+    cursor: str | None = None
 
     class Config:
         use_enum_values = True
 
 
+class DatasetDetectorSweep(BaseModel):
+    date_field: str
+    granularity: DateGranularityEnum = DateGranularityEnum.DAILY
+    group_by: List[str] = Field(default_factory=list)
+    count_field: str | None = None
+    request: Dict[str, Any] | None = None
+    algorithm: str
+    params: Dict[str, Any] = Field(default_factory=dict)
+    include_series: bool = False
+
+
+class AlertSweep(DatasetDetectorSweep):
+    name: str
+    dataset_id: str
+
+
 class DatasetBase(BaseModel):
     dataset_name: str
     dataset_display_name: str
@@ -0,0 +1,146 @@
+#  Copyright (c) 2013-2025. The Johns Hopkins University Applied Physics Laboratory LLC
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# NO WARRANTY.   THIS MATERIAL IS PROVIDED "AS IS."  JHU/APL DISCLAIMS ALL
+# WARRANTIES IN THE MATERIAL, WHETHER EXPRESS OR IMPLIED, INCLUDING (BUT NOT
+# LIMITED TO) ANY AND ALL IMPLIED WARRANTIES OF PERFORMANCE,
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF
+# INTELLECTUAL PROPERTY RIGHTS. ANY USER OF THE MATERIAL ASSUMES THE ENTIRE
+# RISK AND LIABILITY FOR USING THE MATERIAL.  IN NO EVENT SHALL JHU/APL BE
+# LIABLE TO ANY USER OF THE MATERIAL FOR ANY ACTUAL, INDIRECT,
+# CONSEQUENTIAL, SPECIAL OR OTHER DAMAGES ARISING FROM THE USE OF, OR
+# INABILITY TO USE, THE MATERIAL, INCLUDING, BUT NOT LIMITED TO, ANY DAMAGES
+# FOR LOST PROFITS.
+
+from typing import Annotated, List, Optional, Tuple
+
+import math
+
+import numpy
+
+from pydantic import (
+    AfterValidator,
+    Field,
+    PlainSerializer,
+    StrictFloat,
+    model_validator,
+)
+
+from .base import BaseModel
+
+
+def to_series(values: List[Optional[float]]):
+    return numpy.array(values, dtype=numpy.float64)
+
+
+def from_series(series: numpy.ndarray):
+    return [None if math.isnan(v) else v for v in series.tolist()]
+
+
+# A detector data series: a flat list of numbers, with null for missing days.
+# Strings, booleans and nested lists are rejected while the request is parsed,
+# and the list is handed to the detectors as a float64 array with NaN for the
+# missing days. Dumping the model turns it back into a list.
+DetectorSeries = Annotated[
+    List[Optional[StrictFloat]],
+    AfterValidator(to_series),
+    PlainSerializer(from_series, return_type=List[Optional[float]]),
+]
+
+
+# The longest baseline or guardband, in days, that a detector accepts. The
+# work and memory of a run grow with the baseline, so the requests can not ask
+# for more than about ten years.
+MAX_BASELINE_DAYS = 3660
+
+
+class DetectorParams(BaseModel):
+    data: DetectorSeries
+
+
+# The state a detector returns to resume a series from, sent back with the
+# next days of the series. An empty state starts a new series.
+
+
+class DetectorState(BaseModel):
+    # the last days seen, as many as the baselines of the next days need
+    tail: List[Optional[StrictFloat]] = Field(default_factory=list)
+
+
+class CusumState(DetectorState):
+    testStat: Optional[StrictFloat] = None
+
+
+class EarsState(DetectorState):
+    # the CUSUM scores of the last two days
+    cusum: Tuple[StrictFloat, StrictFloat] = (0, 0)
+
+
+class EwmaState(DetectorState):
+    # the number of days seen, tail included; defaults to the length of tail
+    count: Optional[int] = Field(None, ge=0)
+    smoothed: Optional[StrictFloat] = None
+
+    @model_validator(mode="after")
+    def check_count(self):
+        if self.count is None:
+            self.count = len(self.tail)
+        if self.count < len(self.tail):
+            raise ValueError("count must be at least the length of tail")
+        if self.count > 0 and self.smoothed is None:
+            raise ValueError("smoothed is required once days have been seen")
+        return self
+
+
+class CusumParams(DetectorParams):
+    cusum_k: float = 0.5
+    baseline: int = Field(28, ge=1, le=MAX_BASELINE_DAYS)
+    guardband: int = Field(2, ge=0, le=MAX_BASELINE_DAYS)
+    min_sigma: float = Field(0.5, ge=0)
+    reset_level: float = 4
+    state: CusumState | None = None
+
+
+class EarsParams(DetectorParams):
+    baseline: int = Field(ge=2, le=MAX_BASELINE_DAYS)
+    base_lag: int = Field(ge=0, le=MAX_BASELINE_DAYS)
+    cusum_flag: int
+    cusum_k: float
+    min_sigma: float = Field(ge=0)
+    thresh: float
+    state: EarsState | None = None
+
+
+class CdcParams(DetectorParams):
+    pass
+
+
+class EwmaParams(DetectorParams):
+    omega: float = Field(0.4, gt=0, le=1)
+    min_deg_freedom: int = Field(2, ge=1)
+    max_base_line_len: int = Field(28, ge=1, le=MAX_BASELINE_DAYS)
+    threshold_probability_red_alert: float = Field(0.01, gt=0, lt=1)
+    threshold_probability_yellow_alert: float = Field(0.05, gt=0, lt=1)
+    num_guardband: int = Field(2, ge=0, le=MAX_BASELINE_DAYS)
+    remove_zeros: bool = True
+    min_prob_level: float = Field(1e-6, gt=0, lt=1)
+    num_fit_params: int = Field(1, ge=1)
+    state: EwmaState | None = None
+
+
+class RegressionParams(DetectorParams):
+    baseline_len: int = Field(28, ge=1, le=MAX_BASELINE_DAYS)
+    num_guardband: int = Field(2, ge=0, le=MAX_BASELINE_DAYS)
+    day_of_week: bool = True
+    first_weekday: int = Field(0, ge=0, le=6)
+    holidays: List[int] = Field(default_factory=list)
+    remove_zeros: bool = True
+    min_deg_freedom: int = Field(2, ge=1)
+    min_sigma: float = Field(0.5, ge=0)
+    min_prob_level: float = Field(1e-6, gt=0, lt=1)
@@ -43,3 +43,12 @@ class Settings(Enum):
     MAIL_SERVER_PORT = "MAIL_SERVER_PORT"
     MAIL_SERVER_ADDRESS = "MAIL_SERVER_ADDRESS"
     FRONTEND_BASE_URL = "FRONTEND_BASE_URL"
+    DETECTOR_EXECUTOR = "DETECTOR_EXECUTOR"
+    DETECTOR_POOL_SIZE = "DETECTOR_POOL_SIZE"
+    DETECTOR_QUEUE_DEPTH = "DETECTOR_QUEUE_DEPTH"
+    DETECTOR_CACHE_SIZE = "DETECTOR_CACHE_SIZE"
+    DETECTOR_CACHE_TTL = "DETECTOR_CACHE_TTL"
+    DETECTOR_TUNING_MAX_COMBINATIONS = "DETECTOR_TUNING_MAX_COMBINATIONS"
+    DETECTOR_KERNELS = "DETECTOR_KERNELS"
+    ALERT_SWEEPS = "ALERT_SWEEPS"
+    ALERT_SWEEP_INTERVAL = "ALERT_SWEEP_INTERVAL"
@@ -0,0 +1,193 @@
+#  Copyright (c) 2013-2025. The Johns Hopkins University Applied Physics Laboratory LLC
+#
+#
+# This material may be used, modified, or reproduced by or for the U.S.
+# Government pursuant to the rights granted under the clauses at
+# DFARS 252.227-7013/7014 or FAR 52.227-14.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# NO WARRANTY.   THIS MATERIAL IS PROVIDED "AS IS."  JHU/APL DISCLAIMS ALL
+# WARRANTIES IN THE MATERIAL, WHETHER EXPRESS OR IMPLIED, INCLUDING (BUT NOT
+# LIMITED TO) ANY AND ALL IMPLIED WARRANTIES OF PERFORMANCE,
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF
+# INTELLECTUAL PROPERTY RIGHTS. ANY USER OF THE MATERIAL ASSUMES THE ENTIRE
+# RISK AND LIABILITY FOR USING THE MATERIAL.  IN NO EVENT SHALL JHU/APL BE
+# LIABLE TO ANY USER OF THE MATERIAL FOR ANY ACTUAL, INDIRECT,
+# CONSEQUENTIAL, SPECIAL OR OTHER DAMAGES ARISING FROM THE USE OF, OR
+# INABILITY TO USE, THE MATERIAL, INCLUDING, BUT NOT LIMITED TO, ANY DAMAGES
+# FOR LOST PROFITS.
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import datetime
+import math
+import platform
+import statistics
+import time
+
+import numpy
+
+from vims.app.detector.runner import Algorithm, run_detector
+
+# The detectors that are timed, with the params they are run with. Anything
+# not given falls back to the defaults of the detector routes.
+DETECTORS = {
+    "cusum": (Algorithm.cusum, {}),
+    "ewma": (Algorithm.ewma, {}),
+    "ears": (
+        Algorithm.ears,
+        {
+            "baseline": 7,
+            "base_lag": 2,
+            "cusum_flag": 1,
+            "cusum_k": 1,
+            "min_sigma": 0.1,
+            "thresh": 2,
+        },
+    ),
+    "cdc1": (Algorithm.cdc1, {}),
+    "cdc2": (Algorithm.cdc2, {}),
+    "cdc3": (Algorithm.cdc3, {}),
+    "cdc": (Algorithm.cdc, {}),
+    "regression": (Algorithm.regression, {}),
+}
+
+SERIES = ["poisson", "seasonal"]
+
+# relative weekday levels, starting on a Monday
+WEEKLY = numpy.array([1.1, 1.0, 1.0, 1.0, 0.95, 0.6, 0.5])
+
+
+def expected_counts(kind: str, length: int, level: float):
+    days = numpy.arange(length)
+    if kind == "poisson":
+        return numpy.full(length, float(level))
+    if kind == "seasonal":
+        annual = 1 + 0.4 * numpy.cos(2 * math.pi * days / 365.25)
+        return level * annual * WEEKLY[days % 7]
+    raise ValueError(f"Series must be one of {SERIES}.")
+
+
+def synthetic_series(
+    kind: str,
+    length: int,
+    seed: int = 0,
+    level: float = 20,
+    outbreak_length: int = 14,
+    outbreak_size: float = 3,
+):
+    """
+    Daily counts of the given kind with an outbreak injected in the last third
+    of the series. The outbreak adds counts on top of the expected level that
+    rise to outbreak_size times the level and fall again over
+    outbreak_length days. A few days are left missing (None).
+
+    Returns the series and the day the outbreak starts.
+    """
+    rng = numpy.random.default_rng(seed)
+    expected = expected_counts(kind, length, level)
+
+    start = int(
+        rng.integers(
+            length * 2 // 3, max(length * 2 // 3 + 1, length - outbreak_length)
+        )
+    )
+    end = min(length, start + outbreak_length)
+    shape = 1 - numpy.abs(numpy.linspace(-1, 1, outbreak_length + 2)[1:-1])
+    expected[start:end] += outbreak_size * level * shape[: end - start]
+
+    series = rng.poisson(expected).astype(object)
+    series[rng.random(length) < 0.01] = None
+    return series.tolist(), start
+
+
+def time_detector(
+    algorithm: Algorithm, params: Dict[str, Any], data: List[Any], repeat: int
+):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run_detector(algorithm, {**params, "data": data})
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def run_benchmark(
+    lengths: Sequence[int],
+    series: Sequence[str] = SERIES,
+    detectors: Sequence[str] = tuple(DETECTORS.keys()),
+    repeat: int = 3,
+    seed: int = 0,
+    outbreak_length: int = 14,
+    outbreak_size: float = 3,
+    label: Optional[str] = None,
+):
+    """
+    Times every detector on every series kind and length. The results are
+    plain JSON so that runs from different commits can be compared.
+    """
+    results = []
+    for kind in series:
+        for length in lengths:
+            data, _ = synthetic_series(
+                kind,
+                length,
+                seed,
+                outbreak_length=outbreak_length,
+                outbreak_size=outbreak_size,
+            )
+            for name in detectors:
+                algorithm, params = DETECTORS[name]
+                # a short warm up run fills the coefficient tables
+                run_detector(algorithm, {**params, "data": data[:100]})
+                timings = time_detector(algorithm, params, data, repeat)
+                results.append(
+                    {
+                        "detector": name,
+                        "series": kind,
+                        "length": length,
+                        "min": min(timings),
+                        "median": statistics.median(timings),
+                        "mean": statistics.mean(timings),
+                        "days_per_second": length / min(timings),
+                    }
+                )
+
+    return {
+        "label": label,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "machine": platform.machine(),
+        "repeat": repeat,
+        "seed": seed,
+        "outbreak_length": outbreak_length,
+        "outbreak_size": outbreak_size,
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], previous: Dict[str, Any]):
+    """
+    Matches the results of two runs by detector, series and length and gives
+    the ratio of their fastest times; above 1 means the current run is slower.
+    """
+
+    def key(result):
+        return (result["detector"], result["series"], result["length"])
+
+    before = {key(result): result for result in previous["results"]}
+    return [
+        {
+            **result,
+            "previous": before[key(result)]["min"],
+            "ratio": result["min"] / before[key(result)]["min"],
+        }
+        for result in current["results"]
+        if key(result) in before
+    ]
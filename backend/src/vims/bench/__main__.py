@@ -0,0 +1,97 @@
+#  Copyright (c) 2013-2025. The Johns Hopkins University Applied Physics Laboratory LLC
+#
+#
+# This material may be used, modified, or reproduced by or for the U.S.
+# Government pursuant to the rights granted under the clauses at
+# DFARS 252.227-7013/7014 or FAR 52.227-14.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# NO WARRANTY.   THIS MATERIAL IS PROVIDED "AS IS."  JHU/APL DISCLAIMS ALL
+# WARRANTIES IN THE MATERIAL, WHETHER EXPRESS OR IMPLIED, INCLUDING (BUT NOT
+# LIMITED TO) ANY AND ALL IMPLIED WARRANTIES OF PERFORMANCE,
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF
+# INTELLECTUAL PROPERTY RIGHTS. ANY USER OF THE MATERIAL ASSUMES THE ENTIRE
+# RISK AND LIABILITY FOR USING THE MATERIAL.  IN NO EVENT SHALL JHU/APL BE
+# LIABLE TO ANY USER OF THE MATERIAL FOR ANY ACTUAL, INDIRECT,
+# CONSEQUENTIAL, SPECIAL OR OTHER DAMAGES ARISING FROM THE USE OF, OR
+# INABILITY TO USE, THE MATERIAL, INCLUDING, BUT NOT LIMITED TO, ANY DAMAGES
+# FOR LOST PROFITS.
+
+import argparse
+import json
+import sys
+
+from vims.bench import DETECTORS, SERIES, compare, run_benchmark
+
+
+def run():
+    parser = argparse.ArgumentParser(
+        prog="python -m vims.bench",
+        description="Time the detectors on synthetic series with outbreaks.",
+    )
+    parser.add_argument(
+        "--lengths",
+        type=int,
+        nargs="+",
+        default=[365, 1095, 3650, 10000],
+        help="Series lengths in days",
+    )
+    parser.add_argument("--series", nargs="+", choices=SERIES, default=SERIES)
+    parser.add_argument(
+        "--detectors",
+        nargs="+",
+        choices=list(DETECTORS.keys()),
+        default=list(DETECTORS.keys()),
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per timing")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--outbreak-length", type=int, default=14)
+    parser.add_argument(
+        "--outbreak-size",
+        type=float,
+        default=3,
+        help="Outbreak peak as a multiple of the series level",
+    )
+    parser.add_argument("--label", help="Label stored with the results")
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    parser.add_argument("--compare", help="JSON results of an earlier run")
+    args = parser.parse_args()
+
+    results = run_benchmark(
+        args.lengths,
+        series=args.series,
+        detectors=args.detectors,
+        repeat=args.repeat,
+        seed=args.seed,
+        outbreak_length=args.outbreak_length,
+        outbreak_size=args.outbreak_size,
+        label=args.label,
+    )
+
+    rows = results["results"]
+    if args.compare:
+        with open(args.compare) as f:
+            rows = compare(results, json.load(f))
+
+    for row in rows:
+        line = (
+            f"{row['detector']:>6} {row['series']:>9} {row['length']:>6} days "
+            f"{row['min'] * 1000:10.2f} ms"
+        )
+        if "ratio" in row:
+            line += f"  x{row['ratio']:.2f} vs {row['previous'] * 1000:.2f} ms"
+        print(line, file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+
+
+run()
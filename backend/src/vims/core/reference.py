@@ -26,3 +26,5 @@ class Reference(Enum):
     LOOP = "LOOP"
     DATABASE = "DATABASE"
     DATABRIDGE_MANAGER = "DATABRIDGE_MANAGER"
+    DETECTOR_EXECUTOR = "DETECTOR_EXECUTOR"
+    DETECTOR_CACHE = "DETECTOR_CACHE"
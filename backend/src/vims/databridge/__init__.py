@@ -28,6 +28,11 @@ class DataBridgeType(Enum):
     VIMS = "vims"
 
 
+async def iterate(rows: List[Dict[str, Any]]):
+    for row in rows:
+        yield row
+
+
 class DataBridge:
     def __init__(self, token="", display_name="", datasource_type=""):
         self.token = token
@@ -52,6 +57,15 @@ class DataBridge:
     def query(self, query_args: Dict[str, Any]):
         raise NotImplementedError
 
+    async def stream(self, query_args: Dict[str, Any]):
+        # Returns an async iterator over the rows of the query, raising a
+        # RuntimeError up front if the query can not be run. Databridges that
+        # can not stream from their source run the whole query first.
+        result = await self.query(query_args)
+        if result.get("error") is not None:
+            raise RuntimeError(result["error"])
+        return iterate(result["values"])
+
     def record_exists(self, table_name, fields, primary_key_field, primary_key_value):
         raise NotImplementedError
 
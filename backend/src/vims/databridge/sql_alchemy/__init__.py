@@ -20,18 +20,25 @@
 
 from typing import Any, Dict, List, Type
 
+import asyncio
 import copy
+import json
 
+from collections import OrderedDict
 from datetime import datetime
 
 import sqlalchemy as sqla
 
 from databases import Database, DatabaseURL
+from sqlalchemy.ext.compiler import compiles
 
 from vims.core import getLogger
 from vims.databridge import DataBridge
+from vims.util import sort_and_hash_dict
 from vims.util import sqla_where_compiler as swc
 
+from .keyset import FIRST_PAGE, NULLS_HIGH_DIALECTS, Keyset
+
 log = getLogger(__name__)
 
 SQLA_FNS = {
@@ -53,6 +60,108 @@ SQLA_FNS = {
     },
 }
 
+# How the total number of rows matching a query is returned: counted exactly,
+# estimated from the planner statistics (postgres only, the others count), or
+# not at all, in which case the total is None.
+TOTAL_EXACT = "exact"
+TOTAL_ESTIMATE = "estimate"
+TOTAL_OFF = "off"
+TOTAL_MODES = (TOTAL_EXACT, TOTAL_ESTIMATE, TOTAL_OFF)
+
+
+class Explain(sqla.sql.expression.Executable, sqla.sql.expression.ClauseElement):
+    """
+    The planner's JSON plan for a select statement.
+    """
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+class CachedCompiled:
+    """
+    A compiled statement taken from the statement cache, handing out the bound
+    parameter values of the statement being run instead of those of the
+    statement it was compiled from. The databases backends read the rest of
+    the compiled statement (its string, positiontup, bind processors and
+    result columns) through it, which the tests check for each backend.
+    """
+
+    def __init__(self, compiled, extracted_parameters):
+        self.compiled = compiled
+        self.extracted_parameters = extracted_parameters
+
+    def __getattr__(self, name):
+        return getattr(self.compiled, name)
+
+    @property
+    def params(self):
+        return self.construct_params()
+
+    def construct_params(self, **kwargs):
+        return self.compiled.construct_params(
+            extracted_parameters=self.extracted_parameters, **kwargs
+        )
+
+
+class CachedStatement:
+    """
+    Wraps a statement for the databases backends, which compile every query
+    they are given, so that it is compiled through a StatementCache.
+    """
+
+    def __init__(self, statement, cache: "StatementCache"):
+        self.statement = statement
+        self.cache = cache
+
+    def compile(self, dialect=None, compile_kwargs=None):
+        return self.cache.compile(self.statement, dialect, compile_kwargs or {})
+
+
+class StatementCache:
+    """
+    Least recently used cache of compiled statements, keyed by SQLAlchemy's
+    cache key, which leaves out the values of the bound parameters. Statements
+    with an IN list are rendered for the number of values in the list, so they
+    are always compiled. A max_size of 0 turns the cache off.
+    """
+
+    def __init__(self, max_size: int = 500):
+        self.max_size = max_size
+        self.entries: "OrderedDict[Any, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def compile(self, statement, dialect, compile_kwargs: Dict[str, Any]):
+        cache_key = statement._generate_cache_key() if self.max_size > 0 else None
+        if cache_key is None or any(
+            p.expanding or p.literal_execute for p in cache_key.bindparams
+        ):
+            return statement.compile(dialect=dialect, compile_kwargs=compile_kwargs)
+
+        key = (dialect.name, cache_key.key, tuple(sorted(compile_kwargs.items())))
+        compiled = self.entries.get(key)
+        if compiled is None:
+            self.misses += 1
+            compiled = statement.compile(
+                dialect=dialect, cache_key=cache_key, compile_kwargs=compile_kwargs
+            )
+            self.entries[key] = compiled
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+            return compiled
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return CachedCompiled(compiled, cache_key.bindparams)
+
 
 class SqlAlchemyBridge(DataBridge):
     FIELD_TYPES: Dict[str, Type] = {
@@ -80,9 +189,15 @@ class SqlAlchemyBridge(DataBridge):
         ssl: bool = True,
         min_size: int = 5,
         max_size: int = 20,
+        cache_size: int = 500,
         **kwargs,
     ):
         super().__init__(**kwargs)
+        # Tables by dataset name and a hash of their fields, and the compiled
+        # statements run on them, so that repeated queries are neither rebuilt
+        # nor recompiled.
+        self.tables: Dict[Any, sqla.Table] = {}
+        self.statement_cache = StatementCache(cache_size)
         self.database_url = DatabaseURL(url.format(password=password))
         self.dialect = self.database_url.dialect
         self.database_type = self.dialect
@@ -110,6 +225,25 @@ class SqlAlchemyBridge(DataBridge):
     def get_database_type(self):
         return self.database_type
 
+    def get_table(self, table_name: str, fields: Dict[str, Any]):
+        """
+        Returns the table with the given fields, built the first time it is
+        asked for.
+        """
+        key = (table_name, sort_and_hash_dict(fields))
+        table = self.tables.get(key)
+        if table is None:
+            table = sqla.Table(
+                table_name,
+                sqla.MetaData(),
+                *[sqla.Column(field_name) for field_name in fields],
+            )
+            self.tables[key] = table
+        return table
+
+    def cached(self, statement):
+        return CachedStatement(statement, self.statement_cache)
+
     async def connect(self):
         await self.database.connect()
 
@@ -188,146 +322,241 @@ class SqlAlchemyBridge(DataBridge):
         except Exception as e:
             return {"values": values, "error": str(e)}
 
-    async def query(self, query_args: Dict[str, Any]):
+    def build_query(self, query_args: Dict[str, Any]):
+        """
+        Validates the query args and builds the select statement they describe,
+        along with its Keyset when they have a cursor and their rows can be
+        paged through with cursors: queries with a limit over the rows of a
+        dataset whose primary key they select. The primary key is then the last
+        sort key. Raises a RuntimeError when the args are not valid.
+        """
         # Copy query args to ensure that we can safely make modifications to it.
         query_args_copy = copy.deepcopy(query_args)
-        try:
-            (
-                dataset_name,
+        (
+            dataset_name,
+            dataset_metadata,
+            selected_fields,
+            request,
+            limit,
+            offset,
+            order_by,
+            group_by,
+            having,
+            count_fields,
+            distinct_field,
+        ) = self.validate_query_args(query_args_copy)
+
+        # The validated metadata also types the group_by labels, so the table
+        # is built from the dataset's own fields.
+        fields = query_args["dataset"]["fields"]
+        table = self.get_table(dataset_name, fields)
+        sqla_columns = {f: table.c[f] for f in fields}
+
+        group_by_fields = None
+        group_by_labels = []
+        if group_by is not None:
+            for f in group_by.get("fields"):
+                if f not in sqla_columns:
+                    unit, field = swc.parse_date_bucket(f)
+                    sqla_columns[f] = swc.DateBucket(unit, sqla_columns[field]).label(f)
+            group_by_fields = [sqla_columns[f] for f in group_by.get("fields")]
+            for agg_label, agg_data in group_by["aggregators"].items():
+                agg_field = agg_data.get("field", None)
+                agg_fn = agg_data["function"]
+
+                if agg_fn == "count" and agg_field is None:
+                    sqla_columns[agg_label] = sqla.func.count().label(agg_label)
+                else:
+                    sqla_columns[agg_label] = SQLA_FNS[agg_fn]["fn"](
+                        sqla_columns[agg_field]
+                    ).label(agg_label)
+                group_by_labels.append(agg_label)
+
+        if group_by_fields is not None:
+            sqla_selected_columns = group_by_fields + [
+                sqla_columns[f] for f in group_by_labels
+            ]
+        elif distinct_field is not None:
+            sqla_selected_columns = [sqla_columns[distinct_field].distinct()]
+        elif count_fields is not None:
+            sqla_selected_columns = [
+                sqla.func.count(sqla_columns[f].distinct()).label(f"count_distinct_{f}")
+                for f in count_fields
+            ]
+        elif selected_fields is not None:
+            sqla_selected_columns = [sqla_columns[f] for f in selected_fields]
+        else:
+            sqla_selected_columns = sqla_columns.values()
+
+        q = sqla.select(*sqla_selected_columns)
+
+        if request is not None:
+            try:
+                compiled_columns = request.compile(sqla_columns, dataset_metadata)
+                q = q.where(compiled_columns)
+            except swc.SqlaWhereCompileError as e:
+                raise RuntimeError(f"Error compiling query request: {str(e)}")
+
+        if group_by_fields is not None:
+            q = q.group_by(*group_by_fields)
+
+        if having is not None:
+            try:
+                q = q.having(having.compile(sqla_columns, dataset_metadata))
+            except swc.SqlaWhereCompileError as e:
+                raise RuntimeError(f"Error compiling query having: {str(e)}")
+
+        if limit is not None:
+            q = q.limit(limit)
+
+        if offset is not None:
+            q = q.offset(offset)
+
+        primary_key_field = query_args["dataset"].get("primary_key_field")
+        if (
+            query_args.get("cursor") is not None
+            and limit is not None
+            and group_by_fields is None
+            and count_fields is None
+            and distinct_field is None
+            and primary_key_field in selected_fields
+        ):
+            sort_keys = [
+                (field_name, sqla_columns[field_name], order.lower() == "desc")
+                for field_name, order in order_by or []
+            ]
+            if primary_key_field not in [f for f, _, _ in sort_keys]:
+                sort_keys.append(
+                    (primary_key_field, sqla_columns[primary_key_field], False)
+                )
+            digest = sort_and_hash_dict(
+                {
+                    "dataset": dataset_name,
+                    "request": query_args.get("request"),
+                    "order_by": [[f, desc] for f, _, desc in sort_keys],
+                }
+            )
+            keyset = Keyset(
+                sort_keys,
                 dataset_metadata,
-                selected_fields,
-                request,
+                primary_key_field,
                 limit,
-                offset,
-                order_by,
-                group_by,
-                having,
-                count_fields,
-                distinct_field,
-            ) = self.validate_query_args(query_args_copy)
-
-            sqla_columns = {}
-            for field_name, field_type in dataset_metadata.items():
-                sqla_columns[field_name] = sqla.Column(field_name)
-
-            m = sqla.MetaData()
-            sqla.Table(dataset_name, m, *sqla_columns.values())
-
-            group_by_fields = None
-            group_by_labels = []
-            if group_by is not None:
-                group_by_fields = [sqla_columns[f] for f in group_by.get("fields")]
-                for agg_label, agg_data in group_by["aggregators"].items():
-                    agg_field = agg_data.get("field", None)
-                    agg_fn = agg_data["function"]
-
-                    if agg_fn == "count" and agg_field is None:
-                        sqla_columns[agg_label] = sqla.func.count().label(agg_label)
-                    else:
-                        sqla_columns[agg_label] = SQLA_FNS[agg_fn]["fn"](
-                            sqla_columns[agg_field]
-                        ).label(agg_label)
-                    group_by_labels.append(agg_label)
-
-            if group_by_fields is not None:
-                sqla_selected_columns = group_by_fields + [
-                    sqla_columns[f] for f in group_by_labels
-                ]
-            elif distinct_field is not None:
-                sqla_selected_columns = [sqla_columns[distinct_field].distinct()]
-            elif count_fields is not None:
-                sqla_selected_columns = [
-                    sqla.func.count(sqla_columns[f].distinct()).label(
-                        f"count_distinct_{f}"
-                    )
-                    for f in count_fields
-                ]
-            elif selected_fields is not None:
-                sqla_selected_columns = [sqla_columns[f] for f in selected_fields]
-            else:
-                sqla_selected_columns = sqla_columns.values()
-
-            q = sqla.select(*sqla_selected_columns)
-
-            if request is not None:
-                try:
-                    compiled_columns = request.compile(sqla_columns, dataset_metadata)
-                    q = q.where(compiled_columns)
-                except swc.SqlaWhereCompileError as e:
-                    raise RuntimeError(f"Error compiling query request: {str(e)}")
-
-            if group_by_fields is not None:
-                q = q.group_by(*group_by_fields)
-
-            if having is not None:
-                try:
-                    q = q.having(having.compile(sqla_columns, dataset_metadata))
-                except swc.SqlaWhereCompileError as e:
-                    raise RuntimeError(f"Error compiling query having: {str(e)}")
-
-            if limit is not None:
-                q = q.limit(limit)
-
-            if offset is not None:
-                q = q.offset(offset)
-
-            if order_by is not None:
-                orders = []
-                for field_name, order in order_by:
-                    column = sqla_columns.get(field_name)
-                    orders.append(
-                        column.asc() if order.lower() == "asc" else column.desc()
-                    )
-                q = q.order_by(*orders)
-
-            results = []
-            async for row in self.database.iterate(query=q):
-                row_dict = {}
-                for k in row._mapping.keys():
-                    row_dict[k] = row._mapping[k]
-                results.append(row_dict)
-
-            # Return the total count for this query.
-            q = q.limit(None)
-            q = q.offset(None)
-            count_q = sqla.select(sqla.func.count()).select_from(q)
-            total_count = await self.database.fetch_one(query=count_q)
-            total = total_count[0]
-
-            return {"values": results, "total": total, "error": None}
+                digest,
+                nulls_high=self.dialect in NULLS_HIGH_DIALECTS,
+            )
+            return q.order_by(*keyset.order_by()), keyset
+
+        if order_by is not None:
+            orders = []
+            for field_name, order in order_by:
+                column = sqla_columns.get(field_name)
+                orders.append(column.asc() if order.lower() == "asc" else column.desc())
+            q = q.order_by(*orders)
+
+        return q, None
+
+    def paginate(self, q, keyset: Keyset | None, query_args: Dict[str, Any]):
+        """
+        Returns the statement selecting the page the query args ask for, which
+        starts at their cursor if they have one, and the offset of its first
+        row. The FIRST_PAGE cursor starts at the first row.
+        """
+        cursor = query_args.get("cursor")
+        offset = query_args.get("offset") or 0
+        if cursor is None:
+            return q, offset
+        if keyset is None:
+            raise RuntimeError(
+                "A cursor can only page through a query with a limit that selects "
+                "the dataset's primary key, without group_by, count_fields or "
+                "distinct_field."
+            )
+        if offset:
+            raise RuntimeError("Offset can not be used with a cursor.")
+        if cursor == FIRST_PAGE:
+            return q, 0
+        return keyset.page(q, cursor)
+
+    async def query(self, query_args: Dict[str, Any]):
+        """
+        Runs the query and returns its rows along with the total number of rows
+        matching it without the limit and offset. The total is computed as
+        asked by the with_total query arg, on its own connection while the rows
+        are fetched. Queries paged with cursors also return the cursor of their
+        next page, None after the last one.
+        """
+        try:
+            q, keyset = self.build_query(query_args)
+            page, offset = self.paginate(q, keyset, query_args)
+            with_total = query_args.get("with_total") or TOTAL_EXACT
+            if with_total not in TOTAL_MODES:
+                raise RuntimeError(
+                    f"with_total must be one of: {', '.join(TOTAL_MODES)}."
+                )
+
+            total_task = None
+            if with_total != TOTAL_OFF:
+                total_task = asyncio.ensure_future(self.count_rows(q, with_total))
+            try:
+                results = []
+                async for row in self.database.iterate(query=self.cached(page)):
+                    results.append(dict(row._mapping))
+                total = None if total_task is None else await total_task
+            finally:
+                if total_task is not None:
+                    total_task.cancel()
+
+            result = {"values": results, "total": total, "error": None}
+            if keyset is not None:
+                result["next_cursor"] = keyset.next_cursor(results, offset)
+            return result
         except Exception as e:
             return {"values": [], "total": -1, "error": str(e)}
 
+    async def count_rows(self, q, with_total: str = TOTAL_EXACT):
+        """
+        Counts the rows matched by the select statement without its limit and
+        offset, or estimates them from the query plan on postgres.
+        """
+        q = q.limit(None).offset(None).order_by(None)
+        if with_total == TOTAL_ESTIMATE and self.dialect == "postgresql":
+            plan = await self.database.fetch_val(query=Explain(q))
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]["Plan"]["Plan Rows"])
+
+        count_q = sqla.select(sqla.func.count()).select_from(q.subquery())
+        return await self.database.fetch_val(query=self.cached(count_q))
+
+    async def stream(self, query_args: Dict[str, Any]):
+        q, keyset = self.build_query(query_args)
+        page, _ = self.paginate(q, keyset, query_args)
+        return self.iterate_rows(page)
+
+    async def iterate_rows(self, q):
+        async for row in self.database.iterate(query=self.cached(q)):
+            yield dict(row._mapping)
+
     async def record_exists(
         self, table_name, fields, primary_key_field, primary_key_value
     ):
-        sqla_columns = {}
-        for field_name, field_type in fields.items():
-            sqla_columns[field_name] = sqla.Column(field_name)
-
-        metadata = sqla.MetaData()
-        table = sqla.Table(table_name, metadata, *sqla_columns.values())
-
+        table = self.get_table(table_name, fields)
         query = (
             table.select()
             .where(table.c[primary_key_field] == primary_key_value)
             .limit(1)
         )
-        result = await self.database.fetch_one(query)
+        result = await self.database.fetch_one(self.cached(query))
 
         return result is not None
 
     async def create_record(self, table_name, fields, record):
         # TODO: check primary key, type checking
         try:
-            sqla_columns = {}
-            for field_name, field_type in fields.items():
-                sqla_columns[field_name] = sqla.Column(field_name)
-            metadata = sqla.MetaData()
-            table = sqla.Table(table_name, metadata, *sqla_columns.values())
+            table = self.get_table(table_name, fields)
 
             insert = table.insert().values(**record)
-            result = await self.database.execute(insert)
+            result = await self.database.execute(self.cached(insert))
             return {"values": result, "error": None}
 
         except Exception as e:
@@ -337,18 +566,14 @@ class SqlAlchemyBridge(DataBridge):
         self, table_name, fields, record, primary_key_field, primary_key_value
     ):
         try:
-            sqla_columns = {}
-            for field_name, field_type in fields.items():
-                sqla_columns[field_name] = sqla.Column(field_name)
-            metadata = sqla.MetaData()
-            table = sqla.Table(table_name, metadata, *sqla_columns.values())
+            table = self.get_table(table_name, fields)
             update_values = {k: v for k, v in record.items() if k != primary_key_field}
             update_stmt = (
                 table.update()
                 .where(table.c[primary_key_field] == primary_key_value)
                 .values(**update_values)
             )
-            result = await self.database.execute(update_stmt)
+            result = await self.database.execute(self.cached(update_stmt))
             return {"values": result, "error": None}
 
         except Exception as e:
@@ -358,18 +583,12 @@ class SqlAlchemyBridge(DataBridge):
         self, table_name, fields, primary_key_field, primary_key_value
     ):
         try:
-            sqla_columns = {}
-            for field_name, field_type in fields.items():
-                sqla_columns[field_name] = sqla.Column(field_name)
-
-            metadata = sqla.MetaData()
-            table = sqla.Table(table_name, metadata, *sqla_columns.values())
-
+            table = self.get_table(table_name, fields)
             delete_stmt = table.delete().where(
                 table.c[primary_key_field] == primary_key_value
             )
 
-            result = await self.database.execute(delete_stmt)
+            result = await self.database.execute(self.cached(delete_stmt))
             return {"values": result, "error": None}
 
         except Exception as e:
@@ -419,10 +638,24 @@ class SqlAlchemyBridge(DataBridge):
             ):
                 raise RuntimeError("Group_by must contain a unique list of fields.")
             for group_by_field in group_by_fields:
-                if group_by_field not in all_valid_fields:
+                bucket = swc.parse_date_bucket(group_by_field)
+                if group_by_field in all_valid_fields or bucket is None:
+                    if group_by_field not in all_valid_fields:
+                        raise RuntimeError(
+                            f"Group_by field: {group_by_field} is not a valid field."
+                        )
+                    continue
+                unit, field = bucket
+                if field not in all_valid_fields:
+                    raise RuntimeError(f"Group_by field: {field} is not a valid field.")
+                if dataset_metadata[field] != "datetime":
                     raise RuntimeError(
-                        f"Group_by field: {group_by_field} is not a valid field."
+                        f"Group_by field: {field} is not a datetime and can not be "
+                        f"bucketed by {unit.value}."
                     )
+                # Date buckets are grouped on like fields, as the date of the
+                # first day of each period.
+                dataset_metadata[group_by_field] = "date"
 
             aggregators = group_by.get("aggregators")
             if aggregators is None or not isinstance(aggregators, dict):
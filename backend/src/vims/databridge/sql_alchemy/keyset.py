@@ -0,0 +1,140 @@
+#  Copyright (c) 2013-2025. The Johns Hopkins University Applied Physics Laboratory LLC
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# NO WARRANTY.   THIS MATERIAL IS PROVIDED "AS IS."  JHU/APL DISCLAIMS ALL
+# WARRANTIES IN THE MATERIAL, WHETHER EXPRESS OR IMPLIED, INCLUDING (BUT NOT
+# LIMITED TO) ANY AND ALL IMPLIED WARRANTIES OF PERFORMANCE,
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF
+# INTELLECTUAL PROPERTY RIGHTS. ANY USER OF THE MATERIAL ASSUMES THE ENTIRE
+# RISK AND LIABILITY FOR USING THE MATERIAL.  IN NO EVENT SHALL JHU/APL BE
+# LIABLE TO ANY USER OF THE MATERIAL FOR ANY ACTUAL, INDIRECT,
+# CONSEQUENTIAL, SPECIAL OR OTHER DAMAGES ARISING FROM THE USE OF, OR
+# INABILITY TO USE, THE MATERIAL, INCLUDING, BUT NOT LIMITED TO, ANY DAMAGES
+# FOR LOST PROFITS.
+
+from typing import Any, Dict, List, Tuple
+
+import base64
+import binascii
+import json
+
+import sqlalchemy as sqla
+
+from vims.util import InvalidTypeCast, cast, serialize_json
+
+# Dialects sorting NULL above every other value, last in ascending order and
+# first in descending order. The others sort it below every other value.
+NULLS_HIGH_DIALECTS = ("postgresql",)
+
+# The cursor asking for the first page of a query paged with cursors. Queries
+# without a cursor keep their order and are paged by offset.
+FIRST_PAGE = ""
+
+
+class Keyset:
+    """
+    Keyset pagination of a query ordered by its order_by fields and then by
+    the dataset's primary key. Each page ends with an opaque cursor holding
+    the sort values of its last row. The next page selects the rows sorted
+    after those values, so the database seeks to them through an index
+    instead of reading and discarding the rows of every previous page.
+
+    A cursor whose sort values include NULL can not be sought past reliably.
+    Such a cursor falls back to the offset of the row it stands for.
+    """
+
+    def __init__(
+        self,
+        keys: List[Tuple[str, Any, bool]],
+        field_types: Dict[str, str],
+        primary_key_field: str,
+        limit: int,
+        digest: str,
+        nulls_high: bool = False,
+    ):
+        # (field name, column, descending) of every sort key in order.
+        self.keys = keys
+        self.field_types = field_types
+        self.primary_key_field = primary_key_field
+        self.limit = limit
+        self.digest = digest
+        self.nulls_high = nulls_high
+
+    def order_by(self):
+        return [
+            column.desc() if descending else column.asc()
+            for _, column, descending in self.keys
+        ]
+
+    def after(self, values: List[Any]):
+        """
+        Where clause selecting the rows sorted after the given sort values.
+        """
+        clauses = []
+        for i, (field_name, column, descending) in enumerate(self.keys):
+            value = values[i]
+            after = column < value if descending else column > value
+            # NULLs sort after every value on one side of the order.
+            if descending != self.nulls_high and field_name != self.primary_key_field:
+                after = sqla.or_(after, column.is_(None))
+            equal = [c == v for (_, c, _), v in zip(self.keys[:i], values)]
+            clauses.append(sqla.and_(*equal, after))
+        return sqla.or_(*clauses)
+
+    def page(self, q, cursor: str):
+        """
+        Returns the statement selecting the page that starts at the cursor
+        and the offset of its first row.
+        """
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            digest, values, offset = payload["q"], payload["v"], payload["o"]
+        except (binascii.Error, UnicodeError, ValueError, TypeError, KeyError):
+            raise RuntimeError("Invalid cursor.")
+        if (
+            digest != self.digest
+            or not isinstance(values, list)
+            or len(values) != len(self.keys)
+            or not isinstance(offset, int)
+            or offset < 0
+        ):
+            raise RuntimeError("Cursor does not belong to this query.")
+
+        if any(v is None for v in values):
+            return q.offset(offset), offset
+        try:
+            values = [
+                self.cast_value(v, self.field_types.get(f))
+                for v, (f, _, _) in zip(values, self.keys)
+            ]
+        except ValueError:
+            raise RuntimeError("Invalid cursor.")
+        return q.where(self.after(values)), offset
+
+    def next_cursor(self, rows: List[Dict[str, Any]], offset: int):
+        """
+        Returns the cursor of the page after the given rows, or None when they
+        were the last page.
+        """
+        if len(rows) < self.limit:
+            return None
+        payload = {
+            "q": self.digest,
+            "v": [rows[-1][f] for f, _, _ in self.keys],
+            "o": offset + len(rows),
+        }
+        encoded = json.dumps(payload, default=serialize_json)
+        return base64.urlsafe_b64encode(encoded.encode("ascii")).decode("ascii")
+
+    @staticmethod
+    def cast_value(value: Any, field_type: str | None):
+        try:
+            return cast(value, field_type)
+        except InvalidTypeCast:
+            return value
@@ -202,6 +202,8 @@ class VimsBridge(DataBridge):
                 "transformations": query_args["transformations"],
                 "count_fields": query_args["count_fields"],
                 "distinct_field": query_args["distinct_field"],
+                "with_total": query_args.get("with_total", "exact"),
+                "cursor": query_args.get("cursor"),
             }
 
             try:
@@ -0,0 +1,57 @@
+#  Copyright (c) 2013-2025. The Johns Hopkins University Applied Physics Laboratory LLC
+#
+#
+# This material may be used, modified, or reproduced by or for the U.S.
+# Government pursuant to the rights granted under the clauses at
+# DFARS 252.227-7013/7014 or FAR 52.227-14.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# NO WARRANTY.   THIS MATERIAL IS PROVIDED "AS IS."  JHU/APL DISCLAIMS ALL
+# WARRANTIES IN THE MATERIAL, WHETHER EXPRESS OR IMPLIED, INCLUDING (BUT NOT
+# LIMITED TO) ANY AND ALL IMPLIED WARRANTIES OF PERFORMANCE,
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF
+# INTELLECTUAL PROPERTY RIGHTS. ANY USER OF THE MATERIAL ASSUMES THE ENTIRE
+# RISK AND LIABILITY FOR USING THE MATERIAL.  IN NO EVENT SHALL JHU/APL BE
+# LIABLE TO ANY USER OF THE MATERIAL FOR ANY ACTUAL, INDIRECT,
+# CONSEQUENTIAL, SPECIAL OR OTHER DAMAGES ARISING FROM THE USE OF, OR
+# INABILITY TO USE, THE MATERIAL, INCLUDING, BUT NOT LIMITED TO, ANY DAMAGES
+# FOR LOST PROFITS.
+
+import numpy as np
+import pytest
+
+from vims.bench import (
+    DETECTORS,
+    compare,
+    expected_counts,
+    run_benchmark,
+    synthetic_series,
+)
+
+
+@pytest.mark.parametrize("kind", ["poisson", "seasonal"])
+def test_bench__synthetic_series__outbreak(kind):
+    series, start = synthetic_series(
+        kind, 400, seed=1, outbreak_length=14, outbreak_size=3
+    )
+
+    assert len(series) == 400
+    assert 400 * 2 // 3 <= start <= 400 - 14
+    counts = np.array([0 if x is None else x for x in series], dtype=float)
+    level = expected_counts(kind, 400, 20)
+    assert counts[start + 5 : start + 9].sum() > 2 * level[start + 5 : start + 9].sum()
+
+
+def test_bench__run_benchmark__compare():
+    results = run_benchmark([60], series=["poisson"], repeat=1)
+
+    assert [r["detector"] for r in results["results"]] == list(DETECTORS.keys())
+    assert all(r["min"] > 0 and r["length"] == 60 for r in results["results"])
+
+    ratios = compare(results, results)
+    assert [r["ratio"] for r in ratios] == [1.0] * len(DETECTORS)
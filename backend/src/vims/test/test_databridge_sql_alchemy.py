@@ -18,21 +18,36 @@
 # INABILITY TO USE, THE MATERIAL, INCLUDING, BUT NOT LIMITED TO, ANY DAMAGES
 # FOR LOST PROFITS.
 
+import collections
 import datetime
 import json
 import os
+import sqlite3
 import sys
 
 import pytest
+import sqlalchemy as sqla
 
 from cryptography.fernet import MultiFernet
+from databases.backends.asyncmy import AsyncMyBackend
+from databases.backends.postgres import PostgresBackend
+from databases.backends.sqlite import SQLiteBackend
+from sqlalchemy.dialects import postgresql
 
 from vims.app.config import config
+from vims.app.dataset import ndjson_rows
 from vims.app.settings import Settings
 from vims.core import Dependency
 from vims.databridge import DataBridgeType
-from vims.databridge.sql_alchemy import SqlAlchemyBridge
-from vims.util import cast
+from vims.databridge.sql_alchemy import (
+    CachedCompiled,
+    CachedStatement,
+    Explain,
+    SqlAlchemyBridge,
+    StatementCache,
+)
+from vims.databridge.sql_alchemy.keyset import FIRST_PAGE
+from vims.util import AgeUnitEnum, cast
 
 pytestmark = pytest.mark.anyio
 
@@ -1799,6 +1814,485 @@ async def test_databridge_sql_alchemy__command__query__malformed(
     assert result["error"] == error
 
 
+@pytest.mark.parametrize(
+    "token,dataset_name,dataset_metadata",
+    [
+        (PANET_TOKEN, "ACDC", PANET_TABLES["ACDC"]),
+        (SFPD_INCIDENTS_TOKEN, "incidents", SFPD_INCIDENTS_TABLES["incidents"]),
+    ],
+)
+async def test_databridge_sql_alchemy__command__stream(
+    databridges, token, dataset_name, dataset_metadata
+):
+    query_args = {
+        "dataset": {"name": dataset_name, "fields": dataset_metadata},
+        "limit": 200,
+    }
+    result = await databridges[token].query(query_args)
+    rows = [row async for row in await databridges[token].stream(query_args)]
+    assert rows == result["values"]
+
+
+@pytest.fixture
+async def sqlite_databridge(tmp_path):
+    path = tmp_path / "cases.db"
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE cases (id integer, site text, Edad float)")
+        connection.executemany(
+            "INSERT INTO cases VALUES (?, ?, ?)",
+            [(i, f"site{i % 7}", i % 90 + (0.5 if i % 3 else 0)) for i in range(2500)],
+        )
+        connection.execute("CREATE TABLE visits (id integer, reported text, site text)")
+        connection.executemany(
+            "INSERT INTO visits VALUES (?, ?, ?)",
+            [(i, f"{reported} 0{i % 10}:30:00", site) for i, reported, site in VISITS],
+        )
+    databridge = SqlAlchemyBridge(
+        url=f"sqlite:///{path}", datasource_type=DataBridgeType.SQL_ALCHEMY
+    )
+    await databridge.connect()
+    yield databridge
+    await databridge.disconnect()
+
+
+VISITS = [
+    (i, datetime.date(2020, 12, 20) + datetime.timedelta(days=i * 7 % 400), f"s{i % 2}")
+    for i in range(1000)
+]
+SQLITE_VISITS = {
+    "name": "visits",
+    "fields": {"id": "int", "reported": "datetime", "site": "str"},
+}
+
+SQLITE_CASES = {
+    "name": "cases",
+    "fields": {"id": "int", "site": "str", "Edad": "float"},
+}
+
+
+async def test_databridge_sql_alchemy__command__stream__sqlite(sqlite_databridge):
+    query_args = {"dataset": SQLITE_CASES, "order_by": [["id", "asc"]]}
+    result = await sqlite_databridge.query(query_args)
+    stream = await sqlite_databridge.stream(query_args)
+    rows = [row async for row in stream]
+    assert len(rows) == result["total"] == 2500
+    assert rows == result["values"]
+
+    with pytest.raises(RuntimeError, match="not an available field"):
+        await sqlite_databridge.stream({**query_args, "order_by": [["nope", "asc"]]})
+
+    chunks = [
+        chunk async for chunk in ndjson_rows(await sqlite_databridge.stream(query_args))
+    ]
+    lines = "".join(chunks).splitlines()
+    assert len(chunks) == 3 and len(lines) == 2500
+    # ages are written in the units best suited to them, as in the JSON response
+    assert [json.loads(line)["Edad"] for line in lines[:4]] == [
+        0.0,
+        "18" + AgeUnitEnum.MONTHS,
+        "30" + AgeUnitEnum.MONTHS,
+        "3" + AgeUnitEnum.YEARS,
+    ]
+
+
+@pytest.mark.parametrize(
+    "with_total,total",
+    [(None, 2500), ("exact", 2500), ("estimate", 2500), ("off", None)],
+)
+async def test_databridge_sql_alchemy__command__query__with_total__sqlite(
+    sqlite_databridge, with_total, total
+):
+    query_args = {
+        "dataset": SQLITE_CASES,
+        "order_by": [["id", "desc"]],
+        "limit": 10,
+        "offset": 5,
+        "with_total": with_total,
+    }
+    result = await sqlite_databridge.query(query_args)
+    assert result["error"] is None
+    # sqlite has no planner estimate, so it counts exactly
+    assert result["total"] == total
+    assert [row["id"] for row in result["values"]] == list(range(2494, 2484, -1))
+
+
+async def test_databridge_sql_alchemy__command__query__with_total__invalid(
+    sqlite_databridge,
+):
+    result = await sqlite_databridge.query(
+        {"dataset": SQLITE_CASES, "with_total": "sometimes"}
+    )
+    assert result == {
+        "values": [],
+        "total": -1,
+        "error": "with_total must be one of: exact, estimate, off.",
+    }
+
+
+async def test_databridge_sql_alchemy__command__query__statement_cache__sqlite(
+    sqlite_databridge,
+):
+    cache = sqlite_databridge.statement_cache
+
+    async def ids(request, limit):
+        result = await sqlite_databridge.query(
+            {
+                "dataset": SQLITE_CASES,
+                "request": request,
+                "order_by": [["id", "asc"]],
+                "limit": limit,
+            }
+        )
+        assert result["error"] is None
+        return [row["id"] for row in result["values"]], result["total"]
+
+    assert await ids({"id": {"$ge": 2490}}, 3) == ([2490, 2491, 2492], 10)
+    misses = cache.misses
+    # the same query with other values reuses the compiled statements
+    assert await ids({"id": {"$ge": 2495}}, 2) == ([2495, 2496], 5)
+    assert await ids({"site": {"$eq": "site3"}}, 2) == ([3, 10], 357)
+    assert await ids({"site": {"$eq": "site4"}}, 2) == ([4, 11], 357)
+    assert cache.misses == misses + 2 and cache.hits >= 3
+
+    # IN lists are compiled for their length every time
+    hits = cache.hits
+    assert await ids({"site": {"$in": ["site1"]}}, 2) == ([1, 8], 357)
+    assert await ids({"site": {"$in": ["site1", "site2"]}}, 2) == ([1, 2], 714)
+    assert cache.hits == hits
+
+    cache.max_size = 0
+    assert await ids({"id": {"$ge": 2498}}, 5) == ([2498, 2499], 2)
+    assert cache.hits == hits
+
+
+@pytest.mark.parametrize(
+    "backend",
+    [
+        PostgresBackend("postgresql://localhost/vims"),
+        AsyncMyBackend("mysql+asyncmy://localhost/vims"),
+        SQLiteBackend("sqlite:///vims.db"),
+    ],
+)
+def test_databridge_sql_alchemy__statement_cache__databases_backends(backend):
+    # CachedCompiled stands in for the compiled statements that the databases
+    # backends read, so a statement compiled from the cache must give them the
+    # same query, args and result columns as the statement itself.
+    connection = backend.connection()
+    table = sqla.Table(
+        "cases",
+        sqla.MetaData(),
+        sqla.Column("id", sqla.Integer),
+        sqla.Column("site", sqla.String),
+        sqla.Column("day", sqla.Date),
+    )
+
+    def statement(site, day, limit):
+        return (
+            sqla.select(table.c.id, table.c.site)
+            .where(table.c.site == site, table.c.day >= day)
+            .order_by(table.c.id)
+            .limit(limit)
+        )
+
+    cache = StatementCache()
+    connection._compile(
+        CachedStatement(statement("a", datetime.date(2024, 1, 1), 5), cache)
+    )
+    q = statement("b", datetime.date(2024, 2, 1), 7)
+    cached = CachedStatement(q, cache).compile(
+        connection._dialect, {"render_postcompile": True}
+    )
+    assert isinstance(cached, CachedCompiled)
+
+    actual = connection._compile(CachedStatement(q, cache))
+    expected = connection._compile(q)
+    assert cache.hits == 2
+    assert actual[:3] == expected[:3]
+    # the args are those of the statement run, not of the one compiled
+    args = actual[1].values() if isinstance(actual[1], dict) else actual[1]
+    assert "b" in args and 7 in args
+    if len(expected) > 3:
+        assert (
+            actual[3].context.result_column_struct
+            == expected[3].context.result_column_struct
+        )
+
+
+async def test_databridge_sql_alchemy__command__records__sqlite(sqlite_databridge):
+    fields = SQLITE_CASES["fields"]
+    table = sqlite_databridge.get_table("cases", fields)
+    assert sqlite_databridge.get_table("cases", dict(reversed(fields.items()))) is table
+    assert sqlite_databridge.get_table("cases", {"id": "int"}) is not table
+
+    for i in (3000, 3001):
+        result = await sqlite_databridge.create_record(
+            "cases", fields, {"id": i, "site": "new", "Edad": 1}
+        )
+        assert result["error"] is None
+        assert await sqlite_databridge.record_exists("cases", fields, "id", i)
+
+    result = await sqlite_databridge.update_record(
+        "cases", fields, {"id": 3001, "site": "moved"}, "id", 3001
+    )
+    assert result["error"] is None
+    result = await sqlite_databridge.delete_record("cases", fields, "id", 3000)
+    assert result["error"] is None
+    assert not await sqlite_databridge.record_exists("cases", fields, "id", 3000)
+
+    result = await sqlite_databridge.query(
+        {"dataset": SQLITE_CASES, "request": {"site": {"$ne": "site0"}}, "limit": 1}
+    )
+    assert result["total"] == 2500 - 358 + 1
+    result = await sqlite_databridge.query(
+        {"dataset": SQLITE_CASES, "request": {"id": {"$eq": 3001}}}
+    )
+    assert result["values"] == [{"id": 3001, "site": "moved", "Edad": 1.0}]
+
+
+SQLITE_CASES_KEYED = {**SQLITE_CASES, "primary_key_field": "id"}
+
+
+async def page_ids(databridge, query_args):
+    ids, cursor, pages = [], FIRST_PAGE, 0
+    while True:
+        result = await databridge.query({**query_args, "cursor": cursor})
+        assert result["error"] is None
+        ids += [row["id"] for row in result["values"]]
+        cursor, pages = result["next_cursor"], pages + 1
+        if cursor is None:
+            return ids, pages
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+async def test_databridge_sql_alchemy__command__query__cursor__sqlite(
+    sqlite_databridge, order
+):
+    fields = SQLITE_CASES["fields"]
+    for i in range(3000, 3010):
+        await sqlite_databridge.create_record(
+            "cases", fields, {"id": i, "site": None, "Edad": 1}
+        )
+    sites = {i: f"site{i % 7}" for i in range(2500)}
+    sites.update({i: None for i in range(3000, 3010)})
+
+    # sqlite sorts NULL first, ties are broken by the primary key
+    def sort_key(i):
+        if order == "asc":
+            return (sites[i] is not None, sites[i] or "", i)
+        return (sites[i] is None, [-ord(c) for c in sites[i] or ""], i)
+
+    query_args = {
+        "dataset": SQLITE_CASES_KEYED,
+        "order_by": [["site", order]],
+        "limit": 7,
+        "with_total": "off",
+    }
+    ids, pages = await page_ids(sqlite_databridge, query_args)
+    assert ids == sorted(sites, key=sort_key)
+    assert pages == 2510 // 7 + 1
+
+    # pages after a cursor seek instead of skipping rows
+    cursor = FIRST_PAGE
+    for _ in range(3):
+        result = await sqlite_databridge.query({**query_args, "cursor": cursor})
+        cursor = result["next_cursor"]
+    q, keyset = sqlite_databridge.build_query({**query_args, "cursor": cursor})
+    page, offset = keyset.page(q, cursor)
+    assert offset == 21 and page._offset_clause is None
+    assert [row["id"] for row in result["values"]] == ids[14:21]
+
+
+async def test_databridge_sql_alchemy__command__query__cursor__errors(
+    sqlite_databridge,
+):
+    query_args = {"dataset": SQLITE_CASES_KEYED, "limit": 10}
+    result = await sqlite_databridge.query({**query_args, "cursor": FIRST_PAGE})
+    cursor = result["next_cursor"]
+    assert [row["id"] for row in result["values"]] == list(range(10))
+    result = await sqlite_databridge.query({**query_args, "cursor": cursor})
+    assert [row["id"] for row in result["values"]] == list(range(10, 20))
+    assert result["total"] == 2500
+
+    for args, error in [
+        ({"cursor": cursor, "offset": 10}, "Offset can not be used with a cursor."),
+        (
+            {"cursor": FIRST_PAGE, "offset": 10},
+            "Offset can not be used with a cursor.",
+        ),
+        ({"cursor": "not a cursor"}, "Invalid cursor."),
+        (
+            {"cursor": cursor, "request": {"site": {"$eq": "site1"}}},
+            "Cursor does not belong to this query.",
+        ),
+        (
+            {"cursor": cursor, "projection": {"site": True}},
+            "A cursor can only page through a query with a limit that selects the "
+            "dataset's primary key, without group_by, count_fields or "
+            "distinct_field.",
+        ),
+    ]:
+        result = await sqlite_databridge.query({**query_args, **args})
+        assert result["error"] == error
+
+    # queries that can not be paged with cursors return no next cursor
+    result = await sqlite_databridge.query({"dataset": SQLITE_CASES, "limit": 10})
+    assert "next_cursor" not in result
+
+
+async def test_databridge_sql_alchemy__command__query__no_cursor_keeps_order(
+    sqlite_databridge,
+):
+    # without a cursor a limited query that selects the primary key is sorted
+    # only as asked and paged by offset
+    query_args = {
+        "dataset": SQLITE_CASES_KEYED,
+        "order_by": [["site", "desc"]],
+        "limit": 10,
+        "offset": 20,
+    }
+    q, keyset = sqlite_databridge.build_query(query_args)
+    assert keyset is None
+    order_by = str(q).split("ORDER BY")[1]
+    assert "site DESC" in order_by and "id" not in order_by
+
+    result = await sqlite_databridge.query(query_args)
+    assert result["error"] is None and "next_cursor" not in result
+    assert len(result["values"]) == 10
+    assert {row["site"] for row in result["values"]} == {"site6"}
+
+
+def test_databridge_sql_alchemy__keyset__nulls():
+    def after(nulls_high, order):
+        bridge = SqlAlchemyBridge(url="sqlite:///:memory:")
+        _, keyset = bridge.build_query(
+            {
+                "dataset": SQLITE_CASES_KEYED,
+                "order_by": [["site", order]],
+                "limit": 5,
+                "cursor": FIRST_PAGE,
+            }
+        )
+        keyset.nulls_high = nulls_high
+        return str(keyset.after(["site1", 5]))
+
+    # only the side of the order where NULLs sort after every value reads them
+    assert "IS NULL" in after(True, "asc") and "IS NULL" not in after(True, "desc")
+    assert "IS NULL" in after(False, "desc") and "IS NULL" not in after(False, "asc")
+
+
+@pytest.mark.parametrize(
+    "unit,period_start",
+    [
+        ("day", lambda d: d),
+        ("week", lambda d: d - datetime.timedelta(days=d.weekday())),
+        ("month", lambda d: d.replace(day=1)),
+        ("year", lambda d: d.replace(month=1, day=1)),
+        ("epiweek", lambda d: d - datetime.timedelta(days=(d.weekday() + 1) % 7)),
+    ],
+)
+async def test_databridge_sql_alchemy__command__query__date_bucket__sqlite(
+    sqlite_databridge, unit, period_start
+):
+    bucket = f"{unit}(reported)"
+    result = await sqlite_databridge.query(
+        {
+            "dataset": SQLITE_VISITS,
+            "group_by": {
+                "fields": [bucket, "site"],
+                "aggregators": {"visits": {"function": "count"}},
+            },
+            "order_by": [[bucket, "asc"], ["site", "asc"]],
+        }
+    )
+    assert result["error"] is None
+    expected = collections.Counter(
+        (period_start(reported), site) for _, reported, site in VISITS
+    )
+    assert [
+        ((row[bucket]), row["site"], row["visits"]) for row in result["values"]
+    ] == [(start, site, count) for (start, site), count in sorted(expected.items())]
+    assert result["total"] == len(expected)
+
+
+async def test_databridge_sql_alchemy__command__query__date_bucket__where_sqlite(
+    sqlite_databridge,
+):
+    february = [i for i, reported, _ in VISITS if reported.month == 2]
+    result = await sqlite_databridge.query(
+        {
+            "dataset": SQLITE_VISITS,
+            "request": {"$and": [{"month(reported)": {"$eq": "2021-02-01"}}]},
+            "order_by": [["id", "asc"]],
+        }
+    )
+    assert result["error"] is None
+    assert [row["id"] for row in result["values"]] == february
+
+    # buckets can be filtered on after grouping as well
+    result = await sqlite_databridge.query(
+        {
+            "dataset": SQLITE_VISITS,
+            "group_by": {
+                "fields": ["epiweek(reported)"],
+                "aggregators": {"visits": {"function": "count"}},
+            },
+            "having": {"$and": [{"epiweek(reported)": {"$lt": "2021-01-01"}}]},
+            "order_by": [["epiweek(reported)", "asc"]],
+        }
+    )
+    week = datetime.timedelta(days=7)
+    assert result["values"] == [
+        {
+            "epiweek(reported)": start,
+            "visits": sum(
+                start <= reported < start + week for _, reported, _ in VISITS
+            ),
+        }
+        for start in [datetime.date(2020, 12, 20), datetime.date(2020, 12, 27)]
+    ]
+
+    for group_by_field, error in [
+        ("month(site)", "site is not a datetime and can not be bucketed by month."),
+        ("month(nope)", "Group_by field: nope is not a valid field."),
+        ("fortnight(reported)", "fortnight(reported) is not a valid field."),
+    ]:
+        result = await sqlite_databridge.query(
+            {
+                "dataset": SQLITE_VISITS,
+                "group_by": {
+                    "fields": [group_by_field],
+                    "aggregators": {"visits": {"function": "count"}},
+                },
+            }
+        )
+        assert error in result["error"]
+
+
+def test_databridge_sql_alchemy__explain():
+    column = sqla.Column("id")
+    sqla.Table("cases", sqla.MetaData(), column)
+    q = sqla.select(column).where(column > 5)
+    compiled = Explain(q).compile(dialect=postgresql.dialect())
+    assert str(compiled).startswith("EXPLAIN (FORMAT JSON) SELECT cases.id")
+    assert compiled.params == {"id_1": 5}
+
+
+@pytest.mark.parametrize("token", [PANET_TOKEN, SFPD_INCIDENTS_TOKEN])
+async def test_databridge_sql_alchemy__command__query__with_total__estimate(
+    databridges, token
+):
+    tables = PANET_TABLES if token == PANET_TOKEN else SFPD_INCIDENTS_TABLES
+    dataset_name = next(iter(tables))
+    query_args = {
+        "dataset": {"name": dataset_name, "fields": tables[dataset_name]},
+        "limit": 10,
+        "with_total": "estimate",
+    }
+    result = await databridges[token].query(query_args)
+    assert result["error"] is None
+    assert isinstance(result["total"], int) and result["total"] >= 0
+
+
 async def base_query(
     databridge,
     dataset_name,
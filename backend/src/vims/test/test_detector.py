@@ -0,0 +1,1161 @@
+#  Copyright (c) 2013-2025. The Johns Hopkins University Applied Physics Laboratory LLC
+#
+#
+# This material may be used, modified, or reproduced by or for the U.S.
+# Government pursuant to the rights granted under the clauses at
+# DFARS 252.227-7013/7014 or FAR 52.227-14.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# NO WARRANTY.   THIS MATERIAL IS PROVIDED "AS IS."  JHU/APL DISCLAIMS ALL
+# WARRANTIES IN THE MATERIAL, WHETHER EXPRESS OR IMPLIED, INCLUDING (BUT NOT
+# LIMITED TO) ANY AND ALL IMPLIED WARRANTIES OF PERFORMANCE,
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF
+# INTELLECTUAL PROPERTY RIGHTS. ANY USER OF THE MATERIAL ASSUMES THE ENTIRE
+# RISK AND LIABILITY FOR USING THE MATERIAL.  IN NO EVENT SHALL JHU/APL BE
+# LIABLE TO ANY USER OF THE MATERIAL FOR ANY ACTUAL, INDIRECT,
+# CONSEQUENTIAL, SPECIAL OR OTHER DAMAGES ARISING FROM THE USE OF, OR
+# INABILITY TO USE, THE MATERIAL, INCLUDING, BUT NOT LIMITED TO, ANY DAMAGES
+# FOR LOST PROFITS.
+
+from types import SimpleNamespace
+
+import asyncio
+import json
+import math
+import subprocess
+import sys
+import threading
+
+from collections import OrderedDict
+from datetime import date, datetime
+
+import numpy as np
+import pyarrow
+import pyarrow.ipc
+import pytest
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from vims.app.auth import get_current_user
+from vims.app.detector import CusumSagesDetector, Regression, detector, payload
+from vims.app.detector.alerts import alert_rows
+from vims.app.detector.cache import DetectorCache
+from vims.app.detector.CusumSagesDetector import calculateCUSUM
+from vims.app.detector.Ears import (
+    calculateC1,
+    calculateC1C2C3,
+    calculateC2,
+    calculateC3,
+    calculateEARS,
+    data,
+    data2,
+)
+from vims.app.detector.EWMA import calculateEWMA, ewmaCoefficients
+from vims.app.detector.executor import DetectorExecutor, DetectorQueueFull
+from vims.app.detector.Regression import calculateRegression, calculateRegressionBatch
+from vims.app.detector.runner import (
+    PARAMS_MODELS,
+    Algorithm,
+    DetectorJobError,
+    find_alerts,
+    model_params,
+    run_batch,
+    run_detector,
+    run_sweep,
+)
+from vims.app.detector.series import dense_series, pivot_series
+from vims.app.detector.sweep import SWEEP_COUNT, run_dataset_sweep, sweep_query
+from vims.app.detector.tuning import parse_grid, run_tuning, warm_tables
+from vims.app.detector.util import (
+    BaselineWindows,
+    FilterBaselineZeros3,
+    Kernels,
+    TDistribution,
+)
+from vims.app.model import AlertSweep
+from vims.core import Config, Dependency, Reference
+
+
+def synthetic_series(seed, length):
+    # Poisson counts with missing days and an injected run of zeros, which
+    # exercises both the None handling and the baseline zero filter.
+    rng = np.random.default_rng(seed)
+    series = rng.poisson(rng.choice([0.5, 3, 25]), length).astype(object)
+    series[rng.random(length) < 0.05] = None
+    start = int(rng.integers(0, length - 10))
+    series[start : start + int(rng.integers(3, 10))] = 0
+    return list(series)
+
+
+def assert_series_close(actual, expected):
+    assert len(actual) == len(expected)
+    for a, e in zip(actual, expected):
+        if e is None:
+            assert a is None
+        else:
+            assert a == pytest.approx(e, rel=1e-9, abs=1e-12)
+
+
+def reference_filter_baseline_zeros(data):
+    # The original filterBaselineZeros, kept as it was to check the run-length
+    # encoded version against.
+
+    dt = data[:]
+
+    testData = []
+    ndxOK = []
+    ndxStart = []
+    ndxEnd = []
+    numZerosTest = []
+    minNumZeros = 3
+    dtOut = []
+    thresholdProb = 0.01
+
+    testData = dt[:]
+    testData.insert(0, 1)
+
+    for i in range(len(testData) - 1):
+        if testData[i] != 0 and testData[i + 1] == 0:
+            ndxStart.append(i)
+
+    testData = dt[:]
+    testData.append(1)
+
+    for i in range(len(testData) - 1):
+        if testData[i] == 0 and testData[i + 1] != 0:
+            ndxEnd.append(i)
+
+    w = 0
+
+    for i in range(len(ndxStart)):
+        numZerosTest.append([(ndxEnd[i] - ndxStart[i] + 1), i])
+
+    numZerosTest.sort(reverse=True)
+
+    for i in range(len(dt)):
+        ndxOK.append(i)
+
+    ndxtemp = ndxOK[:]
+
+    for i in range(len(numZerosTest)):
+        ndxtemp = ndxOK[:]
+        key = numZerosTest[i][1]
+        val = numZerosTest[i][0]
+        k = 0
+
+        if val < minNumZeros:
+            continue
+
+        if i == 0:
+            k = ndxStart[key]
+
+        elif ndxStart[key] > k:
+            for w in range(len(ndxtemp) + 1):
+                if ndxtemp[w] == ndxStart[key]:
+                    break
+            k = w
+        else:
+            for w in range(len(ndxtemp) + 1):
+                if ndxtemp[w] == ndxStart[key]:
+                    break
+            k = w
+
+        for j in range(ndxStart[key], ndxEnd[key] + 1, 1):
+            del ndxtemp[k]
+
+        NumValuesOut = len(ndxOK) - ndxEnd[key] + ndxStart[key] - 1
+
+        if NumValuesOut == 0:
+            break
+        dtOut = [dt[i] for i in ndxtemp]
+        nsum = 0
+        for p in range(len(dtOut)):
+            if dtOut[p] == 0:
+                nsum += 1
+        numZerosOut = max(1, nsum)
+
+        if (numZerosOut / NumValuesOut) ** val > thresholdProb:
+            break
+
+        ndxOK = ndxtemp[:]
+
+    dtOut = [dt[i] for i in ndxOK]
+    nsum = 0
+    for h in range(len(dtOut)):
+        if dtOut[h] > 0:
+            nsum += 1
+    if nsum < 2:
+        ndxOK = [0]
+
+    return ndxOK
+
+
+def random_baseline(rng):
+    # Short baselines built from runs of zeros and positive counts, so that
+    # ties between run lengths and all-zero baselines come up often.
+    runs = []
+    for _ in range(int(rng.integers(0, 12))):
+        if rng.random() < 0.5:
+            runs += [0] * int(rng.integers(1, 12))
+        else:
+            runs += list(rng.poisson(rng.choice([0.3, 2, 10]), int(rng.integers(1, 8))))
+    return [float(v) if rng.random() < 0.5 else int(v) for v in runs]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_detector__filter_baseline_zeros__matches_reference(seed):
+    rng = np.random.default_rng(seed)
+    for _ in range(500):
+        baseline = random_baseline(rng)
+        assert FilterBaselineZeros3.filterBaselineZeros(
+            baseline
+        ) == reference_filter_baseline_zeros(baseline)
+
+
+@pytest.mark.parametrize(
+    "series",
+    [data, data2] + [synthetic_series(seed, 150) for seed in range(20)],
+)
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"MAX_BASELINE_LEN": 7, "NUM_GUARDBAND": 0},
+        {"REMOVE_ZEROES": False, "OMEGA": 0.2},
+    ],
+)
+def test_detector__ewma__numpy_matches_loop(series, kwargs):
+    [loop_pvalues, loop_expected] = calculateEWMA(series, USE_NUMPY=False, **kwargs)
+    [pvalues, expected] = calculateEWMA(series, **kwargs)
+
+    assert_series_close(pvalues, loop_pvalues)
+    assert_series_close(expected, loop_expected)
+
+
+@pytest.mark.parametrize(
+    "series",
+    [data, data2, [], [1, 2, 3]]
+    + [synthetic_series(seed, 150) for seed in range(20)]
+    + [list(np.random.default_rng(0).gamma(2, 3.3, 150))],
+)
+@pytest.mark.parametrize(
+    "params",
+    [
+        (0.5, 28, 2, 0.5, 4),
+        (0.5, 7, 0, 0.5, 4),
+        (1, 14, 3, 0.1, 2),
+        (0.5, 1, 1, 0.5, 4),
+    ],
+)
+def test_detector__cusum__numpy_matches_loop(series, params):
+    [loop_pvalues, loop_expected] = calculateCUSUM(series, *params, USE_NUMPY=False)
+    [pvalues, expected] = calculateCUSUM(series, *params)
+
+    assert_series_close(pvalues, loop_pvalues)
+    assert_series_close(expected, loop_expected)
+
+
+@pytest.mark.parametrize(
+    "series",
+    [data, data2]
+    + [synthetic_series(seed, 150) for seed in range(20)]
+    + [list(np.random.default_rng(0).gamma(2, 3.3, 150))],
+)
+@pytest.mark.parametrize(
+    "params",
+    [
+        (7, 0, 0, 1, 0.1, 2),
+        (7, 2, 0, 1, 0.1, 2),
+        (7, 2, 1, 1, 0.1, 2),
+        (28, 3, 1, 0.5, 0.02, 1),
+        (2, 0, 1, 1, 0.5, 3),
+    ],
+)
+def test_detector__ears__numpy_matches_loop(series, params):
+    [loop_stat, loop_expected] = calculateEARS(series, *params, USE_NUMPY=False)
+    [stat, expected] = calculateEARS(series, *params)
+
+    assert_series_close(stat, loop_stat)
+    assert expected == loop_expected
+
+
+@pytest.mark.parametrize(
+    "series",
+    [data, data2, [], [3, 1, 4, 1, 5, 9, 2, 6]]
+    + [synthetic_series(seed, 150) for seed in range(5)],
+)
+def test_detector__ears__c1_c2_c3_in_one_pass(series):
+    [c1, c2, c3, expected] = calculateC1C2C3(series)
+
+    assert [c1, expected] == calculateC1(series)
+    assert [c2, expected] == calculateC2(series)
+    assert [c3, expected] == calculateC3(series)
+
+
+def reference_regression(
+    data,
+    BASELINE_LEN=28,
+    NUM_GUARDBAND=2,
+    DAY_OF_WEEK=True,
+    FIRST_WEEKDAY=0,
+    HOLIDAYS=(),
+    REMOVE_ZEROES=True,
+    MIN_DEG_FREEDOM=2,
+    MIN_SIGMA=0.5,
+    MIN_PROB_LEVEL=1e-6,
+):
+    # The original day by day regression loop, kept to check the batched
+    # version against.
+
+    cleanedData = list(map(lambda x: 0 if x is None else x, data))
+    holidays = set(HOLIDAYS)
+
+    pvalues = [None] * len(cleanedData)
+    expectedDataArray = [None] * len(cleanedData)
+
+    # loop through the days on which to make predictions
+    for j in range(BASELINE_LEN + NUM_GUARDBAND, len(cleanedData)):
+        start = j - NUM_GUARDBAND - BASELINE_LEN
+        ndxBaseline = list(range(start, start + BASELINE_LEN))
+        testBase = [cleanedData[i] for i in ndxBaseline]
+
+        if REMOVE_ZEROES and FilterBaselineZeros3.filterBaselineZerosTest(testBase):
+            ndxBaseline = [
+                ndxBaseline[i]
+                for i in FilterBaselineZeros3.filterBaselineZeros(testBase)
+            ]
+
+        baselineData = [cleanedData[i] for i in ndxBaseline]
+
+        # check the baseline period is filled with zeros; no prediction can be
+        if all(x == 0 for x in testBase):
+            continue
+
+        # the holidays in the baseline period or on the test day
+        holidayDays = np.array(
+            sorted(d for d in range(start, start + BASELINE_LEN) if d in holidays)
+            + ([j] if j in holidays else [])
+        )
+        X = Regression.regressors(
+            np.array(ndxBaseline), start, DAY_OF_WEEK, FIRST_WEEKDAY, holidayDays
+        )
+        x0 = Regression.regressors(
+            np.array([j]), start, DAY_OF_WEEK, FIRST_WEEKDAY, holidayDays
+        )[0]
+
+        beta, _, rank, _ = np.linalg.lstsq(X, np.array(baselineData), rcond=None)
+        degFreedom = len(baselineData) - rank
+        if degFreedom < MIN_DEG_FREEDOM:
+            continue
+
+        # the predicted current value of the data
+        expectedData = float(x0 @ beta)
+        expectedDataArray[j] = expectedData
+
+        # the standard error of the prediction, no smaller than MIN_SIGMA
+        residuals = np.array(baselineData) - X @ beta
+        leverage = x0 @ np.linalg.pinv(X.T @ X) @ x0
+        sigma = math.sqrt(residuals @ residuals / degFreedom * (1 + leverage))
+        sigma = max(sigma, MIN_SIGMA)
+
+        testStat = (cleanedData[j] - expectedData) / sigma
+        if abs(testStat) > Regression.MIN_TEST_STAT:
+            pvalues[j] = 1 - TDistribution.cumulativeProbability(testStat, degFreedom)
+            if pvalues[j] < MIN_PROB_LEVEL:
+                pvalues[j] = MIN_PROB_LEVEL
+
+    return [pvalues, expectedDataArray]
+
+
+@pytest.mark.parametrize(
+    "series",
+    [data, data2, [], [1, 2, 3]] + [synthetic_series(seed, 150) for seed in range(10)],
+)
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"HOLIDAYS": [10, 40, 41, 100, 149], "FIRST_WEEKDAY": 3},
+        {"DAY_OF_WEEK": False, "BASELINE_LEN": 14, "NUM_GUARDBAND": 0},
+        {"REMOVE_ZEROES": False, "HOLIDAYS": [60]},
+    ],
+)
+def test_detector__regression__numpy_matches_loop(series, kwargs):
+    [loop_pvalues, loop_expected] = reference_regression(series, **kwargs)
+    [pvalues, expected] = calculateRegression(series, **kwargs)
+
+    assert_series_close(pvalues, loop_pvalues)
+    assert_series_close(expected, loop_expected)
+
+
+def test_detector__regression__batch_matches_single_runs():
+    series = [synthetic_series(seed, 200) for seed in range(8)]
+    kwargs = {"HOLIDAYS": [30, 31, 120], "FIRST_WEEKDAY": 5}
+    [pvalues, expected] = calculateRegressionBatch(series, **kwargs)
+
+    for values, p, e in zip(series, pvalues, expected):
+        [single_p, single_e] = calculateRegression(values, **kwargs)
+        assert_series_close(p, single_p)
+        assert_series_close(e, single_e)
+
+
+def test_detector__regression__day_of_week_outbreak():
+    # Weekends are a tenth of the weekday counts; a weekend with weekday
+    # counts only stands out once the day of week is in the fit.
+    weekday = np.array([50, 50, 50, 50, 50, 5, 5] * 10, dtype=float)
+    series = (weekday + np.random.default_rng(0).normal(0, 1, 70)).round()
+    series[61] = 50
+
+    [adjusted, expected] = calculateRegression(list(series))
+    [unadjusted, _] = calculateRegression(list(series), DAY_OF_WEEK=False)
+
+    assert adjusted[61] < 1e-4 and expected[61] == pytest.approx(5, abs=2)
+    assert unadjusted[61] is None or unadjusted[61] > 0.05
+    assert max(p for p in adjusted[30:61] if p is not None) > 0.01
+
+
+@pytest.mark.skipif(not Kernels.NUMBA_AVAILABLE, reason="numba is not installed")
+@pytest.mark.parametrize("seed", range(10))
+def test_detector__kernels__numba_matches_numpy(monkeypatch, seed):
+    series = synthetic_series(seed, 200)
+    monkeypatch.setattr(Kernels, "BACKEND", "numpy")
+    ewma = calculateEWMA(series, state={})
+    cusum = calculateCUSUM(series, 0.5, 28, 2, 0.5, 4, state={})
+    Kernels.useKernels("numba")
+
+    for actual, expected in [
+        (calculateEWMA(series, state={}), ewma),
+        (calculateCUSUM(series, 0.5, 28, 2, 0.5, 4, state={}), cusum),
+    ]:
+        assert_series_close(actual[0], expected[0])
+        assert_series_close(actual[1], expected[1])
+        assert actual[2] == pytest.approx(expected[2])
+
+
+def test_detector__kernels__numba_imported_only_when_selected():
+    script = (
+        "import sys\n"
+        "from vims.app.detector.util import Kernels\n"
+        "Kernels.useKernels('numpy')\n"
+        "assert 'numba' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True)
+
+
+def kernels_backend():
+    return Kernels.BACKEND
+
+
+@pytest.mark.anyio
+async def test_detector__kernels__selected_in_workers(monkeypatch):
+    monkeypatch.setattr(Kernels, "BACKEND", "numpy")
+    with pytest.raises(ValueError):
+        Kernels.useKernels("fortran")
+
+    executor = DetectorExecutor(kind="process", pool_size=1, kernels="numba")
+    try:
+        backend = await executor.run(kernels_backend)
+    finally:
+        executor.shutdown()
+
+    # without numba installed the numpy kernels are used instead
+    expected = "numba" if Kernels.NUMBA_AVAILABLE else "numpy"
+    assert executor.kernels == Kernels.BACKEND == backend == expected
+
+
+def test_detector__cusum__lookup_table():
+    [table, minLT, maxLT] = CusumSagesDetector.loadLookupTable()
+
+    assert isinstance(table, np.memmap) and table.dtype == np.float64
+    assert np.all(np.diff(table[0]) > 0) and np.all(np.diff(table[1]) <= 0)
+    assert (minLT, maxLT) == (table[0, 0], table[0, -1])
+    assert CusumSagesDetector.lookupTable is table
+    assert CusumSagesDetector.maxLT == maxLT
+
+
+def test_detector__t_distribution__cumulative_probabilities():
+    stats = np.linspace(-6, 6, 49)
+    dfs = np.arange(1, 50)
+
+    cdf = TDistribution.cumulativeProbabilities(stats, dfs)
+
+    for x, df, p in zip(stats, dfs, cdf):
+        assert p == pytest.approx(TDistribution.cumulativeProbability(x, df))
+
+
+def test_detector__tuning__warm_tables_cover_the_workers(monkeypatch):
+    chunks = [[{"omega": 0.3}], [{"max_base_line_len": 14, "num_fit_params": 2}]]
+    first, second = warm_tables(Algorithm.ewma, chunks)
+
+    # each chunk is sent only the quantiles of its own combinations
+    assert len(first) == 2 * 27
+    assert len(second) == 2 * 12
+
+    # a worker starting from the warmed table finds every quantile in it
+    monkeypatch.setattr(TDistribution, "findInverseCumulativeProbability", pytest.fail)
+    monkeypatch.setattr(TDistribution, "QUANTILE_TABLE", OrderedDict(first))
+    ewmaCoefficients.__wrapped__(0.3, 28, 0.01, 0.05, 2, 1)
+    monkeypatch.setattr(TDistribution, "QUANTILE_TABLE", OrderedDict(second))
+    ewmaCoefficients.__wrapped__(0.4, 14, 0.01, 0.05, 2, 2)
+    assert warm_tables(Algorithm.cusum, [[{"baseline": 7}]]) == [{}]
+
+
+def test_detector__t_distribution__quantile_table():
+    TDistribution.QUANTILE_TABLE.clear()
+
+    quantiles = TDistribution.quantileTable(0.95, range(1, 29))
+
+    assert len(TDistribution.QUANTILE_TABLE) == 28
+    for df, q in zip(range(1, 29), quantiles):
+        assert TDistribution.cumulativeProbability(q, df) == pytest.approx(0.95)
+        assert TDistribution.inverseCumulativeProbability(0.95, df) == q
+        assert TDistribution.findInverseCumulativeProbability(0.95, df) == q
+
+
+def test_detector__t_distribution__quantile_table_is_bounded(monkeypatch):
+    monkeypatch.setattr(TDistribution, "QUANTILE_TABLE", OrderedDict())
+    monkeypatch.setattr(TDistribution, "QUANTILE_TABLE_SIZE", 10)
+
+    TDistribution.quantileTable(0.95, range(1, 6))
+    TDistribution.quantileTable(0.9, range(1, 11))
+    TDistribution.inverseCumulativeProbability(0.95, 5)
+
+    assert len(TDistribution.QUANTILE_TABLE) == 10
+    assert list(TDistribution.QUANTILE_TABLE)[-1] == (0.95, 5.0)
+    assert (0.95, 1.0) not in TDistribution.QUANTILE_TABLE
+
+
+def test_detector__batch__matches_single_runs():
+    jobs = [
+        {"algorithm": "ewma", "params": {"omega": 0.3}, "data": data},
+        {"algorithm": "cusum", "params": {}, "data": data2},
+        {"algorithm": "cdc3", "data": data},
+        {"algorithm": "cdc", "data": data2},
+        {"algorithm": "ewma", "params": {"omega": 0.3}, "data": data2},
+    ]
+
+    results = run_batch(jobs)
+
+    assert len(results) == len(jobs)
+    for job, result in zip(jobs, results):
+        single = run_detector(
+            Algorithm(job["algorithm"]), {**job.get("params", {}), "data": job["data"]}
+        )
+        assert result == single
+
+
+EARS_PARAMS = {
+    "baseline": 7,
+    "base_lag": 2,
+    "cusum_flag": 1,
+    "cusum_k": 1,
+    "min_sigma": 0.1,
+    "thresh": 2,
+}
+
+
+@pytest.mark.parametrize(
+    "algorithm,params,result",
+    [
+        (Algorithm.cusum, {}, "pValues"),
+        (Algorithm.ewma, {"max_base_line_len": 7}, "pValues"),
+        (Algorithm.ewma, {}, "pValues"),
+        (Algorithm.ears, EARS_PARAMS, "earStat"),
+    ],
+)
+@pytest.mark.parametrize("seed", range(5))
+def test_detector__state__matches_full_history(algorithm, params, result, seed):
+    series = synthetic_series(seed, 120)
+    single = run_detector(algorithm, {**params, "data": series})
+
+    # feed the series a few days at a time, passing the state back through JSON
+    # the way a client would
+    rng = np.random.default_rng(seed)
+    state = {}
+    values = []
+    expected = []
+    day = 0
+    while day < len(series):
+        days = int(rng.integers(0, 15))
+        update = run_detector(
+            algorithm, {**params, "data": series[day : day + days], "state": state}
+        )
+        state = json.loads(json.dumps(update["state"]))
+        values += update[result]
+        expected += update["expectedData"]
+        day += days
+
+    assert_series_close(values, single[result])
+    assert_series_close(expected, single["expectedData"])
+    assert "state" not in single
+
+
+@pytest.mark.parametrize(
+    "state,message",
+    [
+        ({"tail": [1.0, 2.0], "count": 1, "smoothed": 1.5}, "count must be at least"),
+        ({"tail": [1.0], "count": 30, "smoothed": "x"}, "smoothed"),
+        ({"count": 30}, "smoothed is required"),
+        ({"tail": "abc"}, "tail"),
+    ],
+)
+def test_detector__state__ewma_rejects_malformed(state, message):
+    with pytest.raises(ValidationError, match=message):
+        calculateEWMA(data, state=state)
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+@pytest.mark.parametrize(
+    "state,message",
+    [
+        ({"tail": "abc"}, "tail"),
+        ({"tail": [1.0, None, "2"]}, "tail.2"),
+        ({"tail": [1.0], "testStat": "x"}, "testStat"),
+    ],
+)
+def test_detector__state__cusum_rejects_malformed(state, message, use_numpy):
+    with pytest.raises(ValidationError, match=message):
+        calculateCUSUM(data, 0.5, 28, 2, 0.5, 4, USE_NUMPY=use_numpy, state=state)
+
+
+def test_detector__state__ears_long_tail():
+    # a tail longer than the baseline plus the lag gives the same statistics,
+    # one per new day, as the tail the detector returns
+    series = [0.0 if v is None else float(v) for v in synthetic_series(6, 60)]
+    args = (7, 2, 1, 1, 0.1, 2)
+    [_, _, state] = calculateEARS(series[:40], *args, state={})
+    assert len(state["tail"]) == 9
+    expected = calculateEARS(series[40:43], *args, state=state)
+
+    long_state = {**state, "tail": series[:40]}
+    [earStat, expectedData, next_state] = calculateEARS(
+        series[40:43], *args, state=long_state
+    )
+    assert len(earStat) == len(expectedData) == 3
+    assert_series_close(earStat, expected[0])
+    assert next_state == expected[2]
+
+
+def test_detector__state__ears_rejects_malformed():
+    with pytest.raises(ValidationError, match="cusum"):
+        calculateEARS(data, 7, 2, 1, 1, 0.1, 2, state={"cusum": [1.0]})
+
+
+@pytest.mark.parametrize(
+    "jobs,message",
+    [
+        ([{"algorithm": "nope", "data": []}], "Job 0: nope is not a supported"),
+        ([{"algorithm": "ewma", "data": None}], "Job 0: data must be a list."),
+        ([{"algorithm": "ewma", "params": 1, "data": []}], "params must be a dict."),
+        ([{"algorithm": "cusum", "data": [1, "2"]}], "Job 0: data.1: Input should"),
+        ([{"algorithm": "ewma", "params": {"omega": 2}, "data": []}], "Job 0: omega"),
+    ],
+)
+def test_detector__batch__malformed(jobs, message):
+    with pytest.raises(DetectorJobError, match=message):
+        run_batch(jobs)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("kind", ["thread", "process"])
+async def test_detector__executor__runs_detector(kind):
+    executor = DetectorExecutor(kind=kind, pool_size=2, queue_depth=0)
+    try:
+        result = await executor.run(run_detector, Algorithm.cdc1, {"data": data})
+    finally:
+        executor.shutdown()
+
+    assert result == run_detector(Algorithm.cdc1, {"data": data})
+
+
+@pytest.mark.anyio
+async def test_detector__executor__queue_full():
+    executor = DetectorExecutor(kind="thread", pool_size=1, queue_depth=0)
+    release = threading.Event()
+    try:
+        running = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0)
+        with pytest.raises(DetectorQueueFull):
+            await executor.run(release.wait)
+        release.set()
+        assert await running
+    finally:
+        executor.shutdown()
+
+
+def test_detector__series__pivot_series():
+    rows = [
+        {"day": "2024-01-03", "site": "a", "count": 2},
+        {"day": datetime(2024, 1, 1, 8), "site": "b", "count": 1},
+        {"day": datetime(2024, 1, 1, 17), "site": "b", "count": 4},
+        {"day": date(2024, 1, 4), "site": "a", "count": 3},
+        {"day": None, "site": "a", "count": 7},
+    ]
+    dates, groups, series = pivot_series(rows, "day", ["site"], "count")
+
+    assert dates.tolist() == [date(2024, 1, d) for d in range(1, 5)]
+    assert groups == [{"site": "a"}, {"site": "b"}]
+    assert series.dtype == np.float64
+    assert series.tolist() == [[0, 0, 2, 3], [5, 0, 0, 0]]
+
+    dates, groups, series = pivot_series([], "day", ["site"], "count")
+    assert len(dates) == 0 and groups == [] and series.shape == (0, 0)
+
+
+@pytest.mark.parametrize(
+    "granularity, starts, counts",
+    [
+        ("daily", ["2023-12-30", "2023-12-31", "2024-01-01"], [1, 2, 0]),
+        ("weekly", ["2023-12-25", "2024-01-01", "2024-01-08"], [3, 0, 3]),
+        ("epiweek", ["2023-12-24", "2023-12-31", "2024-01-07"], [1, 2, 3]),
+        ("monthly", ["2023-12-01", "2024-01-01"], [3, 3]),
+        ("yearly", ["2023-01-01", "2024-01-01"], [3, 3]),
+    ],
+)
+def test_detector__series__granularity(granularity, starts, counts):
+    # 2023-12-30 is a Saturday and 2024-01-01 a Monday.
+    dates = ["2023-12-30", "2023-12-31", None, "2024-01-10", "2024-01-10T12:00"]
+    periods, series = dense_series(dates, [1, 2, 5, 3, None], granularity)
+
+    expected = np.array(starts, dtype="datetime64[D]")
+    assert periods[: len(starts)].tolist() == expected.tolist()
+    assert series[: len(counts)].tolist() == counts
+    assert series.sum() == 6
+
+
+def test_detector__series__fixed_range():
+    periods, series = dense_series(
+        ["2024-01-02", "2024-01-09"],
+        [1, 2],
+        "daily",
+        start="2024-01-01",
+        end="2024-01-05",
+    )
+    assert periods.astype(str).tolist() == [f"2024-01-0{d}" for d in range(1, 6)]
+    assert series.tolist() == [0, 1, 0, 0, 0]
+
+
+def test_detector__clean_data__no_copy():
+    series = np.arange(10, dtype=np.float64)
+    assert np.shares_memory(BaselineWindows.cleanData(series), series)
+    missing = np.array([1, np.nan, 3])
+    assert BaselineWindows.cleanData(missing).tolist() == [1, 0, 3]
+    assert np.isnan(missing[1])
+    assert BaselineWindows.cleanData([1, None, 3]).tolist() == [1, 0, 3]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("algorithm", [Algorithm.cusum, Algorithm.ewma, Algorithm.cdc2])
+async def test_detector__sweep__matches_single_runs(algorithm):
+    series = [list(synthetic_series(seed, 120)) for seed in range(5)]
+    dates = [str(i) for i in range(120)]
+    executor = DetectorExecutor(kind="thread", pool_size=2, queue_depth=0)
+    try:
+        results = await executor.map_chunks(
+            run_sweep, series, algorithm, {}, dates, True
+        )
+    finally:
+        executor.shutdown()
+
+    assert len(results) == len(series)
+    for values, result in zip(series, results):
+        single = run_detector(algorithm, {"data": values})
+        statistic = "pValues" if "pValues" in single else "earStat"
+        assert result[statistic] == single[statistic]
+        for alert in result["alerts"]:
+            value = single[statistic][int(alert["date"])]
+            assert alert["value"] == value
+            if statistic == "pValues":
+                assert value <= (0.01 if alert["level"] == "red" else 0.05)
+            else:
+                assert value >= 2
+
+
+def test_detector__sweep__regression_first_weekday_from_dates():
+    series = [synthetic_series(seed, 90) for seed in range(4)]
+    dates = [str(np.datetime64("2024-01-03") + i) for i in range(90)]
+    results = run_sweep(Algorithm.regression, {}, dates, True, series)
+
+    for values, result in zip(series, results):
+        single = run_detector(
+            Algorithm.regression, {"data": values, "first_weekday": 2}
+        )
+        assert_series_close(result["pValues"], single["pValues"])
+        assert_series_close(result["expectedData"], single["expectedData"])
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("kind", ["thread", "process"])
+async def test_detector__tuning__matches_single_runs(kind):
+    series = synthetic_series(0, 150)
+    grid = {"omega": [0.2, 0.4, 0.6], "threshold_probability_red_alert": [0.01, 0.1]}
+    executor = DetectorExecutor(kind=kind, pool_size=2, queue_depth=0)
+    try:
+        results = await run_tuning(
+            executor, "ewma", series, grid, {"max_base_line_len": 14}
+        )
+    finally:
+        executor.shutdown()
+
+    assert [
+        (r["params"]["omega"], r["params"]["max_base_line_len"]) for r in results
+    ] == [
+        (0.2, 14),
+        (0.2, 14),
+        (0.4, 14),
+        (0.4, 14),
+        (0.6, 14),
+        (0.6, 14),
+    ]
+    for result in results:
+        single = run_detector(Algorithm.ewma, {**result["params"], "data": series})
+        alerts = find_alerts(Algorithm.ewma, result["params"], single)
+        assert result["alerts"] == len(alerts) == result["red"] + result["yellow"]
+        assert result["seconds"] >= 0
+
+
+@pytest.mark.parametrize(
+    "algorithm, grid, message",
+    [
+        ("cdc", {}, "can not be used in a sweep"),
+        ("ewma", {"cusum_k": [1]}, "not a tunable param"),
+        ("cusum", {"cusum_k": []}, "non-empty list"),
+        ("cusum", {"data": [[1]]}, "not a tunable param"),
+        ("cusum", {"cusum_k": [1, 2], "baseline": list(range(10))}, "20 combinations"),
+    ],
+)
+def test_detector__tuning__malformed(algorithm, grid, message):
+    with pytest.raises(DetectorJobError, match=message):
+        parse_grid(algorithm, grid, {}, 10)
+
+
+def test_detector__sweep__rejects_multi_statistic_detector():
+    with pytest.raises(DetectorJobError):
+        run_sweep(Algorithm.cdc, {}, [], False, [[1, 2, 3]])
+
+
+@pytest.mark.anyio
+async def test_detector__sweep__dataset_query_to_alert_rows(monkeypatch):
+    counts = [3, 4, 2, 5, 3, 4, 3, 2, 4, 3, 5, 4, 3, 2, 4, 3, 4, 40]
+    rows = [
+        {"day(day)": f"2024-01-{i + 1:02d}", "site": site, SWEEP_COUNT: count}
+        for i, count in enumerate(counts)
+        for site in ["a", "b"]
+    ]
+
+    class DataBridge:
+        async def query(self, query):
+            self.query_args = query
+            return {"values": rows, "total": len(rows), "error": None}
+
+    sweep = AlertSweep(
+        name="by_site",
+        dataset_id="dataset",
+        date_field="day",
+        group_by=["site"],
+        algorithm="cdc1",
+    )
+    databridge = DataBridge()
+    executor = DetectorExecutor(kind="thread", pool_size=2, queue_depth=0)
+    monkeypatch.setitem(Dependency.INSTANCE, Reference.DETECTOR_EXECUTOR, executor)
+    try:
+        result = await run_dataset_sweep(
+            databridge, sweep_query(sweep).dict(), sweep, Algorithm.cdc1, {}
+        )
+    finally:
+        executor.shutdown()
+
+    # the records are bucketed into days by the database
+    assert databridge.query_args["group_by"]["fields"] == ["day(day)", "site"]
+    assert [group["group"] for group in result["groups"]] == [
+        {"site": "a"},
+        {"site": "b"},
+    ]
+    stored = alert_rows(sweep, result)
+    assert len(stored) == 2
+    assert {row["group_key"] for row in stored} == {'{"site": "a"}', '{"site": "b"}'}
+    assert all(row["date"] == date(2024, 1, 18) for row in stored)
+    assert all(row["sweep"] == "by_site" for row in stored)
+
+
+@pytest.fixture
+def detector_client(monkeypatch):
+    executor = DetectorExecutor(kind="thread", pool_size=2, queue_depth=8)
+    monkeypatch.setitem(Dependency.INSTANCE, Reference.DETECTOR_EXECUTOR, executor)
+    monkeypatch.setitem(Dependency.INSTANCE, Reference.DETECTOR_CACHE, DetectorCache())
+    app = FastAPI()
+    app.include_router(detector(Config), prefix="/detector")
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(
+        permissions={"admin": True}
+    )
+    try:
+        yield TestClient(app)
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.parametrize("algorithm", ["cusum", "cdc", "ewma"])
+def test_detector__payload__raw_float64(detector_client, algorithm):
+    series = np.random.default_rng(3).poisson(8, 200).astype("<f8")
+    response = detector_client.post(
+        f"/detector/{algorithm}/raw",
+        params={"params": json.dumps({"state": {}})},
+        content=series.tobytes(),
+        headers={"Content-Type": payload.OCTET_STREAM},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == payload.OCTET_STREAM
+
+    expected = run_detector(algorithm, {"data": series.tolist(), "state": {}})
+    names = response.headers[payload.COLUMNS_HEADER].split(",")
+    columns = np.frombuffer(response.content, dtype="<f8").reshape(len(names), -1)
+    for name, column in zip(names, columns):
+        np.testing.assert_allclose(column, np.array(expected[name], dtype=float))
+    if "state" in expected:
+        state = json.loads(response.headers[payload.STATE_HEADER])
+        assert state == expected["state"]
+    else:
+        assert payload.STATE_HEADER not in response.headers
+
+
+def test_detector__payload__arrow(detector_client):
+    series = np.random.default_rng(4).poisson(8, 120)
+    table = pyarrow.table({"data": series})
+    sink = pyarrow.BufferOutputStream()
+    with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    response = detector_client.post(
+        "/detector/cdc1/raw",
+        content=sink.getvalue().to_pybytes(),
+        headers={"Content-Type": payload.ARROW_STREAM},
+    )
+    assert response.status_code == 200
+
+    result = pyarrow.ipc.open_stream(response.content).read_all()
+    expected = run_detector(Algorithm.cdc1, {"data": series.tolist()})
+    assert result.column_names == ["earStat", "expectedData"]
+    np.testing.assert_allclose(
+        result.column("earStat").to_numpy(), np.array(expected["earStat"], dtype=float)
+    )
+
+
+@pytest.mark.parametrize(
+    "content_type, body, params, code",
+    [
+        ("text/plain", b"\0" * 8, "{}", 415),
+        (payload.OCTET_STREAM, b"\0" * 7, "{}", 400),
+        (payload.OCTET_STREAM, b"\0" * 8, "[1]", 400),
+        (payload.OCTET_STREAM, b"\0" * 8, "{", 400),
+        (payload.OCTET_STREAM, b"\0" * 8, '{"state": {"tail": "abc"}}', 400),
+        (payload.OCTET_STREAM, b"\0" * 8, '{"state": {"testStat": true}}', 400),
+    ],
+)
+def test_detector__payload__malformed(
+    detector_client, content_type, body, params, code
+):
+    response = detector_client.post(
+        "/detector/cusum/raw",
+        params={"params": params},
+        content=body,
+        headers={"Content-Type": content_type},
+    )
+    assert response.status_code == code
+
+
+def test_detector__tuning__route(detector_client):
+    job = {
+        "algorithm": "cusum",
+        "data": synthetic_series(1, 100),
+        "grid": {"cusum_k": [0.5, 1]},
+    }
+    response = detector_client.post("/detector/tune", json=job)
+    assert response.status_code == 200
+    assert [r["params"]["cusum_k"] for r in response.json()] == [0.5, 1]
+
+    for malformed in [
+        {"data": ["x"]},
+        {"data": ["1.5", "2"]},
+        {"data": [1, True]},
+        {"data": None},
+        {"params": {"baseline": 0}},
+        {"params": {"baseline": 100000}},
+        {"grid": {"baseline": [28, 100000]}},
+        {"params": {"state": {"tail": "abc"}}},
+    ]:
+        response = detector_client.post("/detector/tune", json={**job, **malformed})
+        assert response.status_code == 400
+
+
+def test_detector__batch__route_spreads_jobs(detector_client, monkeypatch):
+    executor = Dependency.INSTANCE[Reference.DETECTOR_EXECUTOR]
+    chunks = []
+    run = executor.run
+
+    def spy(fn, *args):
+        chunks.append(args[-1])
+        return run(fn, *args)
+
+    monkeypatch.setattr(executor, "run", spy)
+    jobs = [
+        {"algorithm": algorithm, "data": synthetic_series(seed, 60)}
+        for seed, algorithm in enumerate(["cusum", "ewma", "cdc1", "regression"])
+    ]
+    response = detector_client.post("/detector/batch", json=jobs)
+
+    assert response.status_code == 200
+    assert [len(chunk) for chunk in chunks] == [2, 2]
+    assert response.json() == json.loads(json.dumps(run_batch(jobs)))
+
+    # a bad job fails the batch before any job runs
+    chunks.clear()
+    response = detector_client.post(
+        "/detector/batch", json=jobs + [{"algorithm": "cusum", "data": ["x"]}]
+    )
+    assert response.status_code == 400 and "Job 4" in response.json()["detail"]
+    assert chunks == []
+
+
+def test_detector__echo_data(detector_client):
+    request = {"data": data, "cusum_k": 1}
+    echoed = detector_client.post("/detector/cusum", json=request).json()
+    response = detector_client.post(
+        "/detector/cusum", params={"echo_data": "false"}, json=request
+    )
+    assert echoed["params"]["data"] == data
+    assert "data" not in response.json()["params"]
+    assert response.json()["params"]["cusum_k"] == 1
+    assert response.json()["pValues"] == echoed["pValues"]
+
+    jobs = [{"algorithm": "cdc1", "params": {}, "data": data}]
+    batch = detector_client.post(
+        "/detector/batch", params={"echo_data": "false"}, json=jobs
+    ).json()
+    assert "data" not in batch[0]["params"]
+
+
+@pytest.mark.parametrize(
+    "algorithm, request_body",
+    [
+        ("cusum", {"data": [1, 2, "3"]}),
+        ("cusum", {"data": [[1, 2], [3, 4]]}),
+        ("cusum", {"data": [1, True]}),
+        ("cusum", {"data": [1, 2], "baseline": 0}),
+        ("cusum", {"data": [1, 2], "baseline": 100000}),
+        ("cusum", {"data": [1, 2], "guardband": 100000}),
+        ("ears", {**EARS_PARAMS, "data": [1, 2], "baseline": 100000}),
+        ("ears", {**EARS_PARAMS, "data": [1, 2], "base_lag": 100000}),
+        ("ewma", {"data": [1, 2], "max_base_line_len": 100000}),
+        ("regression", {"data": [1, 2], "baseline_len": 100000}),
+        ("regression", {"data": [1, 2], "num_guardband": 100000}),
+        ("ewma", {"data": [1, 2], "omega": 1.5}),
+        ("ears", {"data": [1, 2]}),
+        ("regression", {"data": [1, 2], "first_weekday": 7}),
+        ("cusum", {"data": [1, 2], "state": {"tail": "abc"}}),
+        ("cusum", {"data": [1, 2], "state": {"tail": [1, "2"]}}),
+        ("cusum", {"data": [1, 2], "state": {"testStat": "x"}}),
+        ("ewma", {"data": [1, 2], "state": {"smoothed": "x", "count": 50}}),
+        ("ewma", {"data": [1, 2], "state": {"tail": [1, 2], "count": 1}}),
+        ("ewma", {"data": [1, 2], "state": {"count": 5}}),
+        ("ewma", {"data": [1, 2], "state": {"count": -1}}),
+        ("ears", {**EARS_PARAMS, "data": [1, 2], "state": {"cusum": [1]}}),
+        ("ears", {**EARS_PARAMS, "data": [1, 2], "state": {"cusum": ["a", 1]}}),
+    ],
+)
+def test_detector__params__rejected(detector_client, algorithm, request_body):
+    response = detector_client.post(f"/detector/{algorithm}", json=request_body)
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("algorithm", ["cusum", "ewma"])
+def test_detector__params__state_round_trip(detector_client, algorithm):
+    series = synthetic_series(4, 80)
+    first = detector_client.post(
+        f"/detector/{algorithm}", json={"data": series[:60], "state": {}}
+    ).json()
+    response = detector_client.post(
+        f"/detector/{algorithm}", json={"data": series[60:], "state": first["state"]}
+    )
+    assert response.status_code == 200
+    single = run_detector(algorithm, {"data": series})
+    assert_series_close(
+        first["pValues"] + response.json()["pValues"], single["pValues"]
+    )
+
+
+def test_detector__params__defaults_and_missing_days(detector_client):
+    series = synthetic_series(2, 100)
+    response = detector_client.post("/detector/ewma", json={"data": series})
+    assert response.status_code == 200
+    result = response.json()
+    assert result["params"]["data"] == series
+    assert result["params"]["omega"] == 0.4
+    assert_series_close(
+        result["pValues"], run_detector(Algorithm.ewma, {"data": series})["pValues"]
+    )
+
+    response = detector_client.post(
+        "/detector/ewma/raw",
+        params={"params": json.dumps({"omega": 2})},
+        content=np.zeros(10).tobytes(),
+        headers={"Content-Type": payload.OCTET_STREAM},
+    )
+    assert response.status_code == 400 and "omega" in response.json()["detail"]
+
+
+@pytest.mark.parametrize(
+    "algorithm", [Algorithm.cusum, Algorithm.cdc, Algorithm.ewma, Algorithm.regression]
+)
+def test_detector__params__defaults_from_models(algorithm):
+    model = PARAMS_MODELS[algorithm].model_validate({"data": [1.0]})
+    assert model_params(algorithm, {"data": [1.0]}) == model.model_dump()
+    with pytest.raises(DetectorJobError, match="baseline: Field required"):
+        model_params(Algorithm.ears, {"data": [1.0]})
+
+
+def test_detector__params__checked_before_sweeps():
+    with pytest.raises(DetectorJobError, match="omega"):
+        run_sweep(Algorithm.ewma, {"omega": 0}, [], False, [[1, 2, 3]])
+    with pytest.raises(DetectorJobError, match="baseline"):
+        parse_grid("cusum", {"baseline": [7, -1]}, {}, 10)
+
+
+def test_detector__cache__lru_and_ttl(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr("vims.app.detector.cache.time.monotonic", lambda: now[0])
+    cache = DetectorCache(max_size=2, ttl=10)
+
+    key = DetectorCache.key(Algorithm.ewma, {"data": [1, 2], "omega": 0.3})
+    assert key == DetectorCache.key("ewma", {"omega": 0.3, "data": [1, 2]})
+    assert key != DetectorCache.key(Algorithm.cusum, {"data": [1, 2], "omega": 0.3})
+
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # b is the least recently used
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+    now[0] = 11
+    assert cache.get("a") is None
+    assert cache.stats() == {
+        "size": 1,
+        "max_size": 2,
+        "ttl": 10,
+        "hits": 2,
+        "misses": 3,
+    }
+
+
+def test_detector__cache__disabled():
+    cache = DetectorCache(max_size=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
@@ -19,8 +19,10 @@
 # FOR LOST PROFITS.
 
 import datetime
+import importlib
 
 import pytest
+import sqlalchemy as sqla
 
 import vims.util.sqla_where_compiler as swc
 
@@ -185,3 +187,58 @@ def test__parser__column_expressions(to_parse: dict, target: str):
 def test__parser__malformatted(to_parse):
     with pytest.raises(swc.SqlaWhereParseError):
         swc.SQLAWhereExpression.parse_children(to_parse, top_level=True)
+
+
+@pytest.mark.parametrize(
+    "dialect,unit,target",
+    [
+        ("postgresql", "day", "CAST(date_trunc('day', t.d) AS DATE)"),
+        ("postgresql", "month", "CAST(date_trunc('month', t.d) AS DATE)"),
+        (
+            "postgresql",
+            "epiweek",
+            "CAST(date_trunc('week', t.d + INTERVAL '1 day') - INTERVAL '1 day' "
+            "AS DATE)",
+        ),
+        ("mysql", "day", "DATE(t.d)"),
+        ("mysql", "week", "DATE_SUB(DATE(t.d), INTERVAL WEEKDAY(t.d) DAY)"),
+        ("mysql", "month", "DATE_SUB(DATE(t.d), INTERVAL DAYOFMONTH(t.d) - 1 DAY)"),
+        ("mysql", "year", "MAKEDATE(YEAR(t.d), 1)"),
+        ("mysql", "epiweek", "DATE_SUB(DATE(t.d), INTERVAL DAYOFWEEK(t.d) - 1 DAY)"),
+        ("sqlite", "week", "date(t.d, '-6 days', 'weekday 1')"),
+        ("sqlite", "year", "date(t.d, 'start of year')"),
+        ("sqlite", "epiweek", "date(t.d, '-6 days', 'weekday 0')"),
+    ],
+)
+def test__compiler__date_bucket(dialect, unit, target):
+    columns = {"d": sqla.Column("d"), "n": sqla.Column("n")}
+    sqla.Table("t", sqla.MetaData(), *columns.values())
+    expression = swc.SQLAWhereExpression.parse_children(
+        {swc.LogicalOps.AND.value: [{f"{unit}(d)": {"$ge": "2021-01-03"}}]},
+        top_level=True,
+    )
+    compiled = expression.compile(columns, {"d": "datetime", "n": "int"}).compile(
+        dialect=importlib.import_module(f"sqlalchemy.dialects.{dialect}").dialect()
+    )
+    assert target in str(compiled)
+    assert list(compiled.params.values()) == [datetime.date(2021, 1, 3)]
+
+
+def test__compiler__date_bucket__errors():
+    columns = {"d": sqla.Column("d"), "n": sqla.Column("n")}
+    sqla.Table("t", sqla.MetaData(), *columns.values())
+    assert swc.parse_date_bucket("d") is None
+    assert swc.parse_date_bucket("fortnight(d)") is None
+    assert swc.parse_date_bucket("week(d)") == (swc.DateBucketUnit.WEEK, "d")
+
+    expression = swc.SQLAWhereExpression.parse_children(
+        {swc.LogicalOps.AND.value: [{"month(n)": {"$eq": 1}}]}, top_level=True
+    )
+    with pytest.raises(swc.SqlaWhereCompileError, match="n is not a datetime"):
+        expression.compile(columns, {"d": "datetime", "n": "int"})
+
+    bucket = swc.DateBucket(swc.DateBucketUnit.DAY, columns["d"])
+    with pytest.raises(sqla.exc.CompileError, match="not supported on mssql"):
+        bucket.compile(
+            dialect=importlib.import_module("sqlalchemy.dialects.mssql").dialect()
+        )
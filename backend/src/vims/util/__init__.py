@@ -136,8 +136,15 @@ def cast(input: str, _type: str):
             return datetime.fromisoformat(date.isoformat(input))
         else:
             return datetime.fromisoformat(input)
+    elif _type == "date":
+        if isinstance(input, datetime):
+            return input.date()
+        elif isinstance(input, date):
+            return input
+        else:
+            return datetime.fromisoformat(input).date()
     else:
-        raise InvalidTypeCast(f"{_type} is not one of (str|int|float|datetime).")
+        raise InvalidTypeCast(f"{_type} is not one of (str|int|float|datetime|date).")
 
 
 # https://stackoverflow.com/a/22238613.
@@ -20,10 +20,16 @@
 
 from typing import Any
 
+import re
+
 from enum import Enum
 
 import sqlalchemy as sqla
 
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.sql.visitors import InternalTraversal
+
 from vims.util import cast
 
 
@@ -61,6 +67,102 @@ class ComparisonOps(Enum):
     ISNOT = "$isnot"
 
 
+class DateBucketUnit(Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+    YEAR = "year"
+    EPIWEEK = "epiweek"
+
+
+# A field written as unit(field), e.g. month(date_reported), stands for the
+# first day of the period holding the field's value: ISO weeks start on Monday
+# and CDC epiweeks on Sunday.
+DATE_BUCKET_PATTERN = re.compile(
+    rf"^({'|'.join(u.value for u in DateBucketUnit)})\((.+)\)$"
+)
+
+
+def parse_date_bucket(name: str):
+    """
+    Returns the (unit, field) of a date bucket, or None if name is not one.
+    """
+    match = DATE_BUCKET_PATTERN.match(name)
+    if match is None:
+        return None
+    return DateBucketUnit(match[1]), match[2]
+
+
+class DateBucket(FunctionElement):
+    """
+    The date of the first day of the period of a datetime column, compiled to
+    the date functions of each dialect.
+    """
+
+    type = sqla.Date()
+    inherit_cache = True
+    _traverse_internals = FunctionElement._traverse_internals + [
+        ("unit", InternalTraversal.dp_string)
+    ]
+
+    def __init__(self, unit: DateBucketUnit, column):
+        self.unit = DateBucketUnit(unit).value
+        super().__init__(column)
+
+
+@compiles(DateBucket)
+def compile_date_bucket(element, compiler, **kw):
+    # Statements are also stringified without a dialect, e.g. by the databases
+    # result records, which is rendered as the unit(field) notation.
+    if compiler.dialect.name == "default":
+        return f"{element.unit}({compiler.process(element.clauses, **kw)})"
+    raise sqla.exc.CompileError(
+        f"Date buckets are not supported on {compiler.dialect.name}."
+    )
+
+
+@compiles(DateBucket, "postgresql")
+def compile_date_bucket_postgresql(element, compiler, **kw):
+    column = compiler.process(element.clauses, **kw)
+    if element.unit == DateBucketUnit.EPIWEEK.value:
+        # date_trunc weeks start on Monday, a day after the epiweek.
+        return (
+            f"CAST(date_trunc('week', {column} + INTERVAL '1 day') "
+            f"- INTERVAL '1 day' AS DATE)"
+        )
+    return f"CAST(date_trunc('{element.unit}', {column}) AS DATE)"
+
+
+@compiles(DateBucket, "mysql")
+def compile_date_bucket_mysql(element, compiler, **kw):
+    column = compiler.process(element.clauses, **kw)
+    days_into = {
+        DateBucketUnit.DAY.value: None,
+        DateBucketUnit.WEEK.value: f"WEEKDAY({column})",
+        DateBucketUnit.MONTH.value: f"DAYOFMONTH({column}) - 1",
+        DateBucketUnit.EPIWEEK.value: f"DAYOFWEEK({column}) - 1",
+    }
+    if element.unit == DateBucketUnit.YEAR.value:
+        return f"MAKEDATE(YEAR({column}), 1)"
+    if days_into[element.unit] is None:
+        return f"DATE({column})"
+    return f"DATE_SUB(DATE({column}), INTERVAL {days_into[element.unit]} DAY)"
+
+
+@compiles(DateBucket, "sqlite")
+def compile_date_bucket_sqlite(element, compiler, **kw):
+    column = compiler.process(element.clauses, **kw)
+    modifiers = {
+        DateBucketUnit.DAY.value: "",
+        # back 6 days, then forward to the next Monday or Sunday
+        DateBucketUnit.WEEK.value: ", '-6 days', 'weekday 1'",
+        DateBucketUnit.MONTH.value: ", 'start of month'",
+        DateBucketUnit.YEAR.value: ", 'start of year'",
+        DateBucketUnit.EPIWEEK.value: ", '-6 days', 'weekday 0'",
+    }
+    return f"date({column}{modifiers[element.unit]})"
+
+
 class SQLAWhereExpression:
     @classmethod
     def parse_children(cls, to_parse: dict, top_level: bool = False):
@@ -171,12 +273,23 @@ class ColumnExpression(SQLAWhereExpression):
 
     def compile(self, sqla_columns, table_metadata):
         table_col = sqla_columns.get(self.col, None)
-        if table_col is None:
+        bucket = parse_date_bucket(self.col) if table_col is None else None
+        if bucket is not None and bucket[1] in sqla_columns:
+            unit, field = bucket
+            if table_metadata[field] != "datetime":
+                raise SqlaWhereCompileError(
+                    f"Error compiling query. Column: {field} is not a datetime "
+                    f"and can not be bucketed by {unit.value}."
+                )
+            table_col = DateBucket(unit, sqla_columns[field])
+            col_type = "date"
+        elif table_col is None:
             raise SqlaWhereCompileError(
                 f"Error compiling query. Column: {self.col} does not "
                 f"exist in target table."
             )
-        col_type = table_metadata[self.col]
+        else:
+            col_type = table_metadata[self.col]
         return self.child.compile(table_col, lambda x: cast(x, col_type))
 
 
@@ -0,0 +1,91 @@
+#  Copyright (c) 2013-2025. The Johns Hopkins University Applied Physics Laboratory LLC
+#
+#
+# This material may be used, modified, or reproduced by or for the U.S.
+# Government pursuant to the rights granted under the clauses at
+# DFARS 252.227-7013/7014 or FAR 52.227-14.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# NO WARRANTY.   THIS MATERIAL IS PROVIDED "AS IS."  JHU/APL DISCLAIMS ALL
+# WARRANTIES IN THE MATERIAL, WHETHER EXPRESS OR IMPLIED, INCLUDING (BUT NOT
+# LIMITED TO) ANY AND ALL IMPLIED WARRANTIES OF PERFORMANCE,
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF
+# INTELLECTUAL PROPERTY RIGHTS. ANY USER OF THE MATERIAL ASSUMES THE ENTIRE
+# RISK AND LIABILITY FOR USING THE MATERIAL.  IN NO EVENT SHALL JHU/APL BE
+# LIABLE TO ANY USER OF THE MATERIAL FOR ANY ACTUAL, INDIRECT,
+# CONSEQUENTIAL, SPECIAL OR OTHER DAMAGES ARISING FROM THE USE OF, OR
+# INABILITY TO USE, THE MATERIAL, INCLUDING, BUT NOT LIMITED TO, ANY DAMAGES
+# FOR LOST PROFITS.
+
+import asyncio
+import sys
+
+from argparse import ArgumentParser
+from datetime import timedelta
+
+from vims.app.config import config
+from vims.app.database import database
+from vims.app.datasource import DataBridgeManager, connect_datasources
+from vims.app.detector.alerts import create_alert_table, run_alert_sweeps
+from vims.app.detector.executor import detector_executor
+from vims.app.settings import Settings
+from vims.core import Config, Dependency, Reference, getLogger, logging_init
+
+log = getLogger(__name__)
+
+
+async def main(*args):
+    parser = ArgumentParser(
+        prog="python -m vims.worker",
+        description="Runs the configured alert sweeps and stores their alerts.",
+    )
+    parser.add_argument(
+        "--once", action="store_true", help="run the sweeps once and exit"
+    )
+    parser.add_argument(
+        "--dataset", help="only run the sweeps over the dataset with this name"
+    )
+    args = parser.parse_args(args)
+
+    def get_databridge_manager():
+        return DataBridgeManager()
+
+    Dependency.register(Reference.DATABRIDGE_MANAGER, get_databridge_manager)
+    Dependency.register(Reference.DETECTOR_EXECUTOR, detector_executor)
+
+    app_config: Config = await Dependency.resolve(config)
+    databridge_manager = await Dependency.resolve(Reference.DATABRIDGE_MANAGER)
+    executor = await Dependency.resolve(Reference.DETECTOR_EXECUTOR)
+    interval = app_config.get(Settings.ALERT_SWEEP_INTERVAL, timedelta(days=1))
+
+    await database.connect()
+    try:
+        await create_alert_table()
+        await connect_datasources(app_config, databridge_manager)
+        while True:
+            log.info("Running alert sweeps")
+            await run_alert_sweeps(
+                app_config.get(Settings.ALERT_SWEEPS, []), args.dataset
+            )
+            if args.once:
+                break
+            await asyncio.sleep(interval.total_seconds())
+    finally:
+        await databridge_manager.disconnect_all()
+        executor.shutdown()
+        await database.disconnect()
+
+
+def run(*args):
+    if len(args) == 0:
+        args = sys.argv[1:]
+    logging_init()
+    asyncio.run(main(*args))
+
+
+run()
@@ -9,6 +9,7 @@ a = Analysis(
     pathex=['./src/vims/app'],
     paths=[],
     binaries=[],
+    datas=[('./src/vims/app/detector/CusumLookupTable.npy', 'vims/app/detector')],
     hiddenimports=['main',
     'databases',
     'databases.backends',